@@ -1,4 +1,15 @@
+import time
+_startup_began = time.perf_counter()
+
 from .getgrknmenu import get_grkn_menu
+from .lookupcache import LookupCache
+from .entrymodel import Entry, parse_entries
+from .jishoapi import PAGE_SIZE, CancelToken, FetchError
+from .mappingplan import MappingPlan
+from .localdict import LocalDictionary
+from .perfstats import PerfStats
+from .textnorm import normalize_term
+from .segmenter import Token, segment
 # -*- coding: utf-8 -*-
 """
 Anki Add-on: Anki Jisho Connect (v3.8.9)
@@ -7,34 +18,49 @@ Features:
 - Modeless results window with integrated loading state.
 - API requests run in a background thread to prevent UI freezes.
 - Window is reused if already open.
+- Lookups are cached on disk, so repeated searches are instant and work offline.
+- Batch fill selected notes from the Browser.
+- Optional offline lookups from an imported JMdict/JMnedict dictionary.
+- Optional background pre-loading of lookups for upcoming notes.
+- Performance statistics window with an optional JSONL timing log.
+
+Startup is kept light: the HTTP clients and the dialog classes are imported
+on first use, and the menu is added once the main window has finished loading.
 """
 import os
+import copy
 import json
-import requests
-import urllib.parse
-from typing import List, Any, Dict, Optional, Tuple
+import logging
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, List, Any, Callable, Dict, Optional, Tuple
 
 # Anki imports
 from aqt import mw
-from aqt.qt import (
-    QAction, QMenu, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
-    QGridLayout, QCheckBox, QScrollArea, QWidget, QFrame, QInputDialog,
-    QLineEdit, Qt, QMessageBox, QIcon, QGroupBox, QSizePolicy,
-    QThread, QObject, pyqtSignal, pyqtSlot, QApplication, QPixmap
+from aqt.qt import QAction, QInputDialog, QIcon, QFileDialog, QObject, pyqtSignal, QPixmap, QColor
+from PyQt6.QtCore import QTimer
+from aqt.utils import showInfo, showWarning, tooltip
+from aqt.gui_hooks import (
+    editor_did_init_buttons, theme_did_change, browser_menus_did_init, profile_will_close,
+    editor_did_load_note, browser_did_search, main_window_did_init, profile_did_open
 )
-from PyQt6.QtCore import QTimer, QPoint
-from PyQt6.QtGui import QCursor
-from aqt.utils import showInfo, showWarning
-from aqt.gui_hooks import editor_did_init_buttons, theme_did_change
+from aqt.operations import CollectionOp, QueryOp
 from aqt.theme import theme_manager
 
-def get_themed_icon(icon_name: str) -> QIcon:
+if TYPE_CHECKING:
+    from .asyncfetch import FetchBatch, FetchEngine
+    from .dialogs import ConfigDialog, PerfStatsDialog, ResultsDialog
+    from .jishosession import JishoSession
+
+log = logging.getLogger(__name__)
+
+def _render_themed_icon(icon_name: str, palette) -> QIcon:
     """
-    Creates a QIcon from an SVG string, with colors adapted to the current theme.
+    Creates a QIcon from an SVG string, with colors adapted to the given theme.
     """
     icon_svg = ""
 
-    color = theme.TEXT_SECONDARY
+    color = palette.TEXT_SECONDARY
     
     if icon_name == "arrow_up":
         icon_svg = f"""
@@ -50,7 +76,7 @@ def get_themed_icon(icon_name: str) -> QIcon:
         """
     elif icon_name == "remove":
 
-        color = theme.DANGER_TEXT
+        color = palette.DANGER_TEXT
         icon_svg = f"""
         <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">
             <path fill="{color}" d="M19 6.41L17.59 5 12 10.59 6.41 5 5 6.41 10.59 12 5 17.59 6.41 19 12 13.41 17.59 19 19 17.59 13.41 12z"/>
@@ -161,6 +187,63 @@ class DarkTheme:
 
 theme = DarkTheme if theme_manager.night_mode else LightTheme
 
+THEMED_ICONS = ("arrow_up", "arrow_down", "remove")
+STYLESHEET_BUILDERS: Dict[str, Callable[[Any], str]] = {}
+
+def register_stylesheet(name: str):
+    """Register a function that builds a named stylesheet from a theme class."""
+    def decorator(builder):
+        STYLESHEET_BUILDERS[name] = builder
+        return builder
+    return decorator
+
+class StyleRegistry:
+    """Stylesheets, icons and colours of one theme, each built once and then reused."""
+    def __init__(self, palette):
+        self.palette = palette
+        self._stylesheets: Dict[str, str] = {}
+        self._icons: Dict[str, QIcon] = {}
+        self._colors: Dict[str, QColor] = {}
+
+    def stylesheet(self, name: str) -> str:
+        qss = self._stylesheets.get(name)
+        if qss is None:
+            qss = self._stylesheets[name] = STYLESHEET_BUILDERS[name](self.palette)
+        return qss
+
+    def icon(self, name: str) -> QIcon:
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = self._icons[name] = _render_themed_icon(name, self.palette)
+        return icon
+
+    def color(self, name: str) -> QColor:
+        """QColor for a theme attribute name, e.g. "TEXT_PRIMARY"."""
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QColor(getattr(self.palette, name))
+        return color
+
+    def warm(self):
+        """Build every registered stylesheet and icon ahead of the first window."""
+        for name in STYLESHEET_BUILDERS:
+            self.stylesheet(name)
+        for name in THEMED_ICONS:
+            self.icon(name)
+
+_style_registries: Dict[type, StyleRegistry] = {}
+
+def theme_styles() -> StyleRegistry:
+    """Return the style registry of the current theme."""
+    registry = _style_registries.get(theme)
+    if registry is None:
+        registry = _style_registries[theme] = StyleRegistry(theme)
+    return registry
+
+def get_themed_icon(icon_name: str) -> QIcon:
+    """Return the cached icon for the current theme."""
+    return theme_styles().icon(icon_name)
+
 # -------------------------
 # Translation System
 # -------------------------
@@ -179,6 +262,18 @@ TRANSLATIONS = {
         "add_mapping": "+ Add Mapping",
         "disable_warning": "Disable multi-word selection warning",
         "remove_pos_ending": "Remove 'with x ending' from Part of speech",
+        "live_search": "Search as you type",
+        "prewarm": "Pre-load lookups for upcoming notes in the background",
+        "fold_kana": "Search katakana as hiragana",
+        "sentence_mode": "Sentence mode: look up every word of a sentence",
+        "sentence_mode_no_dictionary": "No JMdict imported: sentences are split by script (kanji, kana) only, so words may be cut in the wrong place.",
+        "batch_pick_rule": "Batch Fill Senses:",
+        "batch_pick_first": "First sense",
+        "batch_pick_all": "All senses",
+        "data_source": "Dictionary Source:",
+        "data_source_remote": "Jisho.org (online)",
+        "data_source_local": "Local JMdict (offline)",
+        "data_source_local_first": "Local JMdict, then Jisho.org",
         "save_and_close": "Save and Close",
         "warning_fill_mappings": "Fill all mapping pairs before saving.",
         "info_settings_saved": "Settings saved!",
@@ -191,11 +286,18 @@ TRANSLATIONS = {
         "loading_message": "Looking for results...",
         "loading_message_term": "Looking for '{term}'...",
         "no_results": "Sorry, nothing was found for '{term}'.",
+        "loading_sentence": "Looking up {count} words...",
+        "sentence_word_no_results": "nothing found",
+        "sentence_word_failed": "lookup failed",
+        "search_failed": "Search failed: {error}",
+        "load_more": "Load more results",
+        "loading_more": "Loading more results...",
         "other_forms": "Other forms:",
         "multi_word_warning_title": "You selected definitions from multiple words.",
         "multi_word_warning_body": "Meanings from multiple words will be added to the note.",
         "ok_dont_warn_again": "OK, don't warn me again",
         "info_fields_filled": "Fields filled successfully!",
+        "undo_fill_from_jisho": "Fill from Jisho",
         "button_ok": "OK",          
         "button_cancel": "Cancel",
 
@@ -204,6 +306,35 @@ TRANSLATIONS = {
         "input_dialog_label": "Search term:",
         "editor_button_tooltip": "Search Jisho (Ctrl+Shift+J)",
         "warning_no_mappings": "No field mappings are configured. Please configure at least one mapping in the settings.",
+
+        # Batch Fill
+        "batch_fill_action": "Fill Selected Notes from Jisho",
+        "batch_fill_progress": "Looking up terms on Jisho... ({done}/{total})",
+        "batch_fill_done": "Filled {filled} notes. Not found: {missing}. Failed: {failed}. Skipped: {skipped}.",
+
+        # Local Dictionary
+        "import_dictionary_action": "Import JMdict/JMnedict Dictionary...",
+        "import_dictionary_progress": "Importing dictionary... ({count} entries)",
+        "import_dictionary_done": "Imported {count} dictionary entries.",
+        "import_dictionary_cancelled": "Dictionary import cancelled. Nothing was changed.",
+
+        # Performance Statistics
+        "perf_stats_action": "Performance Statistics...",
+        "perf_stats_title": "GRKN Anki Jisho Connect Performance",
+        "perf_column_name": "Measurement",
+        "perf_column_count": "Count",
+        "perf_column_mean": "Mean (ms)",
+        "perf_column_p50": "Median (ms)",
+        "perf_column_p95": "95% (ms)",
+        "perf_column_max": "Max (ms)",
+        "perf_no_samples": "No timings recorded yet.",
+        "perf_cache_summary": "Lookup cache: {hits} hits, {misses} misses ({rate:.0%} hit rate), {entries} terms stored.",
+        "perf_cache_disabled": "Lookup cache: disabled.",
+        "perf_pool_summary": "Fetch engine: {active} running, {waiting} waiting, limit {limit}.",
+        "perf_coalesced_summary": "Jisho requests: {leaders} sent, {coalesced} joined an identical request in flight.",
+        "perf_log_to_file": "Also write timings to user_files/perf_log.jsonl",
+        "perf_clear": "Clear",
+        "button_close": "Close",
     },
     "pt": {
         # Config Dialog
@@ -219,6 +350,18 @@ TRANSLATIONS = {
         "add_mapping": "+ Adicionar Mapeamento",
         "disable_warning": "Desativar aviso de seleção de múltiplas palavras",
         "remove_pos_ending": "Remover 'with x ending' de Classe Gramatical",
+        "live_search": "Buscar enquanto digita",
+        "prewarm": "Pré-carregar em segundo plano as buscas das próximas notas",
+        "fold_kana": "Buscar katakana como hiragana",
+        "sentence_mode": "Modo frase: buscar cada palavra de uma frase",
+        "sentence_mode_no_dictionary": "Nenhum JMdict importado: as frases são divididas só pela escrita (kanji, kana), então as palavras podem ser cortadas no lugar errado.",
+        "batch_pick_rule": "Significados no Preenchimento em Lote:",
+        "batch_pick_first": "Primeiro significado",
+        "batch_pick_all": "Todos os significados",
+        "data_source": "Fonte do Dicionário:",
+        "data_source_remote": "Jisho.org (online)",
+        "data_source_local": "JMdict local (offline)",
+        "data_source_local_first": "JMdict local, depois Jisho.org",
         "save_and_close": "Salvar e Fechar",
         "warning_fill_mappings": "Preencha todos os pares de mapeamento antes de salvar.",
         "info_settings_saved": "Configurações salvas!",
@@ -231,11 +374,18 @@ TRANSLATIONS = {
         "loading_message": "Procurando resultados...",
         "loading_message_term": "Procurando por '{term}'...",
         "no_results": "Desculpe, não foi encontrado nada para '{term}'.",
+        "loading_sentence": "Buscando {count} palavras...",
+        "sentence_word_no_results": "nada encontrado",
+        "sentence_word_failed": "falha na busca",
+        "search_failed": "Erro na busca: {error}",
+        "load_more": "Carregar mais resultados",
+        "loading_more": "Carregando mais resultados...",
         "other_forms": "Outras formas:",
         "multi_word_warning_title": "Você selecionou definições de múltiplas palavras.",
         "multi_word_warning_body": "Os significados de múltiplas palavras serão adicionados à nota.",
         "ok_dont_warn_again": "OK, não me avise novamente",
         "info_fields_filled": "Campos preenchidos com sucesso!",
+        "undo_fill_from_jisho": "Preencher pelo Jisho",
         "button_ok": "OK",           
         "button_cancel": "Cancelar", 
         
@@ -244,13 +394,45 @@ TRANSLATIONS = {
         "input_dialog_label": "Termo de busca:",
         "editor_button_tooltip": "Buscar no Jisho (Ctrl+Shift+J)",
         "warning_no_mappings": "Nenhum mapeamento de campo está configurado. Por favor, configure ao menos um nas configurações.",
+
+        # Batch Fill
+        "batch_fill_action": "Preencher Notas Selecionadas pelo Jisho",
+        "batch_fill_progress": "Buscando termos no Jisho... ({done}/{total})",
+        "batch_fill_done": "{filled} notas preenchidas. Não encontradas: {missing}. Falhas: {failed}. Ignoradas: {skipped}.",
+
+        # Local Dictionary
+        "import_dictionary_action": "Importar Dicionário JMdict/JMnedict...",
+        "import_dictionary_progress": "Importando dicionário... ({count} entradas)",
+        "import_dictionary_done": "{count} entradas de dicionário importadas.",
+        "import_dictionary_cancelled": "Importação do dicionário cancelada. Nada foi alterado.",
+
+        # Performance Statistics
+        "perf_stats_action": "Estatísticas de Desempenho...",
+        "perf_stats_title": "Desempenho da GRKN Anki Jisho Connect",
+        "perf_column_name": "Medição",
+        "perf_column_count": "Qtd.",
+        "perf_column_mean": "Média (ms)",
+        "perf_column_p50": "Mediana (ms)",
+        "perf_column_p95": "95% (ms)",
+        "perf_column_max": "Máx. (ms)",
+        "perf_no_samples": "Nenhuma medição registrada ainda.",
+        "perf_cache_summary": "Cache de buscas: {hits} acertos, {misses} falhas ({rate:.0%} de acerto), {entries} termos guardados.",
+        "perf_cache_disabled": "Cache de buscas: desativado.",
+        "perf_pool_summary": "Motor de buscas: {active} em andamento, {waiting} aguardando, limite {limit}.",
+        "perf_coalesced_summary": "Requisições ao Jisho: {leaders} enviadas, {coalesced} aproveitaram uma requisição idêntica em andamento.",
+        "perf_log_to_file": "Gravar também as medições em user_files/perf_log.jsonl",
+        "perf_clear": "Limpar",
+        "button_close": "Fechar",
     }
 }
 
-current_language = "en"
+current_language: Optional[str] = None
 
 def _(key: str) -> str:
     """Gets the translated string for the current language, falling back to English."""
+    if current_language is None:
+        # The language is only read from config.json when the first text is shown
+        set_language(get_config().get("language", "en"))
     return TRANSLATIONS.get(current_language, {}).get(key, TRANSLATIONS["en"].get(key, key))
 
 def set_language(lang_code: str):
@@ -265,14 +447,39 @@ ADDON_FOLDER = os.path.dirname(__file__)
 CONFIG_PATH = os.path.join(ADDON_FOLDER, "config.json")
 _jisho_dialog_ref: Optional['ResultsDialog'] = None
 _config_dialog_ref: Optional['ConfigDialog'] = None
-_active_jisho_workers: List[Tuple[QThread, 'JishoFetchWorker']] = []
+_perf_dialog_ref: Optional['PerfStatsDialog'] = None
+_addon_icon_path: Optional[str] = None
+
+ADDON_ICON_SVG = """
+<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24'>
+  <rect width='24' height='24' rx='5' fill='#3ec97a'/>
+  <text x='12' y='16' font-family='Segoe UI, Arial, sans-serif' font-size='13' fill='white' text-anchor='middle' font-weight='bold' letter-spacing='1'>JI</text>
+</svg>
+"""
+
+def get_results_dialog() -> Optional['ResultsDialog']:
+    return _jisho_dialog_ref
+
+def addon_icon_path() -> str:
+    """Path of the add-on icon, written on first use; the file system is only checked once per session."""
+    global _addon_icon_path
+    if _addon_icon_path is None:
+        icon_path = os.path.join(ADDON_FOLDER, "jisho_icon.svg")
+        if not os.path.exists(icon_path):
+            os.makedirs(os.path.dirname(icon_path), exist_ok=True)
+            with open(icon_path, "w", encoding="utf-8") as f:
+                f.write(ADDON_ICON_SVG)
+        _addon_icon_path = icon_path
+    return _addon_icon_path
 
 def update_theme():
     """Update the theme for all open windows when Anki's theme changes."""
     global theme
     theme = DarkTheme if theme_manager.night_mode else LightTheme
+    theme_styles().warm()
     
-    if _jisho_dialog_ref and _jisho_dialog_ref.isVisible():
+    # Restyling the results window is cheap, so a hidden one is updated too
+    if _jisho_dialog_ref:
         _jisho_dialog_ref.restyle()
         
     if _config_dialog_ref and _config_dialog_ref.isVisible():
@@ -290,7 +497,26 @@ DEFAULT_CONFIG = {
     "mappings": {},
     "fill_mode": "replace",
     "disable_multi_word_warning": False,
-    "remove_pos_ending": True
+    "remove_pos_ending": True,
+    "cache_enabled": True,
+    "cache_ttl_hours": 168,
+    "cache_max_entries": 5000,
+    "request_timeout": 15,
+    "request_retries": 3,
+    "batch_pick_rule": "first_sense",
+    "fetch_workers": 4,
+    "data_source": "remote",
+    "live_search": False,
+    "live_search_delay_ms": 400,
+    "prewarm_enabled": False,
+    "prewarm_interval_ms": 2000,
+    "prewarm_max_notes": 50,
+    "initial_result_pages": 2,
+    "perf_buffer_size": 500,
+    "perf_log_enabled": False,
+    "fold_kana": False,
+    "sentence_mode": False,
+    "sentence_entries_per_word": 5
 }
 
 def load_config() -> Dict[str, Any]:
@@ -307,1016 +533,926 @@ def load_config() -> Dict[str, Any]:
         return DEFAULT_CONFIG.copy()
     return DEFAULT_CONFIG.copy()
 
-set_language(load_config().get("language", "en"))
+def _validated_mappings(raw: Any) -> Tuple[Tuple[str, str], ...]:
+    """Normalize the stored mappings into (jisho, field) pairs, dropping incomplete rows."""
+    if isinstance(raw, dict):
+        pairs = [(jisho, field) for field, jisho in raw.items()]
+    elif isinstance(raw, list):
+        pairs = [(m.get("jisho", ""), m.get("field", "")) for m in raw if isinstance(m, dict)]
+    else:
+        pairs = []
+    return tuple((jisho, field) for jisho, field in pairs if jisho and field)
+
+class ConfigSnapshot:
+    """Read-only view of config.json, parsed once and shared by the hot paths."""
+    def __init__(self, data: Dict[str, Any], mtime: Optional[int]):
+        self.data = data
+        self.mtime = mtime
+        self.mappings = _validated_mappings(data.get("mappings"))
+        self.search_field: str = data.get("search_field", "N/A")
+        self.fill_mode: str = data.get("fill_mode", "replace")
+        self.remove_pos_ending: bool = data.get("remove_pos_ending", True)
+        self.disable_multi_word_warning: bool = data.get("disable_multi_word_warning", False)
+        self.plan = MappingPlan(self.mappings, self.remove_pos_ending)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a mutable deep copy, e.g. for editing in the settings dialog."""
+        return copy.deepcopy(self.data)
+
+_config_snapshot: Optional[ConfigSnapshot] = None
+
+def _config_mtime() -> Optional[int]:
+    try:
+        return os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+def get_config() -> ConfigSnapshot:
+    """Return the cached config, re-reading config.json only if its mtime changed."""
+    global _config_snapshot
+    mtime = _config_mtime()
+    if _config_snapshot is None or _config_snapshot.mtime != mtime:
+        _config_snapshot = ConfigSnapshot(load_config(), mtime)
+    return _config_snapshot
 
 def save_config(config: Dict[str, Any]):
     """Save settings to file."""
+    global _config_snapshot
     os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         json.dump(config, f, indent=4, ensure_ascii=False)
+    merged = copy.deepcopy(config)
+    for key, value in DEFAULT_CONFIG.items():
+        merged.setdefault(key, value)
+    _config_snapshot = ConfigSnapshot(merged, _config_mtime())
+    if _lookup_cache is not None:
+        _lookup_cache.configure(config.get("cache_ttl_hours", 168) * 3600, config.get("cache_max_entries", 5000))
+    if _http_session is not None:
+        _http_session.configure(config.get("request_timeout", 15), config.get("request_retries", 3))
+    if _fetch_engine is not None:
+        _fetch_engine.set_limit(int(config.get("fetch_workers", 4)))
+    configure_perf_stats(_config_snapshot)
 
 # -------------------------
-# Settings Dialog
+# Performance Stats
 # -------------------------
+PERF_LOG_PATH = os.path.join(ADDON_FOLDER, "user_files", "perf_log.jsonl")
+perf_stats = PerfStats()
 
-class ConfigDialog(QDialog):
-    """Dialog for configuring the add-on."""
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("GRKN Anki Jisho Connect Settings")
-        self.setMinimumWidth(500)
-        
-        self.config = load_config()
-        self.mapping_rows_data = [] 
+def configure_perf_stats(config: ConfigSnapshot):
+    """Apply the ring buffer size and JSONL logging settings."""
+    log_path = None
+    if config.get("perf_log_enabled", False):
+        os.makedirs(os.path.dirname(PERF_LOG_PATH), exist_ok=True)
+        log_path = PERF_LOG_PATH
+    perf_stats.configure(int(config.get("perf_buffer_size", 500)), log_path)
 
-        self._setup_ui()
+profile_will_close.append(perf_stats.close)
 
-        self.restyle()
+# -------------------------
+# Lookup Cache
+# -------------------------
+CACHE_PATH = os.path.join(ADDON_FOLDER, "lookup_cache.sqlite3")
+_lookup_cache: Optional[LookupCache] = None
+
+def get_lookup_cache() -> Optional[LookupCache]:
+    """Return the shared lookup cache, opening it on first use. None if disabled."""
+    global _lookup_cache
+    config = get_config()
+    if not config.get("cache_enabled", True):
+        return None
+    if _lookup_cache is None:
+        try:
+            _lookup_cache = LookupCache(
+                CACHE_PATH,
+                ttl_seconds=config.get("cache_ttl_hours", 168) * 3600,
+                max_entries=config.get("cache_max_entries", 5000),
+            )
+        except Exception as e:
+            log.warning("Lookup cache unavailable: %s", e)
+            return None
+    return _lookup_cache
 
-        self._connect_signals()
+# -------------------------
+# HTTP Session
+# -------------------------
+_http_session: Optional['JishoSession'] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> 'JishoSession':
+    """Return the shared keep-alive session used for every Jisho request."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            # requests is only imported when the first request is made
+            from .jishosession import JishoSession
+
+            config = get_config()
+            _http_session = JishoSession(
+                timeout=config.get("request_timeout", 15),
+                retries=config.get("request_retries", 3),
+                stats=perf_stats,
+            )
+    return _http_session
 
-        self._load_initial_data()
+# -------------------------
+# Fetch Engine
+# -------------------------
+_fetch_engine: Optional['FetchEngine'] = None
 
-    def _setup_ui(self):
-        """Constrói a interface gráfica uma única vez."""
-        main_layout = QVBoxLayout(self)
-        self.setLayout(main_layout)
-        main_layout.setSpacing(15)
+def get_fetch_engine() -> 'FetchEngine':
+    """Return the event loop engine that runs every Jisho lookup.
 
-        # --- Seletor de Idioma ---
-        lang_layout = QHBoxLayout()
-        self.lang_label = QLabel()
-        lang_layout.addWidget(self.lang_label)
-        self.lang_dropdown = QComboBox()
-        self.lang_dropdown.addItems(["English", "Português"])
-        self.lang_map = {0: "en", 1: "pt"}
-        lang_layout.addWidget(self.lang_dropdown)
-        main_layout.addLayout(lang_layout)
+    fetch_workers is the number of lookups allowed in flight at once.
+    """
+    global _fetch_engine
+    if _fetch_engine is None:
+        from .asyncfetch import FetchEngine
+
+        _fetch_engine = FetchEngine(
+            lookup_jisho,
+            limit=int(get_config().get("fetch_workers", 4)),
+            dispatch=mw.taskman.run_on_main,
+            key_fn=lambda term, page: (LookupCache.normalize_key(normalize_search_term(term)), page),
+        )
+    return _fetch_engine
+
+def running_fetch_engine() -> Optional['FetchEngine']:
+    """The fetch engine if a lookup has already started it, without starting one."""
+    return _fetch_engine
+
+def shutdown_fetch_engine():
+    """Cancel fetches in flight when the profile closes so Anki can exit promptly."""
+    global _fetch_engine
+    if _fetch_engine is not None:
+        _fetch_engine.shutdown()
+        _fetch_engine = None
+
+profile_will_close.append(shutdown_fetch_engine)
 
-        # --- Grupo de Configurações Principais ---
-        self.main_config_group = QGroupBox()
-        main_config_layout = QGridLayout(self.main_config_group)
-        main_config_layout.setSpacing(10)
-        
-        self.note_type_label = QLabel()
-        main_config_layout.addWidget(self.note_type_label, 0, 0)
-        self.card_type_dropdown = QComboBox()
-        self.card_type_names = sorted(mw.col.models.all_names())
-        self.card_type_dropdown.addItems([""] + self.card_type_names)
-        main_config_layout.addWidget(self.card_type_dropdown, 0, 1)
-
-        self.search_field_label = QLabel()
-        main_config_layout.addWidget(self.search_field_label, 1, 0)
-        self.search_field_dropdown = QComboBox()
-        main_config_layout.addWidget(self.search_field_dropdown, 1, 1)
-
-        self.fill_mode_label = QLabel()
-        main_config_layout.addWidget(self.fill_mode_label, 2, 0)
-        self.fill_mode_dropdown = QComboBox()
-        main_config_layout.addWidget(self.fill_mode_dropdown, 2, 1)
-        
-        main_layout.addWidget(self.main_config_group)
+# -------------------------
+# Local Dictionary
+# -------------------------
+# Kept in user_files so it survives add-on updates
+LOCAL_DICT_PATH = os.path.join(ADDON_FOLDER, "user_files", "jmdict.sqlite3")
+DATA_SOURCES = ["remote", "local", "local_first"]
+_local_dictionary: Optional[LocalDictionary] = None
+# A cancelled or failed import leaves the store file behind with no entries in it
+_local_dictionary_has_entries = False
+_local_dictionary_lock = threading.Lock()
+
+def _open_local_dictionary() -> LocalDictionary:
+    """Open the store once; the caller holds _local_dictionary_lock."""
+    global _local_dictionary, _local_dictionary_has_entries
+    if _local_dictionary is None:
+        _local_dictionary = LocalDictionary(LOCAL_DICT_PATH)
+        _local_dictionary_has_entries = _local_dictionary.entry_count() > 0
+    return _local_dictionary
+
+def get_local_dictionary() -> Optional[LocalDictionary]:
+    """Return the imported JMdict store, or None if no entries have been imported yet."""
+    with _local_dictionary_lock:
+        if _local_dictionary is None and os.path.exists(LOCAL_DICT_PATH):
+            try:
+                _open_local_dictionary()
+            except Exception as e:
+                log.warning("Local dictionary unavailable: %s", e)
+        return _local_dictionary if _local_dictionary_has_entries else None
+
+def import_local_dictionary():
+    """Ask for a JMdict/JMnedict XML file and import it in the background."""
+    path, _filter = QFileDialog.getOpenFileName(mw, _("import_dictionary_action"), "", "JMdict XML (*.xml *.gz);;*")
+    if not path:
+        return
 
-        # --- Grupo de Mapeamento de Campos ---
-        self.mapping_group = QGroupBox()
-        mapping_group_layout = QVBoxLayout(self.mapping_group)
+    def do_import(_col) -> Optional[int]:
+        global _local_dictionary_has_entries
+        os.makedirs(os.path.dirname(LOCAL_DICT_PATH), exist_ok=True)
+        with _local_dictionary_lock:
+            dictionary = _open_local_dictionary()
+        try:
+            return dictionary.import_xml(
+                path,
+                progress=lambda count: mw.taskman.run_on_main(
+                    lambda: mw.progress.update(label=_("import_dictionary_progress").format(count=count))
+                ),
+                should_cancel=mw.progress.want_cancel,
+            )
+        finally:
+            # Cancelled and failed imports roll back, so only a committed one can change this
+            has_entries = dictionary.entry_count() > 0
+            with _local_dictionary_lock:
+                _local_dictionary_has_entries = has_entries
+
+    def on_imported(count: Optional[int]):
+        if count is None:
+            tooltip(_("import_dictionary_cancelled"))
+        else:
+            tooltip(_("import_dictionary_done").format(count=count))
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setMinimumHeight(100)
-        scroll_area.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        
-        scroll_content = QWidget()
-        scroll_content.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Maximum)
-        self.mapping_grid_layout = QGridLayout(scroll_content)
-        self.mapping_grid_layout.setSpacing(5)
-        scroll_area.setWidget(scroll_content)
-        
-        mapping_group_layout.addWidget(scroll_area)
+    QueryOp(
+        parent=mw,
+        op=do_import,
+        success=on_imported,
+    ).with_progress(_("import_dictionary_progress").format(count=0)).run_in_background()
 
-        self.add_btn = QPushButton()
-        self.add_btn.setStyleSheet("padding: 5px;")
-        mapping_group_layout.addWidget(self.add_btn)
-        
-        main_layout.addWidget(self.mapping_group)
+def show_perf_stats_dialog():
+    global _perf_dialog_ref
+    if _perf_dialog_ref is None:
+        from .dialogs import PerfStatsDialog
 
-        # --- Opções Adicionais e Botão Salvar ---
-        self.warn_checkbox = QCheckBox()
-        self.remove_pos_checkbox = QCheckBox()
-        self.save_button = QPushButton()
-        self.save_button.setStyleSheet("padding: 8px; font-weight: bold;")
-        
-        main_layout.addWidget(self.warn_checkbox)
-        main_layout.addWidget(self.remove_pos_checkbox)
-        main_layout.addWidget(self.save_button)
+        _perf_dialog_ref = PerfStatsDialog()
+    _perf_dialog_ref.show()
+    _perf_dialog_ref.raise_()
+    _perf_dialog_ref.activateWindow()
 
-        self.scroll_area = scroll_area
+# -------------------------
+# Jisho API & Worker
+# -------------------------
+def normalize_search_term(text: str, config: Optional[ConfigSnapshot] = None) -> str:
+    """Clean a field value or typed text into the term sent to Jisho and used as the cache key."""
+    config = config or get_config()
+    return normalize_term(text, config.get("fold_kana", False))
+
+def segment_sentence(text: str) -> List[Token]:
+    """Split a sentence into the words to look up, matching against the local JMdict when one is imported."""
+    local = get_local_dictionary()
+    return segment(text, local.known_keys if local is not None else None)
+
+def lookup_jisho(term: str, page: int = 1, cancel: Optional[CancelToken] = None) -> Optional[List[Entry]]:
+    """Look up one result page of a term in the configured data source (Jisho API and/or local JMdict).
+
+    Blocking: the fetch engine runs it on its thread pool, so the SQLite queries and the
+    HTTP request never run on the event loop or the GUI thread. The local dictionary answers
+    with a single page. Raises FetchError when the request fails and no cached copy exists,
+    and LookupCancelled if the cancel token fires first.
+    """
+    config = get_config()
+    term = normalize_search_term(term, config)
+    if not term:
+        return None
+    entries = _lookup_local(term, page, config)
+    if entries is not None:
+        return entries
+    cache = get_lookup_cache()
+    cached = _cached_page(cache, term, page)
+    if cached is not None:
+        return cached
+    try:
+        entries = _page_entries(get_http_session().search(term, cancel, page))
+    except FetchError:
+        stale = cache.get_stale(term, page) if cache else None
+        if stale is not None:
+            return stale
+        raise
+    if cache and entries is not None:
+        cache.put(term, entries, page)
+    return entries
+
+def _lookup_local(term: str, page: int, config: ConfigSnapshot) -> Optional[List[Entry]]:
+    """Search the local dictionary if the data source allows it; None means Jisho should be asked."""
+    data_source = config.get("data_source", "remote")
+    if data_source == "remote":
+        return None
+    local = get_local_dictionary()
+    # With no dictionary imported the lookup falls back to Jisho
+    if local is None:
+        return None
+    with perf_stats.timed("local_search") as details:
+        entries = local.search(term)
+        details["entries"] = len(entries)
+    if entries or data_source == "local":
+        return entries if page == 1 else []
+    return None
+
+def _cached_page(cache: Optional[LookupCache], term: str, page: int) -> Optional[List[Entry]]:
+    if not cache:
+        return None
+    with perf_stats.timed("cache_get") as details:
+        cached = cache.get(term, page)
+        details["hit"] = cached is not None
+    return cached
+
+def _page_entries(data: Dict[str, Any]) -> Optional[List[Entry]]:
+    """Parse a Jisho response into entry records; the raw dicts are dropped right away."""
+    if data.get("meta", {}).get("status") != 200:
+        return None
+    with perf_stats.timed("entry_parse") as details:
+        entries = parse_entries(data.get("data"))
+        details["entries"] = len(entries)
+    return entries
 
-        self._retranslate_ui()
+class JishoFetchWorker(QObject):
+    """Qt adapter over the fetch engine for consecutive result pages of one term.
 
-    def _retranslate_ui(self):
-        """Atualiza todo o texto da UI para o idioma atual."""
-        self.setWindowTitle(_("settings_title"))
-        self.lang_label.setText(_("language"))
-        
-        self.main_config_group.setTitle(_("main_settings"))
-        self.note_type_label.setText(_("note_type"))
-        self.search_field_label.setText(_("search_field"))
-        self.fill_mode_label.setText(_("fill_mode"))
-        
-        current_fill_mode_index = self.fill_mode_dropdown.currentIndex()
-        self.fill_mode_dropdown.clear()
-        self.fill_mode_dropdown.addItems([_("fill_mode_replace"), _("fill_mode_append")])
-        if current_fill_mode_index != -1:
-            self.fill_mode_dropdown.setCurrentIndex(current_fill_mode_index)
-        
-        self.mapping_group.setTitle(_("field_mapping"))
-        self.add_btn.setText(_("add_mapping"))
-        self.warn_checkbox.setText(_("disable_warning"))
-        self.remove_pos_checkbox.setText(_("remove_pos_ending"))
-        self.save_button.setText(_("save_and_close"))
-
-    def _language_changed(self):
-        """Chamado quando o idioma é alterado no dropdown."""
-        lang_code = self.lang_map.get(self.lang_dropdown.currentIndex(), "en")
-        set_language(lang_code)
-        
-        self._retranslate_ui()
-        
-        if _jisho_dialog_ref and _jisho_dialog_ref.isVisible():
-            _jisho_dialog_ref._retranslate_ui()
+    Pages are fetched in order on the engine's event loop and each one is
+    emitted as soon as it is parsed. Signals are emitted on the GUI thread.
+    """
+    page_ready = pyqtSignal(list, int)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
 
-    def restyle(self):
-        """Aplica/atualiza estilos com base no tema, SEM recriar os widgets."""
-        icon_path = os.path.join(ADDON_FOLDER, "jisho_icon.svg")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-
-        group_box_style = f"""
-            QGroupBox {{
-                border: 1px solid {theme.BORDER_DARK};
-                border-radius: 4px;
-                margin-top: 9px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 4px;
-                left: 8px;
-            }}
-        """
-        self.main_config_group.setStyleSheet(group_box_style)
-        self.mapping_group.setStyleSheet(group_box_style)
-
-        self.scroll_area.setStyleSheet(f"QScrollArea {{ border: 1px solid {theme.BORDER_LIGHT}; border-radius: 4px; }}")
-
-        self._rebuild_mapping_grid()
-
-    def _connect_signals(self):
-        """Conecta todos os sinais aos seus slots."""
-        self.lang_dropdown.currentIndexChanged.connect(self._language_changed)
-        self.card_type_dropdown.currentIndexChanged.connect(self.update_fields)
-        self.add_btn.clicked.connect(self.add_mapping_row)
-        self.save_button.clicked.connect(self.save_config_clicked)
-
-    def _load_initial_data(self):
-        """Carrega os dados da configuração na interface."""
-        lang_code = self.config.get("language", "en")
-        lang_index = 0
-        for index, code in self.lang_map.items():
-            if code == lang_code:
-                lang_index = index
-                break
-        self.lang_dropdown.setCurrentIndex(lang_index)
+    def __init__(self, term: str, cancel: Optional[CancelToken] = None, first_page: int = 1, page_count: int = 1):
+        super().__init__()
+        self.term = term
+        self.cancel = cancel
+        self.first_page = first_page
+        self.page_count = max(1, page_count)
+
+    def start(self) -> 'FetchBatch':
+        async def fetch_pages(engine: 'FetchEngine') -> List[Entry]:
+            all_entries = []
+            for page in range(self.first_page, self.first_page + self.page_count):
+                entries = await engine.fetch(self.term, page) or []
+                engine.dispatch(lambda entries=entries, page=page: self.page_ready.emit(entries, page))
+                all_entries.extend(entries)
+                # A short page means there are no more results
+                if len(entries) < PAGE_SIZE:
+                    break
+            return all_entries
+
+        batch = get_fetch_engine().submit(
+            fetch_pages,
+            on_done=self.finished.emit,
+            on_error=lambda e: self.error.emit(str(e)),
+            on_cancelled=self.cancelled.emit,
+        )
+        if self.cancel is not None:
+            self.cancel.add_callback(batch.cancel)
+        return batch
+
+class SearchController(QObject):
+    """Runs a dialog's Jisho searches, letting each new search supersede the last.
+
+    Every search gets a generation number: starting a new one cancels the HTTP
+    request of the previous search, and any result that still arrives from an
+    older generation is dropped. Fetches run on the fetch engine's event loop, so
+    nothing is ever joined on the GUI thread.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._cancel: Optional[CancelToken] = None
+        self._workers = set()
 
-        self.card_type_dropdown.setCurrentText(self.config.get("card_type", ""))
-        self.fill_mode_dropdown.setCurrentIndex(1 if self.config.get("fill_mode") == "append" else 0)
-        self.warn_checkbox.setChecked(self.config.get("disable_multi_word_warning", False))
-        self.remove_pos_checkbox.setChecked(self.config.get("remove_pos_ending", True))
-        
-        self.update_fields() 
-        self.load_mapping_rows()
-
-    def _clear_layout(self, layout):
-        """Remove todos os widgets de um layout."""
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-    def _rebuild_mapping_grid(self):
-        """Limpa e recria o grid de mapeamento com base em self.mapping_rows_data."""
-        self._clear_layout(self.mapping_grid_layout)
-        
-        jisho_options = ["", "Word", "Reading", "Meaning", "Part of speech", "Info", "Tags", "Other forms", "JLPT Level", "Wanikani Level", "Is_Common"]
-        reorder_button_style = f"..." 
-        remove_button_style = f"..." 
+    def start(self, term: str, on_finished, on_error, on_page=None, first_page: int = 1, page_count: int = 1) -> int:
+        """Start a search; callbacks run on the GUI thread only if it is still current.
 
-        for row_index, row_data in enumerate(self.mapping_rows_data):
-            left_value, right_value = row_data['jisho'], row_data['field']
+        on_page(entries, page) is called for every page as it arrives, before
+        on_finished receives the entries of all fetched pages.
+        """
+        self.cancel()
+        generation = self._generation
+        cancel = CancelToken()
+        self._cancel = cancel
 
-            up_btn = QPushButton(icon=get_themed_icon("arrow_up"))
-            up_btn.setFixedSize(30, 30)
-            up_btn.setStyleSheet(reorder_button_style)
-            
-            down_btn = QPushButton(icon=get_themed_icon("arrow_down"))
-            down_btn.setFixedSize(30, 30)
-            down_btn.setStyleSheet(reorder_button_style)
-            
-            left_combo = QComboBox(); left_combo.addItems(jisho_options)
-            arrow_label = QLabel("→"); arrow_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            right_combo = QComboBox(); right_combo.addItems([""] + self.current_field_names)
-            
-            remove_btn = QPushButton(icon=get_themed_icon("remove"))
-            remove_btn.setFixedSize(30, 30)
-            remove_btn.setStyleSheet(remove_button_style)
+        worker = JishoFetchWorker(term, cancel, first_page, page_count)
 
-            left_combo.setCurrentText(left_value)
-            right_combo.setCurrentText(right_value)
+        if on_page is not None:
+            worker.page_ready.connect(self._current_only(generation, on_page, final=False))
+        worker.finished.connect(self._current_only(generation, on_finished))
+        worker.error.connect(self._current_only(generation, on_error))
 
-            up_btn.clicked.connect(lambda _, idx=row_index: self._move_row(idx, -1))
-            down_btn.clicked.connect(lambda _, idx=row_index: self._move_row(idx, 1))
-            remove_btn.clicked.connect(lambda _, idx=row_index: self._remove_row(idx))
+        # Keep a reference until the final signal arrives, or the worker would be collected first
+        self._workers.add(worker)
 
-            left_combo.currentTextChanged.connect(lambda text, idx=row_index: self.mapping_rows_data[idx].update({"jisho": text}))
-            right_combo.currentTextChanged.connect(lambda text, idx=row_index: self.mapping_rows_data[idx].update({"field": text}))
-            
-            self.mapping_grid_layout.addWidget(up_btn, row_index, 0)
-            self.mapping_grid_layout.addWidget(down_btn, row_index, 1)
-            self.mapping_grid_layout.addWidget(left_combo, row_index, 2)
-            self.mapping_grid_layout.addWidget(arrow_label, row_index, 3)
-            self.mapping_grid_layout.addWidget(right_combo, row_index, 4)
-            self.mapping_grid_layout.addWidget(remove_btn, row_index, 5)
-
-        self.mapping_grid_layout.setColumnStretch(2, 1)
-        self.mapping_grid_layout.setColumnStretch(4, 1)
-
-        for i in range(len(self.mapping_rows_data)):
-            self.mapping_grid_layout.setRowStretch(i, 0)
-        self.mapping_grid_layout.setRowStretch(len(self.mapping_rows_data), 1)
-
-        self._update_button_states()
-
-    def add_mapping_row(self):
-        """Adiciona um novo mapeamento à lista de dados e reconstrói o grid."""
-        self.mapping_rows_data.append({"jisho": "", "field": ""})
-        self._rebuild_mapping_grid()
-
-    def _remove_row(self, index):
-        """Remove uma linha da lista de dados e reconstrói o grid."""
-        if 0 <= index < len(self.mapping_rows_data):
-            del self.mapping_rows_data[index]
-            self._rebuild_mapping_grid()
-            
-    def _move_row(self, index, direction):
-        """Move uma linha, reconstrói o grid e agenda o posicionamento do cursor."""
-        if not (0 <= index < len(self.mapping_rows_data)):
-            return
-        
-        new_index = index + direction
-        if not (0 <= new_index < len(self.mapping_rows_data)):
-            return
+        def release(*_args):
+            self._workers.discard(worker)
+            worker.deleteLater()
 
-        self.mapping_rows_data.insert(new_index, self.mapping_rows_data.pop(index))
+        for signal in (worker.finished, worker.error, worker.cancelled):
+            signal.connect(release)
 
-        self._rebuild_mapping_grid()
+        # The engine emits the worker's signals on the GUI thread
+        worker.start()
+        return generation
 
-        target_column = 0 if direction == -1 else 1
-        
-        target_item = self.mapping_grid_layout.itemAtPosition(new_index, target_column)
+    def start_many(self, terms: List[str], on_result, on_finished) -> int:
+        """Fetch the first result page of several terms concurrently.
 
-        if target_item and target_item.widget():
-            target_button = target_item.widget()
+        on_result(term, entries_or_exception) runs for each term as soon as it
+        completes and on_finished receives {term: entries_or_exception} at the
+        end; both only if the search is still current.
+        """
+        self.cancel()
+        generation = self._generation
+        cancel = CancelToken()
+        self._cancel = cancel
+        batch = get_fetch_engine().fetch_many(
+            terms,
+            on_result=self._current_only(generation, on_result, final=False),
+            on_error=self._current_only(generation, on_result, final=False),
+            on_finished=self._current_only(generation, on_finished),
+        )
+        cancel.add_callback(batch.cancel)
+        return generation
+
+    def _current_only(self, generation: int, callback, final: bool = True):
+        def deliver(*args):
+            if generation == self._generation:
+                if final:
+                    self._cancel = None
+                callback(*args)
+        return deliver
+
+    def cancel(self):
+        """Abort the in-flight search, if any; its result will be ignored."""
+        self._generation += 1
+        if self._cancel is not None:
+            self._cancel.cancel()
+            self._cancel = None
+
+class LivePrefetcher(QObject):
+    """Warms the lookup cache with whatever is being typed in the search box.
+
+    Each keystroke reschedules a short timer; when it fires, the current text is
+    fetched in the background so the debounced search finds it cached. Requests
+    for terms that are no longer a prefix of the text are cancelled.
+    """
+    def __init__(self, parent=None, delay_ms: int = 150):
+        super().__init__(parent)
+        self.delay_ms = delay_ms
+        self._term = ""
+        self._inflight: Dict[str, 'FetchBatch'] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._prefetch)
+
+    def update(self, term: str):
+        """Record the current text, cancelling prefetches it has made obsolete."""
+        self._term = term
+        for inflight_term, batch in list(self._inflight.items()):
+            if not term.startswith(inflight_term):
+                batch.cancel()
+                del self._inflight[inflight_term]
+        if term:
+            self._timer.start(self.delay_ms)
+        else:
+            self._timer.stop()
 
-            QTimer.singleShot(0, lambda: self._position_cursor_on_widget(target_button))
+    def cancel_all(self):
+        self._timer.stop()
+        for batch in self._inflight.values():
+            batch.cancel()
+        self._inflight.clear()
 
-    def _position_cursor_on_widget(self, widget):
-        """Calcula o centro de um widget e posiciona o cursor do mouse sobre ele."""
-        if not widget:
+    def _prefetch(self):
+        term = self._term
+        if not term or term in self._inflight or get_config().get("data_source", "remote") == "local":
+            return
+        cache = get_lookup_cache()
+        if cache and cache.contains(normalize_search_term(term)):
             return
 
-        button_center = widget.rect().center()
-
-        global_pos = widget.mapToGlobal(button_center)
-
-        QCursor.setPos(global_pos)
-
-    def _update_button_states(self):
-        """Habilita/desabilita botões de mover com base na posição."""
-        count = self.mapping_grid_layout.rowCount() -1 
-        for i in range(count):
-            up_btn_item = self.mapping_grid_layout.itemAtPosition(i, 0)
-            down_btn_item = self.mapping_grid_layout.itemAtPosition(i, 1)
-            if up_btn_item and down_btn_item:
-                up_btn_item.widget().setEnabled(i > 0)
-                down_btn_item.widget().setEnabled(i < count - 1)
-
-    def update_fields(self):
-        """Atualiza a lista de campos com base no tipo de nota selecionado."""
-        model_name = self.card_type_dropdown.currentText()
-        self.current_field_names = []
-        if model_name:
-            model = mw.col.models.by_name(model_name)
-            if model:
-                self.current_field_names = [fld["name"] for fld in model["flds"]]
-        
-        self.search_field_dropdown.clear()
-        self.search_field_dropdown.addItems(self.current_field_names)
-        
-        saved_search = self.config.get("search_field", "")
-        if saved_search in self.current_field_names:
-            self.search_field_dropdown.setCurrentText(saved_search)
+        def done(*_args):
+            if self._inflight.get(term) is batch:
+                del self._inflight[term]
 
-        self._rebuild_mapping_grid()
+        batch = get_fetch_engine().fetch_many([term], on_finished=done, on_cancelled=done)
+        self._inflight[term] = batch
 
-    def load_mapping_rows(self):
-        """Carrega os mapeamentos da config para a lista de dados."""
-        mappings = self.config.get("mappings", [])
-        
-        if isinstance(mappings, dict):
-            self.mapping_rows_data = [{"jisho": jisho, "field": field} for field, jisho in mappings.items()]
-        elif isinstance(mappings, list):
-            self.mapping_rows_data = mappings
+# -------------------------
+# Apply Mappings & Fill Note
+# -------------------------
+def build_field_values(entry: Entry, selected_senses, selected_other_forms, config: ConfigSnapshot) -> Dict[str, List[str]]:
+    """Compute the mapped values for one selected entry, grouped by note field."""
+    return config.plan.field_values(entry, selected_senses, selected_other_forms)
+
+def _set_field(note, field_name: str, value: str, fill_mode: str):
+    """Write a value into a note field in memory, honouring the fill mode."""
+    if not value or field_name not in note:
+        return
+    # Lógica de preenchimento (append/replace)
+    current_content = note[field_name]
+    if fill_mode == 'append' and current_content and value not in current_content:
+        # Para evitar duplicatas e espaços desnecessários
+        if current_content.endswith(' '):
+            note[field_name] += value
         else:
-            self.mapping_rows_data = []
+            note[field_name] += f" {value}"
+    else:
+        note[field_name] = value
 
-        self._rebuild_mapping_grid()
+def fill_note(note, selections: List[Tuple[Entry, list, list]], config: Optional[ConfigSnapshot] = None) -> bool:
+    """Merge the mapped values of every selection and write them into the note in memory.
 
-    def save_config_clicked(self):
-        """Valida e salva a configuração."""
-        for mapping in self.mapping_rows_data:
-            if not mapping["jisho"] or not mapping["field"]:
-                showWarning(_("warning_fill_mappings"))
-                return
-        
-        lang_code = self.lang_map.get(self.lang_dropdown.currentIndex(), "en")
-        self.config.update({
-            "language": lang_code,
-            "card_type": self.card_type_dropdown.currentText(),
-            "search_field": self.search_field_dropdown.currentText(),
-            "mappings": self.mapping_rows_data,
-            "fill_mode": "append" if self.fill_mode_dropdown.currentIndex() == 1 else "replace",
-            "disable_multi_word_warning": self.warn_checkbox.isChecked(),
-            "remove_pos_ending": self.remove_pos_checkbox.isChecked()
-        })
-        save_config(self.config)
-        showInfo(_("info_settings_saved"))
-        self.close()
+    Nothing is saved to the collection; returns True if any field received a value.
+    """
+    config = config or get_config()
+    fill_mode = config.fill_mode
+    merged: Dict[str, List[str]] = {}
+    for entry, selected_senses, selected_other_forms in selections:
+        for field_name, values in build_field_values(entry, selected_senses, selected_other_forms, config).items():
+            merged.setdefault(field_name, []).extend(values)
+
+    for field_name, values in merged.items():
+        _set_field(note, field_name, "; ".join(v for v in values if v), fill_mode)
+    return bool(merged)
+
+def save_notes(parent, notes: list, on_done=None):
+    """Save filled notes in one collection operation with a single undo entry.
+
+    The operation system refreshes the Browser and editors that show the notes,
+    so no global mw.reset() is needed.
+    """
+    if not notes:
+        return
+    new_notes = [note for note in notes if note.id == 0]
+    existing_notes = [note for note in notes if note.id != 0]
+    started = time.perf_counter()
+
+    def op(col):
+        with perf_stats.timed("collection_update", notes=len(notes)):
+            undo_pos = col.add_custom_undo_entry(_("undo_fill_from_jisho"))
+            if new_notes:
+                deck_id = col.decks.current()["id"]
+                for note in new_notes:
+                    col.add_note(note, deck_id)
+            if existing_notes:
+                col.update_notes(existing_notes)
+            return col.merge_undo_entries(undo_pos)
+
+    def on_success(_changes):
+        # Includes the screen refresh done by the operations system (the old mw.reset)
+        perf_stats.record("save_roundtrip", time.perf_counter() - started, notes=len(notes))
+        if on_done:
+            on_done()
+
+    CollectionOp(parent=parent, op=op).success(on_success).failure(
+        lambda e: showWarning(f"Error saving note: {str(e)}")
+    ).run_in_background()
+
+def apply_mappings_and_fill(note, entry: Entry, selected_senses, selected_other_forms):
+    """Apply mappings for a single selected entry and save the note."""
+    if fill_note(note, [(entry, selected_senses, selected_other_forms)]):
+        save_notes(mw, [note])
+
+def fill_and_save_note(note, selections, editor=None):
+    """Fill a note from every confirmed selection and save it once.
+
+    Success is reported only after the collection operation has finished;
+    save_notes reports a failed save itself.
+    """
+    with perf_stats.timed("fill_note", selections=len(selections)):
+        filled = fill_note(note, selections)
+    if not filled:
+        return
+    parent = editor.parentWindow if editor is not None else mw
+
+    def on_saved():
+        if editor is not None and editor.note is note:
+            editor.loadNoteKeepingFocus()
+        showInfo(_("info_fields_filled"), parent=parent)
+
+    save_notes(parent, [note], on_done=on_saved)
 
 # -------------------------
-# Jisho API & Worker
+# Batch Fill (Browser)
 # -------------------------
-def fetch_from_jisho(term: str) -> Optional[List[Dict[str, Any]]]:
-    """Fetch results from Jisho API."""
-    if not term:
-        return None
-    try:
-        url = f"https://jisho.org/api/v1/search/words?keyword={urllib.parse.quote(term)}"
-        resp = requests.get(url, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("data") if data.get("meta", {}).get("status") == 200 else None
-    except requests.RequestException as e:
-        showWarning(f"Error fetching from Jisho: {e}")
+def pick_batch_selection(term: str, entries: List[Entry], pick_rule: str) -> Optional[Tuple[Entry, list, list]]:
+    """Choose the entry and senses used to fill a note without user input."""
+    candidates = [e for e in entries if e.forms and e.senses]
+    if not candidates:
         return None
+    # Prefer an entry whose spelling or reading matches the term exactly
+    entry = next(
+        (e for e in candidates if any(term in (f.word, f.reading) for f in e.forms)),
+        candidates[0],
+    )
+    senses = list(entry.senses if pick_rule == "all_senses" else entry.senses[:1])
+    return entry, senses, []
+
+def batch_fill_notes(browser):
+    """Look up the search field of every selected note and fill the mapped fields."""
+    nids = browser.selected_notes()
+    if not nids:
+        return
+    config = get_config()
+    if not config.mappings:
+        showWarning(_("warning_no_mappings"))
+        return
+    search_field = config.search_field
+    pick_rule = config.get("batch_pick_rule", "first_sense")
+
+    def fetch_all(col):
+        notes = [col.get_note(nid) for nid in nids]
+        terms = {note.id: normalize_search_term(note[search_field], config) for note in notes if search_field in note}
+        unique_terms = sorted({t for t in terms.values() if t})
+        done = 0
+
+        def report(_term, _result):
+            nonlocal done
+            done += 1
+            mw.taskman.run_on_main(
+                lambda done=done: mw.progress.update(
+                    label=_("batch_fill_progress").format(done=done, total=len(unique_terms)),
+                    value=done,
+                    max=len(unique_terms),
+                )
+            )
+
+        # Every term is resolved together on the event loop, bounded by fetch_workers
+        fetched = get_fetch_engine().run_many(unique_terms, on_each=report, should_cancel=mw.progress.want_cancel)
+        results: Dict[str, Optional[List[Entry]]] = {
+            term: None if isinstance(result, Exception) else result or [] for term, result in fetched.items()
+        }
+        return notes, terms, results
+
+    def on_fetched(payload):
+        notes, terms, results = payload
+        filled = missing = failed = skipped = 0
+        changed_notes = []
+        map_started = time.perf_counter()
+        for note in notes:
+            term = terms.get(note.id)
+            # No search field, an empty term, or a lookup cut short by cancelling
+            if not term or term not in results:
+                skipped += 1
+                continue
+            entries = results[term]
+            if entries is None:
+                failed += 1
+                continue
+            selection = pick_batch_selection(term, entries, pick_rule)
+            if not selection:
+                missing += 1
+                continue
+            if fill_note(note, [selection], config):
+                changed_notes.append(note)
+                filled += 1
+            else:
+                skipped += 1
+        perf_stats.record("batch_fill_map", time.perf_counter() - map_started, notes=len(notes))
+        summary = _("batch_fill_done").format(filled=filled, missing=missing, failed=failed, skipped=skipped)
+        if changed_notes:
+            save_notes(browser, changed_notes, on_done=lambda: tooltip(summary, parent=browser))
+        else:
+            tooltip(summary, parent=browser)
 
-class JishoFetchWorker(QObject):
-    finished = pyqtSignal(list)
-    error = pyqtSignal(str)
-
-    def __init__(self, term: str):
-        super().__init__()
-        self.term = term
+    QueryOp(parent=browser, op=fetch_all, success=on_fetched).with_progress(
+        _("batch_fill_progress").format(done=0, total=len(nids))
+    ).run_in_background()
 
-    @pyqtSlot()
-    def run(self):
-        try:
-            entries = fetch_from_jisho(self.term)
-            self.finished.emit(entries or [])
-        except Exception as e:
-            self.error.emit(str(e))
+def setup_browser_menu(browser):
+    """Add the batch fill action to the Browser's Notes menu."""
+    action = QAction(_("batch_fill_action"), browser)
+    action.triggered.connect(lambda: batch_fill_notes(browser))
+    browser.form.menu_Notes.addSeparator()
+    browser.form.menu_Notes.addAction(action)
 
 # -------------------------
-# Results Dialog
+# Background Pre-warming
 # -------------------------
-class ResultsDialog(QDialog):
-    """Dialog to display Jisho search results."""
-    def __init__(self, initial_term: str, on_select):
-        super().__init__()
-        self.is_loading = False
-        self.on_select = on_select
-        self.initial_term = initial_term
-        self.entry_widgets = []
-        self.setWindowTitle("GRKN Anki Jisho Connect Result")
-        self.setMinimumSize(700, 750)
-        
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
-        self.setLayout(main_layout)
-
-        self.restyle()
-
-        if self.initial_term:
-            self.perform_search(self.initial_term)
-
-    def restyle(self):
-        """Re-applies all styles to the dialog based on the current theme."""
-
-        search_text = self.search_box.text() if hasattr(self, "search_box") else self.initial_term
-
-        while self.layout().count():
-            item = self.layout().takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        self.setStyleSheet(f"""
-            ResultsDialog {{
-                background-color: {theme.BACKGROUND};
-            }}
-            QCheckBox {{
-                spacing: 8px;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-            }}
-            QLabel {{
-                font-family: "Segoe UI", "Helvetica", "Arial", sans-serif;
-                color: {theme.TEXT_PRIMARY};
-            }}
-        """)
-        icon_path = os.path.join(ADDON_FOLDER, "jisho_icon.svg")
-        if os.path.exists(icon_path):
-            self.setWindowIcon(QIcon(icon_path))
-        
-        self.layout().setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        search_widget = QWidget()
-        search_widget.setObjectName("searchWidget")
-        search_widget.setStyleSheet(f"""
-            #searchWidget {{
-                background-color: {theme.BACKGROUND_SEARCH};
-                border-bottom: 1px solid {theme.BORDER};
-                padding: 8px 12px;
-            }}
-            QLineEdit {{
-                font-size: 14px;
-                padding: 8px;
-                border: 1px solid {theme.BORDER_DARK};
-                border-radius: 4px;
-                background-color: {theme.BACKGROUND};
-                color: {theme.TEXT_PRIMARY};
-            }}
-            QPushButton {{
-                font-size: 14px;
-                padding: 8px 16px;
-                background-color: {theme.PRIMARY};
-                color: {theme.PRIMARY_TEXT};
-                border-radius: 4px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {theme.PRIMARY_HOVER};
-            }}
-        """)
-        search_layout = QHBoxLayout(search_widget)
-        self.search_box = QLineEdit(search_text)
-
-        self.search_box.setPlaceholderText(_("search_placeholder"))
-        self.search_box.returnPressed.connect(self.perform_search)
-        search_layout.addWidget(self.search_box)
-
-        self.search_button = QPushButton(_("search_button"))
-        self.search_button.clicked.connect(self.perform_search)
-        search_layout.addWidget(self.search_button)
-        self.layout().addWidget(search_widget)
-        
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("QScrollArea { border: none; }")
-        self.layout().addWidget(scroll_area)
-        
-        results_container = QWidget()
-        results_container.setObjectName("resultsContainer")
-        results_container.setStyleSheet(f"#resultsContainer {{ background-color: {theme.BACKGROUND_ALT}; }}")
-        self.results_layout = QVBoxLayout(results_container)
-        self.results_layout.setContentsMargins(15, 15, 15, 15)
-        self.results_layout.setSpacing(15)
-        self.results_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        scroll_area.setWidget(results_container)
-
-        self.confirm_btn = QPushButton(_("confirm_entry"))
-        self.confirm_btn.setEnabled(False)
-        self.confirm_btn.clicked.connect(self.confirm_selection)
-        self.confirm_btn.setObjectName("confirmButton")
-        self.layout().addWidget(self.confirm_btn)
-
-        current_entries = [item["entry_data"] for item in self.entry_widgets]
-        self.clear_results(rebuild=False)
-        if current_entries:
-            for entry in current_entries:
-                self.create_entry_widget(entry)
-            self.results_layout.addStretch()
-        
-        self.update_confirm_button_state()
-
-        self._retranslate_ui()
-
-    def _retranslate_ui(self):
-        """Atualiza o texto da UI sem recriar os widgets."""
-        self.setWindowTitle(_("results_title"))
-        if hasattr(self, "search_box"):
-            self.search_box.setPlaceholderText(_("search_placeholder"))
-        if hasattr(self, "search_button"):
-            self.search_button.setText(_("search_button"))
-        if hasattr(self, "confirm_btn"):
-            if not self.is_loading:
-                self.confirm_btn.setText(_("confirm_entry"))
-
-    def show_loading_state(self, message: str = "") -> None:
-        """Mostra uma mensagem de carregamento na área de resultados."""
-        self.is_loading = True
-        effective_message = message or _("loading_message")
-        self.clear_results()
-        loading_label = QLabel(f"<h3>{effective_message}</h3>")
-        loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.results_layout.addWidget(loading_label)
-        self.results_layout.addStretch()
-        self.search_box.setEnabled(False)
-        self.confirm_btn.setEnabled(False)
-        self.search_button.setEnabled(False)
-        self.confirm_btn.setText(_("loading_message"))
-        QApplication.processEvents()
-
-    def hide_loading_state(self) -> None:
-        """Reabilita os controles após a busca."""
-        self.is_loading = False
-        self.search_box.setEnabled(True)
-        self.confirm_btn.setEnabled(True)
-        self.search_button.setEnabled(True)
-        self.confirm_btn.setText(_("confirm_entry"))
-
-    def perform_search(self, term: Optional[str] = None):
-        """Perform a Jisho search and display results using a worker thread."""
-        search_term = term if isinstance(term, str) else self.search_box.text()
-        if not search_term:
-            return
-
-        self.show_loading_state(_("loading_message_term").format(term=search_term))
+PREWARM_REFRESH_SECONDS = 300
 
-        thread = QThread()
-        worker = JishoFetchWorker(search_term)
-        worker.moveToThread(thread)
+def collect_prewarm_terms(col, base_search: str, config: ConfigSnapshot, limit: int) -> List[str]:
+    """Search terms of notes matching base_search whose mapped fields are still empty.
 
-        def on_finished(entries: list):
-            self.hide_loading_state()
-            self.clear_results()
-
-            if not entries:
-                no_results_label = QLabel(f"<h3>{_('no_results').format(term=search_term)}</h3>")
-                no_results_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.results_layout.addWidget(no_results_label)
-            else:
-                for entry in entries:
-                    self.create_entry_widget(entry)
+    Note ids follow creation order, which is also the default order in which
+    new cards are introduced, so the first notes found are the next ones due.
+    """
+    from anki.collection import SearchNode
+
+    search_field = config.search_field
+    target_fields = list(dict.fromkeys(field for _jisho, field in config.mappings))
+    if not target_fields or not search_field or search_field == "N/A":
+        return []
+    nodes = [
+        SearchNode(field=SearchNode.Field(field_name=search_field, text="_*")),
+        col.group_searches(*(SearchNode(field=SearchNode.Field(field_name=field, text="")) for field in target_fields), joiner="OR"),
+    ]
+    card_type = config.get("card_type", "")
+    if card_type:
+        nodes.append(SearchNode(note=card_type))
+    query = col.build_search_string(base_search, *nodes) if base_search else col.build_search_string(*nodes)
+
+    terms: List[str] = []
+    for nid in sorted(col.find_notes(query)):
+        note = col.get_note(nid)
+        term = normalize_search_term(note[search_field], config) if search_field in note else ""
+        if term and term not in terms:
+            terms.append(term)
+            if len(terms) >= limit:
+                break
+    return terms
 
-                self.results_layout.addStretch()
+class CachePrewarmer(QObject):
+    """Fills the lookup cache for notes the user is about to open.
 
-            worker.deleteLater()
-            thread.quit()
-            thread.wait()
-            thread.deleteLater()
-
-        def on_error(err_msg: str):
-            self.hide_loading_state()
-            self.clear_results()
-            showWarning(f"Erro na busca: {err_msg}")
-            worker.deleteLater()
-            thread.quit()
-            thread.wait()
-            thread.deleteLater()
-
-        worker.finished.connect(on_finished)
-        worker.error.connect(on_error)
-        thread.started.connect(worker.run)
-
-        global _active_jisho_workers
-        _active_jisho_workers.append((thread, worker))
-
-        def cleanup():
-            item_to_remove = None
-            for item in _active_jisho_workers:
-                if item[0] == thread:
-                    item_to_remove = item
-                    break
-            if item_to_remove:
-                _active_jisho_workers.remove(item_to_remove)
-        
-        thread.finished.connect(cleanup)
-        
-        thread.start()
-
-    def _create_tag_widget(self, text: str, bg_color: str, fg_color: str) -> QWidget:
-        """Create a styled tag widget."""
-        tag_widget = QWidget()
-        tag_widget.setAutoFillBackground(True)
-        qss = f"""
-            QWidget {{
-                background-color: {bg_color};
-                color: {fg_color};
-                padding: 0 15px;
-                border-radius: 4px;
-                font-size: 12px;
-                font-weight: 600;
-                border: 1px solid {bg_color};
-            }}
-        """
-        tag_widget.setStyleSheet(qss)
-        tag_layout = QHBoxLayout(tag_widget)
-        tag_layout.setContentsMargins(0, 0, 0, 0)
-        tag_layout.setSpacing(0)
-        tag_label = QLabel(text)
-        tag_label.setStyleSheet(f"color: {fg_color}; background: transparent;") 
-        tag_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        tag_layout.addWidget(tag_label)
-        tag_widget.setFixedHeight(24)
-        return tag_widget
-
-    def create_entry_widget(self, entry: Dict[str, Any]):
-        """Create a card widget for a Jisho entry."""
-        if not entry.get("japanese"):
+    Terms are queued from the current deck or the Browser's current search and
+    fetched one at a time on a timer, and only while the fetch engine is
+    idle, so interactive lookups always go first and the API sees a slow trickle.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue: deque = deque()
+        self._queued = set()
+        self._last_search: Optional[str] = None
+        self._last_search_at = 0.0
+        self._batch: Optional['FetchBatch'] = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._tick)
+
+    def schedule_search(self, base_search: str):
+        """Queue the notes matched by base_search, at most once per refresh period."""
+        config = get_config()
+        if not config.get("prewarm_enabled", False) or config.get("data_source", "remote") == "local":
             return
-        entry_card = QFrame()
-        entry_card.setObjectName("entryCard")
-        entry_card.setStyleSheet(f"""
-            #entryCard {{
-                background-color: {theme.BACKGROUND};
-                border: 1px solid {theme.BORDER};
-                border-radius: 8px;
-            }}
-        """)
-        layout = QVBoxLayout(entry_card)
-        layout.setContentsMargins(15, 15, 15, 15)
-        layout.setSpacing(12)
-        word = entry["japanese"][0].get("word", "")
-        reading = entry["japanese"][0].get("reading", "")
-        header_layout = QHBoxLayout()
-        header_layout.setSpacing(5)
-        word_label = QLabel(word or reading)
-        word_label.setStyleSheet(f"font-size: 32px; font-weight: 600; color: {theme.TEXT_PRIMARY};")
-        header_layout.addWidget(word_label, alignment=Qt.AlignmentFlag.AlignBottom)
-        if word and reading and word != reading:
-            reading_label = QLabel(reading)
-            reading_label.setStyleSheet(f"font-size: 18px; color: {theme.TEXT_SECONDARY}; padding-bottom: 3px;")
-            header_layout.addWidget(reading_label, alignment=Qt.AlignmentFlag.AlignBottom)
-        header_layout.addStretch()
-        layout.addLayout(header_layout)
-        tags_layout = QHBoxLayout()
-        tags_layout.setSpacing(7)
-        # Exibe is_common, JLPT e Wanikani se existirem
-        if entry.get("is_common"):
-            tags_layout.addWidget(self._create_tag_widget("common word", theme.SUCCESS, theme.SUCCESS_TEXT))
-        if entry.get("jlpt"):
-            for tag in entry.get("jlpt", []):
-                tags_layout.addWidget(self._create_tag_widget(tag, theme.INFO, theme.INFO_TEXT))
-        if entry.get("tags"):
-            for tag in entry.get("tags", []):
-                if "wanikani" in tag:
-                    tags_layout.addWidget(self._create_tag_widget(tag, theme.WARNING, theme.WARNING_TEXT))
-        tags_layout.addStretch()
-        layout.addLayout(tags_layout)
-        sense_checkboxes = []
-        sense_tag_checkboxes = []
-        for i, sense in enumerate(entry.get("senses", [])):
-            sense_widget = QWidget()
-            sense_hlayout = QHBoxLayout(sense_widget)
-            sense_hlayout.setContentsMargins(0, 0, 0, 0)
-            sense_hlayout.setSpacing(8)
-            sense_hlayout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            cb = QCheckBox()
-            cb.stateChanged.connect(self.update_confirm_button_state)
-            sense_checkboxes.append(cb)
-            sense_hlayout.addWidget(cb, alignment=Qt.AlignmentFlag.AlignTop)
-
-            vbox = QVBoxLayout()
-            vbox.setContentsMargins(0, 0, 0, 0)
-            vbox.setSpacing(2)
-
-            # 1. Parts of Speech
-            pos = ", ".join(sense.get("parts_of_speech", []))
-            if pos:
-                pos_label = QLabel(f"<i style='color: {theme.TEXT_TERTIARY};'>{pos}</i>")
-                vbox.addWidget(pos_label)
-
-            # 2. English Definitions
-            defs = "; ".join(sense.get("english_definitions", []))
-            def_label = QLabel(f"<b>{i+1}.</b> {defs}")
-            def_label.setWordWrap(True)
-            vbox.addWidget(def_label)
-
-            # 3. Tags + Info (texto estilizado, mesma linha, alinhados à esquerda)
-            all_tags_info = []
-            if sense.get("tags"):
-                all_tags_info.extend(sense["tags"])
-            if sense.get("info"):
-                all_tags_info.extend(sense["info"])
-            
-            if all_tags_info:
-                combined_text = ", ".join([item.replace('\n', ' ').replace('\r', '') for item in all_tags_info])
-                tag_info_label = QLabel(combined_text)
-                tag_info_label.setStyleSheet(f"color: {theme.TEXT_SECONDARY}; font-style: italic; font-size: 12px;")
-                tag_info_label.setWordWrap(True)
-                tag_info_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-                vbox.addWidget(tag_info_label)
-
-            sense_hlayout.addLayout(vbox, 1)
-            layout.addWidget(sense_widget)
-            
-        other_forms_checkboxes = []
-        if other_forms := [f for f in entry.get("japanese", [])[1:] if f.get("word") or f.get("reading")]:
-            other_forms_label = QLabel(f"<b style='font-size: 14px; margin-top: 10px;'>{_('other_forms')}</b>")
-            layout.addWidget(other_forms_label)
-            for form in other_forms:
-                cb = QCheckBox(f"{form.get('word', '')} [{form.get('reading', '')}]")
-                cb.stateChanged.connect(self.update_confirm_button_state)
-                other_forms_checkboxes.append(cb)
-                layout.addWidget(cb)
-        self.results_layout.addWidget(entry_card)
-        self.entry_widgets.append({
-            "widget": entry_card,
-            "sense_checkboxes": sense_checkboxes,
-            "sense_tag_checkboxes": sense_tag_checkboxes,
-            "other_forms_checkboxes": other_forms_checkboxes,
-            "entry_data": entry
-        })
-
-    def update_confirm_button_state(self):
-        """Update confirm button state based on selection."""
-        any_checked = any(cb.isChecked() for item in self.entry_widgets for key in ("sense_checkboxes", "other_forms_checkboxes") for cb in item.get(key, []))
-        self.confirm_btn.setEnabled(any_checked)
-        if any_checked:
-            base_style = f"""
-                QPushButton {{
-                    margin: 12px; padding: 12px; font-size: 16px; font-weight: bold; border-radius: 6px;
-                    border: 1px solid {theme.PRIMARY_HOVER};
-                }}
-                QPushButton:hover {{
-                    background-color: {theme.PRIMARY_HOVER};
-                }}
-            """
-            checked_entry_indices = {i for i, item in enumerate(self.entry_widgets) if any(cb.isChecked() for cb in item.get("sense_checkboxes", []))}
-            if len(checked_entry_indices) > 1:
-                self.confirm_btn.setStyleSheet(base_style + f"""
-                    QPushButton {{
-                        background-color: {theme.ACCENT_YELLOW};
-                        color: {theme.ACCENT_YELLOW_TEXT};
-                        border-color: {theme.ACCENT_YELLOW_HOVER};
-                    }}
-                    QPushButton:hover {{
-                        background-color: {theme.ACCENT_YELLOW_HOVER};
-                    }}
-                """)
-            else:
-                self.confirm_btn.setStyleSheet(base_style + f"""
-                    QPushButton {{
-                        background-color: {theme.PRIMARY};
-                        color: {theme.PRIMARY_TEXT};
-                    }}
-                """)
-        else:
-            self.confirm_btn.setStyleSheet(f"""
-                QPushButton {{
-                    margin: 12px; padding: 12px; font-size: 16px; font-weight: bold;
-                    border-radius: 6px;
-                    background-color: {theme.CONFIRM_DISABLED_BG};
-                    color: {theme.TEXT_DISABLED};
-                    border: 1px solid {theme.BORDER_LIGHT};
-                }}
-            """)
-
-    def confirm_selection(self):
-        """Handle confirm button click and fill note fields."""
-        config = load_config()
-        mappings = config.get("mappings", [])
-        if not mappings:
-            showWarning(_("warning_no_mappings"))
+        now = time.monotonic()
+        if base_search == self._last_search and now - self._last_search_at < PREWARM_REFRESH_SECONDS:
+            return
+        self._last_search = base_search
+        self._last_search_at = now
+        limit = max(1, int(config.get("prewarm_max_notes", 50)))
+        QueryOp(
+            parent=mw,
+            op=lambda col: collect_prewarm_terms(col, base_search, config, limit),
+            success=self.enqueue,
+        ).failure(lambda e: log.warning("Pre-warm search failed: %s", e)).run_in_background()
+
+    def enqueue(self, terms: List[str]):
+        for term in terms:
+            if term not in self._queued:
+                self._queued.add(term)
+                self._queue.append(term)
+        if self._queue and not self._timer.isActive():
+            self._timer.start(max(250, int(get_config().get("prewarm_interval_ms", 2000))))
+
+    def stop(self):
+        """Drop the queue and abort the request in flight."""
+        self._timer.stop()
+        self._queue.clear()
+        self._queued.clear()
+        self._last_search = None
+        if self._batch is not None:
+            self._batch.cancel()
+            self._batch = None
+
+    def _tick(self):
+        cache = get_lookup_cache()
+        if cache is None or not get_config().get("prewarm_enabled", False):
+            self.stop()
+            return
+        engine = get_fetch_engine()
+        if self._batch is not None or engine.busy:
             return
-        checked_entries_indices = [i for i, item in enumerate(self.entry_widgets) if any(cb.isChecked() for cb in item.get("sense_checkboxes", []))]
-        if not config.get("disable_multi_word_warning", False) and len(checked_entries_indices) > 1:
-            msg_box = QMessageBox()
-            msg_box.setIcon(QMessageBox.Icon.Warning)
-            msg_box.setText(_("multi_word_warning_title"))
-            msg_box.setInformativeText(_("multi_word_warning_body"))
+        while self._queue:
+            term = self._queue.popleft()
+            self._queued.discard(term)
+            if cache.contains(term):
+                continue
+
+            def done(*_args):
+                if self._batch is batch:
+                    self._batch = None
+
+            batch = engine.fetch_many([term], on_finished=done, on_cancelled=done)
+            self._batch = batch
+            return
+        self._timer.stop()
 
-            ok_button = msg_box.addButton(_("button_ok"), QMessageBox.ButtonRole.AcceptRole)
-            cancel_button = msg_box.addButton(_("button_cancel"), QMessageBox.ButtonRole.RejectRole)
-            dont_warn_again_button = msg_box.addButton(_("ok_dont_warn_again"), QMessageBox.ButtonRole.ActionRole)
+_prewarmer: Optional[CachePrewarmer] = None
 
-            msg_box.exec() 
+def get_prewarmer() -> CachePrewarmer:
+    global _prewarmer
+    if _prewarmer is None:
+        _prewarmer = CachePrewarmer(mw)
+    return _prewarmer
 
-            clicked = msg_box.clickedButton()
+def prewarm_for_editor(editor):
+    """Warm the cache for the rest of the current deck when a note is opened."""
+    from aqt.browser import Browser
 
-            if clicked == cancel_button:
-                return 
-            
-            if clicked == dont_warn_again_button:
-                config["disable_multi_word_warning"] = True
-                save_config(config)
-        any_inserted = False
-        for item in self.entry_widgets:
-            selected_senses = [item["entry_data"]["senses"][i] for i, cb in enumerate(item.get("sense_checkboxes", [])) if cb.isChecked()]
-            selected_other_forms = [cb.text() for cb in item.get("other_forms_checkboxes", []) if cb.isChecked()]
-            if selected_senses or selected_other_forms:
-                self.on_select(item["entry_data"], selected_senses, selected_other_forms)
-                any_inserted = True
-        if any_inserted:
-            showInfo(_("info_fields_filled"))
-            try:
-                mw.reset()
-            except Exception:
-                pass
-        self.close()
-
-    def clear_results(self, rebuild: bool = True):
-        """Clear all result widgets and stretch items from the layout."""
-
-        if hasattr(self, "results_layout") and self.results_layout:
-            while (item := self.results_layout.takeAt(0)):
-                if (widget := item.widget()):
-                    widget.deleteLater()
-        
-        if rebuild:
-            self.entry_widgets.clear()
-            self.update_confirm_button_state() 
+    # In the Browser the current search already decides which notes come next
+    if editor.note is None or isinstance(editor.parentWindow, Browser):
+        return
+    get_prewarmer().schedule_search("deck:current")
 
-# -------------------------
-# Apply Mappings & Fill Note
-# -------------------------
-def apply_mappings_and_fill(note, entry: Dict[str, Any], selected_senses, selected_other_forms):
-    """Apply mappings and fill note fields."""
-    config = load_config()
-    mappings = config.get("mappings", [])
-    fill_mode = config.get("fill_mode", "replace")
-
-    def set_field(field_name: str, value: str):
-        if not value or field_name not in note:
-            return
-        # Lógica de preenchimento (append/replace)
-        current_content = note[field_name]
-        if fill_mode == 'append' and current_content and value not in current_content:
-            # Para evitar duplicatas e espaços desnecessários
-            if current_content.endswith(' '):
-                note[field_name] += value
-            else:
-                note[field_name] += f" {value}"
-        else:
-            note[field_name] = value
-
-    first_jap = entry["japanese"][0]
-    field_values = {}
-
-    import re
-    for mapping in mappings:
-        field_name = mapping.get("field", "")
-        map_type = mapping.get("jisho", "")
-        if not field_name or not map_type:
-            continue
-
-        value = ""
-        if map_type == "Part of speech":
-            # Coleta as 'parts of speech' mantendo a ordem e removendo duplicatas
-            ordered_pos = []
-            remove_ending = config.get("remove_pos_ending", True)
-            for s in selected_senses:
-                for pos in s.get("parts_of_speech", []):
-                    if remove_ending:
-                        pos = re.sub(r" with '.*?' ending", "", pos)
-                    if pos not in ordered_pos:
-                        ordered_pos.append(pos)
-            value = "; ".join(ordered_pos)
-        elif map_type == "Meaning":
-            value = " | ".join(["; ".join(s.get("english_definitions", [])) for s in selected_senses])
-        elif map_type == "Info":
-            ordered_info = []
-            for s in selected_senses:
-                for info in s.get("info", []):
-                    if info not in ordered_info:
-                        ordered_info.append(info)
-            value = "; ".join(ordered_info)
-        elif map_type == "Tags":
-            ordered_tags = []
-            for s in selected_senses:
-                for tag in s.get("tags", []):
-                    if tag not in ordered_tags:
-                        ordered_tags.append(tag)
-            value = "; ".join(ordered_tags)
-        elif map_type == "Other forms":
-            value = ", ".join(selected_other_forms) if selected_other_forms else ""
-        elif map_type == "Word":
-            value = first_jap.get("word", "")
-        elif map_type == "Reading":
-            value = first_jap.get("reading", "")
-        elif map_type == "JLPT Level":
-            value = ", ".join(entry.get("jlpt", [])) if entry.get("jlpt") else ""
-        elif map_type == "Wanikani Level":
-            # Esta lógica já estava correta, buscando apenas as tags de "wanikani" no nível principal.
-            value = ", ".join([tag for tag in entry.get("tags", []) if "wanikani" in tag]) if entry.get("tags") else ""
-        elif map_type == "Is_Common":
-            value = "common word" if entry.get("is_common") else ""
-
-        if value:
-            field_values.setdefault(field_name, []).append(value)
-
-    for field_name, values in field_values.items():
-        print(f"Preenchendo campo {field_name} com valores: {values}")
-        final_text = "; ".join(v for v in values if v)
-        set_field(field_name, final_text)
+def prewarm_for_browser(context):
+    """Warm the cache for the notes matched by the Browser's search."""
+    if context.search:
+        get_prewarmer().schedule_search(context.search)
 
-    try:
-        if note.id == 0:
-            # Nova nota - adicionar à coleção
-            mw.col.add_note(note, mw.col.decks.current()['id'])
-        else:
-            # Nota existente - atualizar
-            mw.col.update_note(note)
-    except Exception as e:
-        showWarning(f"Error saving note: {str(e)}")
+def stop_prewarming():
+    if _prewarmer is not None:
+        _prewarmer.stop()
+
+profile_will_close.append(stop_prewarming)
 
 # -------------------------
 # Main Lookup Flow & Hooks
 # -------------------------
-def start_lookup_for_note(note):
+RESULTS_DIALOG_PREBUILD_DELAY_MS = 1500
+
+def build_results_dialog() -> 'ResultsDialog':
+    """Create an empty results dialog, with its native window and style already in place."""
+    from .dialogs import ResultsDialog
+
+    with perf_stats.timed("results_dialog_build"):
+        dlg = ResultsDialog("", None)
+        dlg.ensurePolished()
+        dlg.winId()
+    return dlg
+
+def prebuild_results_dialog():
+    """Build the results dialog off-screen, so the first lookup only has to show it."""
+    global _jisho_dialog_ref
+    if _jisho_dialog_ref is None and mw.col is not None:
+        _jisho_dialog_ref = build_results_dialog()
+
+def schedule_results_dialog_prebuild():
+    # The timer only fires once the event loop is free after the profile opens
+    QTimer.singleShot(RESULTS_DIALOG_PREBUILD_DELAY_MS, prebuild_results_dialog)
+
+def discard_results_dialog():
+    """Drop the reusable dialog, which holds callbacks into the closing profile's notes."""
+    global _jisho_dialog_ref
+    dlg, _jisho_dialog_ref = _jisho_dialog_ref, None
+    if dlg is not None:
+        dlg.close()
+        dlg.deleteLater()
+
+profile_did_open.append(schedule_results_dialog_prebuild)
+profile_will_close.append(discard_results_dialog)
+
+def start_lookup_for_note(note, editor=None):
     """Start lookup for a note or open config dialog."""
-    global _config_dialog_ref, _jisho_dialog_ref
+    global _jisho_dialog_ref
 
     if not note:
-        if _config_dialog_ref and _config_dialog_ref.isVisible():
-            _config_dialog_ref.raise_()
-            _config_dialog_ref.activateWindow()
-        else:
-            dlg = ConfigDialog()
-            _config_dialog_ref = dlg
-            dlg.exec()
+        show_config_dialog()
         return
     
-    config = load_config()
-    search_field = config.get("search_field", "N/A")
-    term = note[search_field] if search_field in note else ""
+    search_field = get_config().search_field
+    term = normalize_search_term(note[search_field]) if search_field in note else ""
     if not term:
         term, ok = QInputDialog.getText(mw, _("input_dialog_title"), _("input_dialog_label"))
         if not ok or not term:
             return
     
-    if _jisho_dialog_ref and _jisho_dialog_ref.isVisible():
-        _jisho_dialog_ref.search_box.setText(term)
-        _jisho_dialog_ref.perform_search()
-        _jisho_dialog_ref.raise_()
-        _jisho_dialog_ref.activateWindow()
-    else:
-        dlg = ResultsDialog(term, lambda entry, senses, forms: apply_mappings_and_fill(note, entry, senses, forms))
-        _jisho_dialog_ref = dlg
+    on_select = lambda selections: fill_and_save_note(note, selections, editor)
+    dlg = _jisho_dialog_ref
+    if dlg is None:
+        dlg = _jisho_dialog_ref = build_results_dialog()
+    # The window, prebuilt or reused, appears before the search starts
+    if not dlg.isVisible():
         dlg.show()
+    dlg.reset_for_lookup(term, on_select)
+    dlg.raise_()
+    dlg.activateWindow()
+
+def show_config_dialog():
+    global _config_dialog_ref
+    if _config_dialog_ref and _config_dialog_ref.isVisible():
+        _config_dialog_ref.raise_()
+        _config_dialog_ref.activateWindow()
+    else:
+        from .dialogs import ConfigDialog
+
+        dlg = ConfigDialog()
+        _config_dialog_ref = dlg
+        dlg.exec()
 
 def add_jisho_editor_button(buttons: List[Any], editor: Any):
     """Add Jisho button to Anki editor."""
-    icon_path = os.path.join(ADDON_FOLDER, "jisho_icon.svg")
-    if not os.path.exists(icon_path):
-        os.makedirs(os.path.dirname(icon_path), exist_ok=True)
-        svg = """
-<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24'>
-  <rect width='24' height='24' rx='5' fill='#3ec97a'/>
-  <text x='12' y='16' font-family='Segoe UI, Arial, sans-serif' font-size='13' fill='white' text-anchor='middle' font-weight='bold' letter-spacing='1'>JI</text>
-</svg>
-"""
-        with open(icon_path, "w", encoding="utf-8") as f:
-            f.write(svg)
-    btn = editor.addButton(icon=icon_path, cmd="jisho_search", tip=_("editor_button_tooltip"), func=lambda e: start_lookup_for_note(e.note), keys="Ctrl+Shift+J")
+    btn = editor.addButton(icon=addon_icon_path(), cmd="jisho_search", tip=_("editor_button_tooltip"), func=lambda e: start_lookup_for_note(e.note, e), keys="Ctrl+Shift+J")
     buttons.append(btn)
     return buttons
 
 def setup_menu_action():
     """Add GRKN Anki Jisho Connect Settings to shared GRKN menu (creates if needed)."""
     action = QAction(_("settings_title"), mw)
-    
-    def show_dialog():
-        global _config_dialog_ref
-        if _config_dialog_ref and _config_dialog_ref.isVisible():
-            _config_dialog_ref.raise_()
-            _config_dialog_ref.activateWindow()
-        else:
-            dlg = ConfigDialog()
-            _config_dialog_ref = dlg
-            dlg.exec()
-
-    action.triggered.connect(show_dialog)
+    action.triggered.connect(show_config_dialog)
+    import_action = QAction(_("import_dictionary_action"), mw)
+    import_action.triggered.connect(import_local_dictionary)
+    perf_action = QAction(_("perf_stats_action"), mw)
+    perf_action.triggered.connect(show_perf_stats_dialog)
     grkn_menu = get_grkn_menu(mw)
     if grkn_menu:
         grkn_menu.addAction(action)
+        grkn_menu.addAction(import_action)
+        grkn_menu.addAction(perf_action)
     else:
         mw.form.menuTools.addAction(action)
+        mw.form.menuTools.addAction(import_action)
+        mw.form.menuTools.addAction(perf_action)
+
+def finish_startup():
+    """Deferred part of the add-on setup, run once Anki's main window is ready."""
+    configure_perf_stats(get_config())
+    perf_stats.record("startup_import", _import_seconds)
+    with perf_stats.timed("startup_menu"):
+        setup_menu_action()
 
 editor_did_init_buttons.append(add_jisho_editor_button)
-setup_menu_action()
+browser_menus_did_init.append(setup_browser_menu)
+editor_did_load_note.append(prewarm_for_editor)
+browser_did_search.append(prewarm_for_browser)
+main_window_did_init.append(finish_startup)
+
+# Add-on import time, recorded in the stats once startup finishes
+_import_seconds = time.perf_counter() - _startup_began
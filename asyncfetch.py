@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio fetch engine for Jisho lookups.
+
+One background thread runs an event loop that schedules every lookup, so
+resolving N terms at once is a matter of N coroutines. The lookups
+themselves are blocking (cache and local dictionary queries, then the
+pooled requests session) and run on a thread pool owned by the engine,
+never on the loop. Concurrency is bounded by a semaphore, identical
+requests in flight are shared, and results are handed back through a
+dispatch function (in Anki, mw.taskman.run_on_main) so callbacks run on the
+GUI thread.
+"""
+import asyncio
+import threading
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from .jishoapi import CancelToken
+
+class FetchBatch:
+    """Handle for work submitted to the engine; cancel() is safe from any thread."""
+
+    def __init__(self, future):
+        self._future = future
+
+    def cancel(self):
+        self._future.cancel()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout)
+
+
+class FetchEngine:
+    """Event loop thread that resolves lookups concurrently under an in-flight limit.
+
+    fetch is a blocking function (term, page, cancel) -> result, run on the
+    engine's thread pool; cancelling a lookup cancels its CancelToken. key_fn
+    maps a term and page to the key used to share identical requests in flight.
+    """
+
+    def __init__(self, fetch: Callable[[str, int, CancelToken], Any], limit: int,
+                 dispatch: Optional[Callable[[Callable[[], None]], Any]] = None,
+                 key_fn: Optional[Callable[[str, int], Hashable]] = None):
+        self._fetch = fetch
+        self._limit = max(1, limit)
+        self._dispatch = dispatch or (lambda callback: callback())
+        self._key_fn = key_fn or (lambda term, page: (term, page))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.active = 0
+        self.waiting = 0
+        self.leaders = 0
+        self.coalesced = 0
+        self._executor = self._new_executor()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="jisho-fetch-loop", daemon=True)
+        self._thread.start()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.active or self.waiting)
+
+    def stats(self) -> Dict[str, int]:
+        return {"active": self.active, "waiting": self.waiting, "limit": self._limit}
+
+    def set_limit(self, limit: int):
+        """Change the in-flight limit; work already waiting keeps the old semaphore and thread pool."""
+        limit = max(1, limit)
+        if limit != self._limit:
+            self._limit = limit
+            # Only the loop thread submits to the pool, so swapping it there cannot race a submit
+            self._loop.call_soon_threadsafe(self._apply_limit)
+
+    def dispatch(self, callback: Callable[[], None]):
+        self._dispatch(callback)
+
+    async def fetch(self, term: str, page: int = 1) -> Any:
+        """Resolve one term inside the loop, joining an identical request if one is in flight."""
+        key = self._key_fn(term, page)
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._loop.create_task(self._limited(term, page))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # shield: one cancelled caller does not take down the request for the others
+            return await asyncio.shield(task)
+        finally:
+            remaining = self._waiters.get(key, 1) - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                self._waiters.pop(key, None)
+                if not task.done():
+                    task.cancel()
+
+    def submit(self, coro_fn: Callable[["FetchEngine"], Awaitable[Any]], on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_cancelled: Optional[Callable[[], None]] = None) -> FetchBatch:
+        """Run coro_fn(engine) on the loop; the callbacks go through the dispatch function."""
+        future = asyncio.run_coroutine_threadsafe(coro_fn(self), self._loop)
+
+        def finished(done):
+            if done.cancelled():
+                if on_cancelled is not None:
+                    self._dispatch(on_cancelled)
+                return
+            error = done.exception()
+            if error is not None:
+                if on_error is not None:
+                    self._dispatch(lambda: on_error(error))
+            elif on_done is not None:
+                result = done.result()
+                self._dispatch(lambda: on_done(result))
+
+        future.add_done_callback(finished)
+        return FetchBatch(future)
+
+    def fetch_many(self, terms: List[str], on_result: Optional[Callable[[str, Any], None]] = None,
+                   on_error: Optional[Callable[[str, BaseException], None]] = None,
+                   on_finished: Optional[Callable[[Dict[str, Any]], None]] = None,
+                   on_cancelled: Optional[Callable[[], None]] = None, page: int = 1) -> FetchBatch:
+        """Resolve several terms concurrently, reporting each one as soon as it completes.
+
+        on_finished receives {term: result or exception} once every term is done.
+        """
+        async def run(engine: "FetchEngine") -> Dict[str, Any]:
+            return await engine._gather(terms, page, on_result, on_error, dispatch=True)
+
+        return self.submit(run, on_done=on_finished, on_cancelled=on_cancelled)
+
+    def run_many(self, terms: List[str], page: int = 1, on_each: Optional[Callable[[str, Any], None]] = None,
+                 should_cancel: Optional[Callable[[], bool]] = None, poll: float = 0.1) -> Dict[str, Any]:
+        """Blocking variant of fetch_many for background threads.
+
+        on_each is called on the loop thread. If should_cancel() turns true the
+        remaining requests are cancelled and the results gathered so far are returned.
+        """
+        results: Dict[str, Any] = {}
+        results_lock = threading.Lock()
+
+        def record(term: str, result: Any):
+            with results_lock:
+                results[term] = result
+            if on_each is not None:
+                on_each(term, result)
+
+        def results_so_far() -> Dict[str, Any]:
+            # The loop thread may still be recording when the caller gives up
+            with results_lock:
+                return dict(results)
+
+        async def run() -> Dict[str, Any]:
+            return await self._gather(terms, page, record, record, dispatch=False)
+
+        future = asyncio.run_coroutine_threadsafe(run(), self._loop)
+        while True:
+            try:
+                return future.result(timeout=poll)
+            except FutureCancelledError:
+                return results_so_far()
+            except TimeoutError:
+                pass
+            except Exception as e:
+                # Before Python 3.11 concurrent.futures.TimeoutError is not the built-in TimeoutError
+                if type(e).__name__ != "TimeoutError":
+                    raise
+            # cancel() fails if the batch has just finished; its full result is returned next round
+            if should_cancel is not None and should_cancel() and future.cancel():
+                return results_so_far()
+
+    def shutdown(self, timeout: float = 2.0):
+        """Cancel everything in flight and stop the loop thread and the thread pool."""
+        async def stop():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(stop(), self._loop).result(timeout)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._executor.shutdown(wait=False)
+
+    async def _gather(self, terms: List[str], page: int, on_result, on_error, dispatch: bool) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+
+        async def one(term: str):
+            try:
+                result = await self.fetch(term, page)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                results[term] = e
+                if on_error is not None:
+                    self._report(on_error, term, e, dispatch)
+                return
+            results[term] = result
+            if on_result is not None:
+                self._report(on_result, term, result, dispatch)
+
+        await asyncio.gather(*(one(term) for term in dict.fromkeys(terms)))
+        return results
+
+    def _report(self, callback, term: str, value: Any, dispatch: bool):
+        if dispatch:
+            self._dispatch(lambda: callback(term, value))
+        else:
+            callback(term, value)
+
+    async def _limited(self, term: str, page: int) -> Any:
+        if self._semaphore is None:
+            self._reset_semaphore()
+        semaphore = self._semaphore
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        cancel = CancelToken()
+        try:
+            return await self._loop.run_in_executor(self._executor, self._fetch, term, page, cancel)
+        except asyncio.CancelledError:
+            # The pool thread cannot be interrupted; the token closes its connection instead
+            cancel.cancel()
+            raise
+        finally:
+            self.active -= 1
+            semaphore.release()
+
+    def _reset_semaphore(self):
+        self._semaphore = asyncio.Semaphore(self._limit)
+
+    def _apply_limit(self):
+        self._reset_semaphore()
+        executor, self._executor = self._executor, self._new_executor()
+        executor.shutdown(wait=False)
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        # Each lookup holds one pool thread while it runs, so the limit is also the pool size
+        return ThreadPoolExecutor(max_workers=self._limit, thread_name_prefix="jisho-fetch")
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Avoid the "exception was never retrieved" warning when nobody is waiting any more
+        if not task.cancelled():
+            task.exception()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
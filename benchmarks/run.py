@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Offline benchmarks for the add-on's hot paths.
+
+Runs headless against the local stand-in API (see standin.py) with a fake
+main window and collection, so no network, profile or running Anki is needed.
+It still needs Anki's Python environment, i.e. aqt and PyQt6 must be importable:
+
+    python benchmarks/run.py                   run, and compare if a baseline was saved
+    python benchmarks/run.py --save-baseline   run and store the results as this machine's baseline
+    python benchmarks/run.py --record 食べる dog   record real jisho.org responses as fixtures
+
+Every benchmark reports the median of several runs in milliseconds. Timings
+depend on the machine, so no baseline is shipped: save one on the machine
+you measure on, before a change, and later runs there compare against it. A
+result slower than that baseline by more than --threshold is reported as a
+regression and makes the script exit with status 1. Without a baseline the
+script only reports timings; --require-baseline makes that an error (status 2).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RENDER_COUNTS = (20, 100, 500)
+FETCH_SIZES = (1, 5, 20)
+FETCH_MANY_TERMS = 20
+FILL_NOTES = 1000
+
+sys.path.insert(0, BENCH_DIR)
+from standin import StandInServer, record_fixtures, recorded_keywords, synthetic_entries  # noqa: E402
+
+
+class FakeTaskManager:
+    """Runs main-thread callbacks immediately; the benchmarks never cross threads with Qt objects."""
+
+    def run_on_main(self, callback: Callable[[], None]):
+        callback()
+
+
+class FakeProgress:
+    def update(self, **_kwargs):
+        pass
+
+    def want_cancel(self) -> bool:
+        return False
+
+
+class FakeDecks:
+    def current(self) -> Dict[str, Any]:
+        return {"id": 1}
+
+
+class FakeCollection:
+    """Just enough of anki.collection.Collection for save_notes()."""
+
+    def __init__(self):
+        self.decks = FakeDecks()
+        self.updated = 0
+        self.added = 0
+
+    def add_custom_undo_entry(self, _name: str) -> int:
+        return 1
+
+    def merge_undo_entries(self, _target: int):
+        return None
+
+    def update_notes(self, notes: list):
+        self.updated += len(notes)
+
+    def add_note(self, _note, _deck_id: int):
+        self.added += 1
+
+
+class FakeNote:
+    def __init__(self, note_id: int, fields: Dict[str, str]):
+        self.id = note_id
+        self._fields = dict(fields)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._fields
+
+    def __getitem__(self, name: str) -> str:
+        return self._fields[name]
+
+    def __setitem__(self, name: str, value: str):
+        self._fields[name] = value
+
+
+class ImmediateCollectionOp:
+    """Stand-in for aqt.operations.CollectionOp that runs the op synchronously on the fake collection."""
+
+    def __init__(self, parent, op):
+        self._op = op
+        self._success = None
+
+    def success(self, callback):
+        self._success = callback
+        return self
+
+    def failure(self, _callback):
+        return self
+
+    def run_in_background(self):
+        from aqt import mw
+        changes = self._op(mw.col)
+        if self._success:
+            self._success(changes)
+
+
+def load_addon():
+    """Import the add-on as a package with a fake main window installed."""
+    from aqt.qt import QApplication, QMainWindow, QMenu, QMenuBar
+    import aqt
+
+    app = QApplication.instance() or QApplication(["jisho-connect-bench"])
+    window = QMainWindow()
+    window.form = type("Form", (), {})()
+    window.form.menubar = QMenuBar(window)
+    window.form.menuTools = QMenu("Tools", window)
+    window.taskman = FakeTaskManager()
+    window.progress = FakeProgress()
+    window.col = FakeCollection()
+    aqt.mw = window
+
+    spec = importlib.util.spec_from_file_location(
+        "jisho_connect", os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules["jisho_connect"] = addon
+    started = time.perf_counter()
+    spec.loader.exec_module(addon)
+    import_ms = (time.perf_counter() - started) * 1000
+    addon.CollectionOp = ImmediateCollectionOp
+    return app, addon, import_ms
+
+
+def configure(addon, workdir: str, search_url: str, cache_enabled: bool):
+    """Point every file the add-on writes at workdir and apply a benchmark config."""
+    addon.CONFIG_PATH = os.path.join(workdir, "config.json")
+    addon.CACHE_PATH = os.path.join(workdir, "lookup_cache.sqlite3")
+    addon.LOCAL_DICT_PATH = os.path.join(workdir, "jmdict.sqlite3")
+    addon.PERF_LOG_PATH = os.path.join(workdir, "perf_log.jsonl")
+    config = dict(addon.DEFAULT_CONFIG)
+    config.update({
+        "search_field": "Expression",
+        "mappings": [
+            {"jisho": "Word", "field": "Word"},
+            {"jisho": "Reading", "field": "Reading"},
+            {"jisho": "Meaning", "field": "Meaning"},
+            {"jisho": "Part of speech", "field": "Part of speech"},
+        ],
+        "cache_enabled": cache_enabled,
+        "data_source": "remote",
+        "request_retries": 0,
+    })
+    addon.save_config(config)
+    addon.get_http_session().search_url = search_url
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_fetch(addon, workdir: str, server: StandInServer, results: Dict[str, float]):
+    keywords = [f"synthetic-{size}" for size in FETCH_SIZES] + recorded_keywords()
+    configure(addon, workdir, server.url, cache_enabled=False)
+    terms = [f"synthetic-{n}" for n in range(1, FETCH_MANY_TERMS + 1)]
+    engine = addon.get_fetch_engine()
+    for keyword in keywords:
+        engine.run_many([keyword])  # opens the keep-alive connection before measuring
+        results[f"lookup[{keyword}]"] = median_ms(lambda: engine.run_many([keyword]), 30)
+
+    engine.run_many(terms)
+    results[f"fetch_many[{FETCH_MANY_TERMS} terms]"] = median_ms(lambda: engine.run_many(terms), 10)
+
+    configure(addon, workdir, server.url, cache_enabled=True)
+    engine.run_many(["synthetic-20"])
+    results["lookup[cached]"] = median_ms(lambda: engine.run_many(["synthetic-20"]), 30)
+    configure(addon, workdir, server.url, cache_enabled=False)
+
+
+def bench_render(app, addon, results: Dict[str, float]):
+    dialogs = importlib.import_module("jisho_connect.dialogs")
+    dialog = dialogs.ResultsDialog("", lambda _selections: None)
+    dialog.resize(700, 750)
+    dialog.show()
+    app.processEvents()
+    for count in RENDER_COUNTS:
+        entries = addon.parse_entries(synthetic_entries(count))
+
+        def render():
+            dialog.results_model.set_entries(entries)
+            dialog.show_results_list()
+            # grab() paints the window synchronously, including the list layout
+            dialog.grab()
+
+        results[f"results_render[{count}]"] = median_ms(render, 5)
+
+        dialog.results_model.set_entries(entries)
+        app.processEvents()
+        sense_rows = [
+            row for row in range(dialog.results_model.rowCount())
+            if dialog.results_model.data(dialog.results_model.index(row), dialogs.ROW_ROLE)[0] == dialogs.ROW_SENSE
+        ]
+        start = time.perf_counter()
+        for row in sense_rows:
+            dialog.results_model.toggle(row)
+        elapsed = (time.perf_counter() - start) * 1000
+        results[f"confirm_state_per_toggle[{count}]"] = elapsed / max(1, len(sense_rows))
+    dialog.close()
+    dialog.deleteLater()
+    app.processEvents()
+
+
+def bench_fill(addon, results: Dict[str, float]):
+    entries = addon.parse_entries(synthetic_entries(FILL_NOTES))
+
+    def fill_all():
+        for i, entry in enumerate(entries):
+            note = FakeNote(i + 1, {"Expression": entry.slug, "Word": "", "Reading": "", "Meaning": "", "Part of speech": ""})
+            addon.apply_mappings_and_fill(note, entry, list(entry.senses[:1]), [])
+
+    results[f"apply_mappings_and_fill[per {FILL_NOTES} notes]"] = median_ms(fill_all, 5)
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base and value > base * (1 + threshold):
+            regressions.append(f"{name}: {value:.3f} ms vs baseline {base:.3f} ms (+{value / base - 1:.0%})")
+    return regressions
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results in baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--require-baseline", action="store_true", help="fail instead of only reporting when no baseline exists")
+    parser.add_argument("--record", nargs="+", metavar="KEYWORD", help="record jisho.org responses as fixtures and exit")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        for keyword, count in record_fixtures(args.record).items():
+            print(f"recorded {keyword}: {count} entries")
+        return 0
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app, addon, import_ms = load_addon()
+    # A single sample: the module can only be imported once per process
+    results: Dict[str, float] = {"addon_import": import_ms}
+    with tempfile.TemporaryDirectory() as workdir, StandInServer() as server:
+        configure(addon, workdir, server.url, cache_enabled=False)
+        bench_fetch(addon, workdir, server, results)
+        bench_render(app, addon, results)
+        bench_fill(addon, results)
+        addon.get_http_session().close()
+        addon.shutdown_fetch_engine()
+        if addon._lookup_cache is not None:
+            addon._lookup_cache.close()
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:10.3f} ms")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"baseline saved to {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("no baseline.json on this machine, so nothing was compared; save one with --save-baseline")
+        return 2 if args.require_baseline else 0
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
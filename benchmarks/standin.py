@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Jisho search API, used by the benchmarks.
+
+Serves /api/v1/search/words from recorded responses in benchmarks/fixtures,
+paged 20 entries at a time like the real API. Keywords of the form
+"synthetic-N" are answered with N generated entries, so the benchmarks also
+run on a fresh checkout where nothing has been recorded yet.
+"""
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from urllib.request import Request, urlopen
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_PATH = "/api/v1/search/words"
+JISHO_SEARCH_URL = "https://jisho.org" + SEARCH_PATH
+PAGE_SIZE = 20
+
+
+def synthetic_entry(index: int) -> Dict[str, Any]:
+    """A Jisho-shaped entry with the usual number of forms, senses and tags."""
+    return {
+        "slug": f"語{index}",
+        "is_common": index % 3 == 0,
+        "tags": ["wanikani12"] if index % 4 == 0 else [],
+        "jlpt": [f"jlpt-n{index % 5 + 1}"],
+        "japanese": [
+            {"word": f"語{index}", "reading": f"ご{index}"},
+            {"word": f"言{index}", "reading": f"ごん{index}"},
+        ],
+        "senses": [
+            {
+                "english_definitions": [f"meaning {index}.{n}", f"sense {n} of word {index}", "synthetic"],
+                "parts_of_speech": ["Noun", "Suru verb"] if n == 0 else ["Godan verb with 'ru' ending"],
+                "tags": ["Usually written using kana alone"] if n == 1 else [],
+                "info": [],
+            }
+            for n in range(3)
+        ],
+    }
+
+
+def synthetic_entries(count: int) -> List[Dict[str, Any]]:
+    return [synthetic_entry(i) for i in range(count)]
+
+
+def fixture_path(keyword: str) -> str:
+    return os.path.join(FIXTURES_DIR, quote(keyword, safe="") + ".json")
+
+
+def load_fixture(keyword: str) -> Optional[List[Dict[str, Any]]]:
+    """Return every recorded entry for a keyword (all pages), or None if it was never recorded."""
+    try:
+        with open(fixture_path(keyword), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def recorded_keywords() -> List[str]:
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    return sorted(unquote(name[:-5]) for name in os.listdir(FIXTURES_DIR) if name.endswith(".json"))
+
+
+def entries_for(keyword: str) -> List[Dict[str, Any]]:
+    recorded = load_fixture(keyword)
+    if recorded is not None:
+        return recorded
+    if keyword.startswith("synthetic-"):
+        try:
+            return synthetic_entries(int(keyword[len("synthetic-"):]))
+        except ValueError:
+            pass
+    return []
+
+
+def record_fixtures(keywords: List[str], max_pages: int = 5) -> Dict[str, int]:
+    """Download real responses from jisho.org into the fixtures folder; returns entry counts."""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    counts = {}
+    for keyword in keywords:
+        entries: List[Dict[str, Any]] = []
+        for page in range(1, max_pages + 1):
+            url = f"{JISHO_SEARCH_URL}?keyword={quote(keyword)}&page={page}"
+            with urlopen(Request(url, headers={"Accept": "application/json"}), timeout=30) as resp:
+                data = json.load(resp).get("data") or []
+            entries.extend(data)
+            if len(data) < PAGE_SIZE:
+                break
+        with open(fixture_path(keyword), "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        counts[keyword] = len(entries)
+    return counts
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the session reuses the connection, as it does with Jisho
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != SEARCH_PATH:
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        keyword = query.get("keyword", [""])[0]
+        try:
+            page = max(1, int(query.get("page", ["1"])[0]))
+        except ValueError:
+            page = 1
+        entries = entries_for(keyword)
+        data = entries[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        body = json.dumps({"meta": {"status": 200}, "data": data}, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Runs the stand-in API on a free localhost port for the duration of a with-block."""
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _SearchHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="jisho-standin", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SEARCH_PATH}"
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
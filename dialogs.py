@@ -0,0 +1,1584 @@
+# -*- coding: utf-8 -*-
+"""
+Dialogs of the add-on: settings, performance statistics and the results window
+(with its list model and delegate).
+
+Imported on first use rather than at Anki startup, so the add-on costs little
+until one of these windows is actually opened.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from aqt import mw
+from aqt.qt import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QGridLayout, QCheckBox, QScrollArea, QWidget, QLineEdit, Qt, QMessageBox, QIcon, QGroupBox,
+    QSizePolicy, pyqtSignal, QApplication,
+    QAbstractListModel, QModelIndex, QListView, QStyledItemDelegate, QStyleOptionButton,
+    QStyle, QEvent, QFont, QFontMetrics, QPainter, QPen, QRect, QRectF, QSize, QDialogButtonBox
+)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QCursor
+from aqt.operations import QueryOp
+from aqt.utils import showInfo, showWarning, tooltip
+
+from . import (
+    DATA_SOURCES, LivePrefetcher, SearchController, StyleRegistry, Token, _,
+    addon_icon_path, get_config, get_local_dictionary, get_lookup_cache, get_results_dialog, get_themed_icon, log, perf_stats,
+    register_stylesheet, running_fetch_engine, save_config, segment_sentence, set_language, theme_styles,
+)
+from .entrymodel import Entry, Sense
+from .localdict import contains_japanese
+from .resultpaging import ResultPaging
+
+# -------------------------
+# Settings Dialog
+# -------------------------
+
+@register_stylesheet("config_group_box")
+def config_group_box_stylesheet(palette) -> str:
+    return f"""
+        QGroupBox {{
+            border: 1px solid {palette.BORDER_DARK};
+            border-radius: 4px;
+            margin-top: 9px;
+        }}
+        QGroupBox::title {{
+            subcontrol-origin: margin;
+            subcontrol-position: top left;
+            padding: 0 4px;
+            left: 8px;
+        }}
+    """
+
+@register_stylesheet("config_scroll_area")
+def config_scroll_area_stylesheet(palette) -> str:
+    return f"QScrollArea {{ border: 1px solid {palette.BORDER_LIGHT}; border-radius: 4px; }}"
+
+class ConfigDialog(QDialog):
+    """Dialog for configuring the add-on."""
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("GRKN Anki Jisho Connect Settings")
+        self.setMinimumWidth(500)
+        
+        self.config = get_config().copy()
+        self.mapping_rows_data = [] 
+
+        self._setup_ui()
+
+        self.restyle()
+
+        self._connect_signals()
+
+        self._load_initial_data()
+
+    def _setup_ui(self):
+        """Constrói a interface gráfica uma única vez."""
+        main_layout = QVBoxLayout(self)
+        self.setLayout(main_layout)
+        main_layout.setSpacing(15)
+
+        # --- Seletor de Idioma ---
+        lang_layout = QHBoxLayout()
+        self.lang_label = QLabel()
+        lang_layout.addWidget(self.lang_label)
+        self.lang_dropdown = QComboBox()
+        self.lang_dropdown.addItems(["English", "Português"])
+        self.lang_map = {0: "en", 1: "pt"}
+        lang_layout.addWidget(self.lang_dropdown)
+        main_layout.addLayout(lang_layout)
+
+        # --- Grupo de Configurações Principais ---
+        self.main_config_group = QGroupBox()
+        main_config_layout = QGridLayout(self.main_config_group)
+        main_config_layout.setSpacing(10)
+        
+        self.note_type_label = QLabel()
+        main_config_layout.addWidget(self.note_type_label, 0, 0)
+        self.card_type_dropdown = QComboBox()
+        self.card_type_names = sorted(mw.col.models.all_names())
+        self.card_type_dropdown.addItems([""] + self.card_type_names)
+        main_config_layout.addWidget(self.card_type_dropdown, 0, 1)
+
+        self.search_field_label = QLabel()
+        main_config_layout.addWidget(self.search_field_label, 1, 0)
+        self.search_field_dropdown = QComboBox()
+        main_config_layout.addWidget(self.search_field_dropdown, 1, 1)
+
+        self.fill_mode_label = QLabel()
+        main_config_layout.addWidget(self.fill_mode_label, 2, 0)
+        self.fill_mode_dropdown = QComboBox()
+        main_config_layout.addWidget(self.fill_mode_dropdown, 2, 1)
+
+        self.batch_pick_label = QLabel()
+        main_config_layout.addWidget(self.batch_pick_label, 3, 0)
+        self.batch_pick_dropdown = QComboBox()
+        main_config_layout.addWidget(self.batch_pick_dropdown, 3, 1)
+
+        self.data_source_label = QLabel()
+        main_config_layout.addWidget(self.data_source_label, 4, 0)
+        self.data_source_dropdown = QComboBox()
+        main_config_layout.addWidget(self.data_source_dropdown, 4, 1)
+        
+        main_layout.addWidget(self.main_config_group)
+
+        # --- Grupo de Mapeamento de Campos ---
+        self.mapping_group = QGroupBox()
+        mapping_group_layout = QVBoxLayout(self.mapping_group)
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setMinimumHeight(100)
+        scroll_area.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        
+        scroll_content = QWidget()
+        scroll_content.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Maximum)
+        self.mapping_grid_layout = QGridLayout(scroll_content)
+        self.mapping_grid_layout.setSpacing(5)
+        scroll_area.setWidget(scroll_content)
+        
+        mapping_group_layout.addWidget(scroll_area)
+
+        self.add_btn = QPushButton()
+        self.add_btn.setStyleSheet("padding: 5px;")
+        mapping_group_layout.addWidget(self.add_btn)
+        
+        main_layout.addWidget(self.mapping_group)
+
+        # --- Opções Adicionais e Botão Salvar ---
+        self.warn_checkbox = QCheckBox()
+        self.remove_pos_checkbox = QCheckBox()
+        self.live_search_checkbox = QCheckBox()
+        self.prewarm_checkbox = QCheckBox()
+        self.fold_kana_checkbox = QCheckBox()
+        self.sentence_mode_checkbox = QCheckBox()
+        self.sentence_mode_hint = QLabel()
+        self.sentence_mode_hint.setWordWrap(True)
+        self.sentence_mode_hint.setStyleSheet("font-style: italic; margin-left: 20px;")
+        self.sentence_mode_hint.setVisible(get_local_dictionary() is None)
+        self.save_button = QPushButton()
+        self.save_button.setStyleSheet("padding: 8px; font-weight: bold;")
+        
+        main_layout.addWidget(self.warn_checkbox)
+        main_layout.addWidget(self.remove_pos_checkbox)
+        main_layout.addWidget(self.live_search_checkbox)
+        main_layout.addWidget(self.prewarm_checkbox)
+        main_layout.addWidget(self.fold_kana_checkbox)
+        main_layout.addWidget(self.sentence_mode_checkbox)
+        main_layout.addWidget(self.sentence_mode_hint)
+        main_layout.addWidget(self.save_button)
+
+        self.scroll_area = scroll_area
+
+        self._retranslate_ui()
+
+    def _retranslate_ui(self):
+        """Atualiza todo o texto da UI para o idioma atual."""
+        self.setWindowTitle(_("settings_title"))
+        self.lang_label.setText(_("language"))
+        
+        self.main_config_group.setTitle(_("main_settings"))
+        self.note_type_label.setText(_("note_type"))
+        self.search_field_label.setText(_("search_field"))
+        self.fill_mode_label.setText(_("fill_mode"))
+        
+        current_fill_mode_index = self.fill_mode_dropdown.currentIndex()
+        self.fill_mode_dropdown.clear()
+        self.fill_mode_dropdown.addItems([_("fill_mode_replace"), _("fill_mode_append")])
+        if current_fill_mode_index != -1:
+            self.fill_mode_dropdown.setCurrentIndex(current_fill_mode_index)
+
+        self.batch_pick_label.setText(_("batch_pick_rule"))
+        current_pick_index = self.batch_pick_dropdown.currentIndex()
+        self.batch_pick_dropdown.clear()
+        self.batch_pick_dropdown.addItems([_("batch_pick_first"), _("batch_pick_all")])
+        if current_pick_index != -1:
+            self.batch_pick_dropdown.setCurrentIndex(current_pick_index)
+
+        self.data_source_label.setText(_("data_source"))
+        current_source_index = self.data_source_dropdown.currentIndex()
+        self.data_source_dropdown.clear()
+        self.data_source_dropdown.addItems([_("data_source_" + source) for source in DATA_SOURCES])
+        if current_source_index != -1:
+            self.data_source_dropdown.setCurrentIndex(current_source_index)
+        
+        self.mapping_group.setTitle(_("field_mapping"))
+        self.add_btn.setText(_("add_mapping"))
+        self.warn_checkbox.setText(_("disable_warning"))
+        self.remove_pos_checkbox.setText(_("remove_pos_ending"))
+        self.live_search_checkbox.setText(_("live_search"))
+        self.prewarm_checkbox.setText(_("prewarm"))
+        self.fold_kana_checkbox.setText(_("fold_kana"))
+        self.sentence_mode_checkbox.setText(_("sentence_mode"))
+        self.sentence_mode_hint.setText(_("sentence_mode_no_dictionary"))
+        self.save_button.setText(_("save_and_close"))
+
+    def _language_changed(self):
+        """Chamado quando o idioma é alterado no dropdown."""
+        lang_code = self.lang_map.get(self.lang_dropdown.currentIndex(), "en")
+        set_language(lang_code)
+        
+        self._retranslate_ui()
+        
+        results_dialog = get_results_dialog()
+        # The results window stays hidden between lookups and is reused, so it is retranslated too
+        if results_dialog:
+            results_dialog._retranslate_ui()
+
+    def restyle(self):
+        """Aplica/atualiza estilos com base no tema, SEM recriar os widgets."""
+        self.setWindowIcon(QIcon(addon_icon_path()))
+
+        styles = theme_styles()
+        self.main_config_group.setStyleSheet(styles.stylesheet("config_group_box"))
+        self.mapping_group.setStyleSheet(styles.stylesheet("config_group_box"))
+
+        self.scroll_area.setStyleSheet(styles.stylesheet("config_scroll_area"))
+
+        self._rebuild_mapping_grid()
+
+    def _connect_signals(self):
+        """Conecta todos os sinais aos seus slots."""
+        self.lang_dropdown.currentIndexChanged.connect(self._language_changed)
+        self.card_type_dropdown.currentIndexChanged.connect(self.update_fields)
+        self.add_btn.clicked.connect(self.add_mapping_row)
+        self.save_button.clicked.connect(self.save_config_clicked)
+
+    def _load_initial_data(self):
+        """Carrega os dados da configuração na interface."""
+        lang_code = self.config.get("language", "en")
+        lang_index = 0
+        for index, code in self.lang_map.items():
+            if code == lang_code:
+                lang_index = index
+                break
+        self.lang_dropdown.setCurrentIndex(lang_index)
+
+        self.card_type_dropdown.setCurrentText(self.config.get("card_type", ""))
+        self.fill_mode_dropdown.setCurrentIndex(1 if self.config.get("fill_mode") == "append" else 0)
+        self.batch_pick_dropdown.setCurrentIndex(1 if self.config.get("batch_pick_rule") == "all_senses" else 0)
+        data_source = self.config.get("data_source", "remote")
+        self.data_source_dropdown.setCurrentIndex(DATA_SOURCES.index(data_source) if data_source in DATA_SOURCES else 0)
+        self.warn_checkbox.setChecked(self.config.get("disable_multi_word_warning", False))
+        self.remove_pos_checkbox.setChecked(self.config.get("remove_pos_ending", True))
+        self.live_search_checkbox.setChecked(self.config.get("live_search", False))
+        self.prewarm_checkbox.setChecked(self.config.get("prewarm_enabled", False))
+        self.fold_kana_checkbox.setChecked(self.config.get("fold_kana", False))
+        self.sentence_mode_checkbox.setChecked(self.config.get("sentence_mode", False))
+        
+        self.update_fields() 
+        self.load_mapping_rows()
+
+    def _clear_layout(self, layout):
+        """Remove todos os widgets de um layout."""
+        while layout.count():
+            item = layout.takeAt(0)
+            widget = item.widget()
+            if widget:
+                widget.deleteLater()
+
+    def _rebuild_mapping_grid(self):
+        """Limpa e recria o grid de mapeamento com base em self.mapping_rows_data."""
+        self._clear_layout(self.mapping_grid_layout)
+        
+        jisho_options = ["", "Word", "Reading", "Meaning", "Part of speech", "Info", "Tags", "Other forms", "JLPT Level", "Wanikani Level", "Is_Common"]
+        reorder_button_style = f"..." 
+        remove_button_style = f"..." 
+
+        for row_index, row_data in enumerate(self.mapping_rows_data):
+            left_value, right_value = row_data['jisho'], row_data['field']
+
+            up_btn = QPushButton(icon=get_themed_icon("arrow_up"))
+            up_btn.setFixedSize(30, 30)
+            up_btn.setStyleSheet(reorder_button_style)
+            
+            down_btn = QPushButton(icon=get_themed_icon("arrow_down"))
+            down_btn.setFixedSize(30, 30)
+            down_btn.setStyleSheet(reorder_button_style)
+            
+            left_combo = QComboBox(); left_combo.addItems(jisho_options)
+            arrow_label = QLabel("→"); arrow_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            right_combo = QComboBox(); right_combo.addItems([""] + self.current_field_names)
+            
+            remove_btn = QPushButton(icon=get_themed_icon("remove"))
+            remove_btn.setFixedSize(30, 30)
+            remove_btn.setStyleSheet(remove_button_style)
+
+            left_combo.setCurrentText(left_value)
+            right_combo.setCurrentText(right_value)
+
+            up_btn.clicked.connect(lambda _, idx=row_index: self._move_row(idx, -1))
+            down_btn.clicked.connect(lambda _, idx=row_index: self._move_row(idx, 1))
+            remove_btn.clicked.connect(lambda _, idx=row_index: self._remove_row(idx))
+
+            left_combo.currentTextChanged.connect(lambda text, idx=row_index: self.mapping_rows_data[idx].update({"jisho": text}))
+            right_combo.currentTextChanged.connect(lambda text, idx=row_index: self.mapping_rows_data[idx].update({"field": text}))
+            
+            self.mapping_grid_layout.addWidget(up_btn, row_index, 0)
+            self.mapping_grid_layout.addWidget(down_btn, row_index, 1)
+            self.mapping_grid_layout.addWidget(left_combo, row_index, 2)
+            self.mapping_grid_layout.addWidget(arrow_label, row_index, 3)
+            self.mapping_grid_layout.addWidget(right_combo, row_index, 4)
+            self.mapping_grid_layout.addWidget(remove_btn, row_index, 5)
+
+        self.mapping_grid_layout.setColumnStretch(2, 1)
+        self.mapping_grid_layout.setColumnStretch(4, 1)
+
+        for i in range(len(self.mapping_rows_data)):
+            self.mapping_grid_layout.setRowStretch(i, 0)
+        self.mapping_grid_layout.setRowStretch(len(self.mapping_rows_data), 1)
+
+        self._update_button_states()
+
+    def add_mapping_row(self):
+        """Adiciona um novo mapeamento à lista de dados e reconstrói o grid."""
+        self.mapping_rows_data.append({"jisho": "", "field": ""})
+        self._rebuild_mapping_grid()
+
+    def _remove_row(self, index):
+        """Remove uma linha da lista de dados e reconstrói o grid."""
+        if 0 <= index < len(self.mapping_rows_data):
+            del self.mapping_rows_data[index]
+            self._rebuild_mapping_grid()
+            
+    def _move_row(self, index, direction):
+        """Move uma linha, reconstrói o grid e agenda o posicionamento do cursor."""
+        if not (0 <= index < len(self.mapping_rows_data)):
+            return
+        
+        new_index = index + direction
+        if not (0 <= new_index < len(self.mapping_rows_data)):
+            return
+
+        self.mapping_rows_data.insert(new_index, self.mapping_rows_data.pop(index))
+
+        self._rebuild_mapping_grid()
+
+        target_column = 0 if direction == -1 else 1
+        
+        target_item = self.mapping_grid_layout.itemAtPosition(new_index, target_column)
+
+        if target_item and target_item.widget():
+            target_button = target_item.widget()
+
+            QTimer.singleShot(0, lambda: self._position_cursor_on_widget(target_button))
+
+    def _position_cursor_on_widget(self, widget):
+        """Calcula o centro de um widget e posiciona o cursor do mouse sobre ele."""
+        if not widget:
+            return
+
+        button_center = widget.rect().center()
+
+        global_pos = widget.mapToGlobal(button_center)
+
+        QCursor.setPos(global_pos)
+
+    def _update_button_states(self):
+        """Habilita/desabilita botões de mover com base na posição."""
+        count = self.mapping_grid_layout.rowCount() -1 
+        for i in range(count):
+            up_btn_item = self.mapping_grid_layout.itemAtPosition(i, 0)
+            down_btn_item = self.mapping_grid_layout.itemAtPosition(i, 1)
+            if up_btn_item and down_btn_item:
+                up_btn_item.widget().setEnabled(i > 0)
+                down_btn_item.widget().setEnabled(i < count - 1)
+
+    def update_fields(self):
+        """Atualiza a lista de campos com base no tipo de nota selecionado."""
+        model_name = self.card_type_dropdown.currentText()
+        self.current_field_names = []
+        if model_name:
+            model = mw.col.models.by_name(model_name)
+            if model:
+                self.current_field_names = [fld["name"] for fld in model["flds"]]
+        
+        self.search_field_dropdown.clear()
+        self.search_field_dropdown.addItems(self.current_field_names)
+        
+        saved_search = self.config.get("search_field", "")
+        if saved_search in self.current_field_names:
+            self.search_field_dropdown.setCurrentText(saved_search)
+
+        self._rebuild_mapping_grid()
+
+    def load_mapping_rows(self):
+        """Carrega os mapeamentos da config para a lista de dados."""
+        mappings = self.config.get("mappings", [])
+        
+        if isinstance(mappings, dict):
+            self.mapping_rows_data = [{"jisho": jisho, "field": field} for field, jisho in mappings.items()]
+        elif isinstance(mappings, list):
+            self.mapping_rows_data = mappings
+        else:
+            self.mapping_rows_data = []
+
+        self._rebuild_mapping_grid()
+
+    def save_config_clicked(self):
+        """Valida e salva a configuração."""
+        for mapping in self.mapping_rows_data:
+            if not mapping["jisho"] or not mapping["field"]:
+                showWarning(_("warning_fill_mappings"))
+                return
+        
+        lang_code = self.lang_map.get(self.lang_dropdown.currentIndex(), "en")
+        self.config.update({
+            "language": lang_code,
+            "card_type": self.card_type_dropdown.currentText(),
+            "search_field": self.search_field_dropdown.currentText(),
+            "mappings": self.mapping_rows_data,
+            "fill_mode": "append" if self.fill_mode_dropdown.currentIndex() == 1 else "replace",
+            "batch_pick_rule": "all_senses" if self.batch_pick_dropdown.currentIndex() == 1 else "first_sense",
+            "data_source": DATA_SOURCES[max(0, self.data_source_dropdown.currentIndex())],
+            "disable_multi_word_warning": self.warn_checkbox.isChecked(),
+            "remove_pos_ending": self.remove_pos_checkbox.isChecked(),
+            "live_search": self.live_search_checkbox.isChecked(),
+            "prewarm_enabled": self.prewarm_checkbox.isChecked(),
+            "fold_kana": self.fold_kana_checkbox.isChecked(),
+            "sentence_mode": self.sentence_mode_checkbox.isChecked()
+        })
+        save_config(self.config)
+        showInfo(_("info_settings_saved"))
+        self.close()
+
+# -------------------------
+# Performance Statistics Dialog
+# -------------------------
+PERF_REFRESH_MS = 1000
+
+class PerfStatsDialog(QDialog):
+    """Live view of the timing ring buffer, cache hit rate and fetch engine load."""
+    def __init__(self):
+        super().__init__()
+        self.setMinimumSize(560, 380)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setTextFormat(Qt.TextFormat.RichText)
+        self.summary_label.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(self.summary_label, 1)
+        self.cache_label = QLabel()
+        layout.addWidget(self.cache_label)
+        self.pool_label = QLabel()
+        layout.addWidget(self.pool_label)
+        self.coalesced_label = QLabel()
+        layout.addWidget(self.coalesced_label)
+        self.log_checkbox = QCheckBox()
+        self.log_checkbox.setChecked(get_config().get("perf_log_enabled", False))
+        self.log_checkbox.toggled.connect(self._toggle_log)
+        layout.addWidget(self.log_checkbox)
+
+        buttons = QDialogButtonBox()
+        self.clear_button = buttons.addButton(_("perf_clear"), QDialogButtonBox.ButtonRole.ResetRole)
+        self.close_button = buttons.addButton(_("button_close"), QDialogButtonBox.ButtonRole.RejectRole)
+        self.clear_button.clicked.connect(self._clear)
+        buttons.rejected.connect(self.close)
+        layout.addWidget(buttons)
+
+        self.setWindowTitle(_("perf_stats_title"))
+        self.log_checkbox.setText(_("perf_log_to_file"))
+        self.refresh()
+
+    def showEvent(self, event):
+        self._refresh_timer.start(PERF_REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Rebuild the summary table from the current samples."""
+        summary = perf_stats.summary()
+        if summary:
+            header = "".join(
+                f"<th align='left' style='padding: 2px 10px 2px 0; color: {theme_styles().palette.TEXT_SECONDARY};'>{_(key)}</th>"
+                for key in ("perf_column_name", "perf_column_count", "perf_column_mean",
+                            "perf_column_p50", "perf_column_p95", "perf_column_max")
+            )
+            rows = "".join(
+                f"<tr><td style='padding: 2px 10px 2px 0;'>{name}</td><td>{row['count']}</td>"
+                f"<td>{row['mean']:.1f}</td><td>{row['p50']:.1f}</td><td>{row['p95']:.1f}</td><td>{row['max']:.1f}</td></tr>"
+                for name, row in summary.items()
+            )
+            self.summary_label.setText(f"<table cellspacing='0'><tr>{header}</tr>{rows}</table>")
+        else:
+            self.summary_label.setText(_("perf_no_samples"))
+
+        cache = get_lookup_cache()
+        if cache is None:
+            self.cache_label.setText(_("perf_cache_disabled"))
+        else:
+            stats = cache.stats()
+            self.cache_label.setText(_("perf_cache_summary").format(
+                hits=stats["hits"], misses=stats["misses"], rate=stats["hit_rate"], entries=stats["entries"]
+            ))
+        # Opening the dialog must not start the loop thread just to report that it is idle
+        engine = running_fetch_engine()
+        if engine is None:
+            pool = {"active": 0, "waiting": 0, "limit": int(get_config().get("fetch_workers", 4))}
+            leaders = coalesced = 0
+        else:
+            pool, leaders, coalesced = engine.stats(), engine.leaders, engine.coalesced
+        self.pool_label.setText(_("perf_pool_summary").format(**pool))
+        self.coalesced_label.setText(_("perf_coalesced_summary").format(leaders=leaders, coalesced=coalesced))
+
+    def _toggle_log(self, enabled: bool):
+        config = get_config().copy()
+        config["perf_log_enabled"] = enabled
+        save_config(config)
+
+    def _clear(self):
+        perf_stats.clear()
+        self.refresh()
+
+# -------------------------
+# Results List (Model/View)
+# -------------------------
+ROW_HEADER, ROW_SENSE, ROW_FORMS_LABEL, ROW_FORM, ROW_GROUP = range(5)
+ROW_ROLE = Qt.ItemDataRole.UserRole + 1
+
+_WRAP_FLAGS = Qt.AlignmentFlag.AlignLeft.value | Qt.AlignmentFlag.AlignTop.value | Qt.TextFlag.TextWordWrap.value
+_LINE_FLAGS = Qt.AlignmentFlag.AlignLeft.value | Qt.AlignmentFlag.AlignVCenter.value
+_CENTER_FLAGS = Qt.AlignmentFlag.AlignCenter.value
+
+class ResultsModel(QAbstractListModel):
+    """Flat row model of Jisho entries; also owns the checkbox state.
+
+    Each entry is split into a header row, one row per sense and, if present,
+    an "other forms" label followed by one row per form. Rows are tuples of
+    (kind, entry_index, sub_index, is_last_row_of_entry). In sentence mode the
+    entries of each word follow a ROW_GROUP heading, whose entry_index is the
+    group index instead.
+
+    Checked rows are tracked incrementally (per-entry counts and row sets), so
+    the selection state and the selected senses never require a scan of all rows.
+    """
+    selectionStateChanged = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: List[Entry] = []
+        self._other_forms: List[List[str]] = []
+        self._groups: List[str] = []
+        self._rows: List[Tuple[int, int, int, bool]] = []
+        self._checked: List[bool] = []
+        self._reset_selection()
+        self._selection_state = "none"
+
+    def _reset_selection(self):
+        self._entry_first_row: List[int] = []
+        self._sense_counts: List[int] = []
+        self._checked_rows: Dict[int, set] = {}
+        self._checked_count = 0
+        self._entries_with_senses = 0
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._rows[index.row()][0] in (ROW_SENSE, ROW_FORM):
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
+        return Qt.ItemFlag.ItemIsEnabled
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        kind, entry_index, sub_index, _is_last = row
+        if role == ROW_ROLE:
+            return row
+        if role == Qt.ItemDataRole.CheckStateRole and kind in (ROW_SENSE, ROW_FORM):
+            return Qt.CheckState.Checked if self._checked[index.row()] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DisplayRole:
+            if kind == ROW_GROUP:
+                return self._groups[entry_index]
+            entry = self._entries[entry_index]
+            if kind == ROW_HEADER:
+                return entry.word or entry.reading
+            if kind == ROW_SENSE:
+                return "; ".join(entry.senses[sub_index].definitions)
+            if kind == ROW_FORMS_LABEL:
+                return _("other_forms")
+            return self._other_forms[entry_index][sub_index]
+        return None
+
+    def entry(self, entry_index: int) -> Entry:
+        return self._entries[entry_index]
+
+    def group_label(self, group_index: int) -> str:
+        return self._groups[group_index]
+
+    @property
+    def has_groups(self) -> bool:
+        return bool(self._groups)
+
+    def other_form(self, entry_index: int, form_index: int) -> str:
+        return self._other_forms[entry_index][form_index]
+
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def set_entries(self, entries: List[Entry]):
+        """Replace the model contents with a new list of entries."""
+        self.beginResetModel()
+        self._entries, self._other_forms, self._rows, self._checked = [], [], [], []
+        self._groups = []
+        self._reset_selection()
+        for entry in entries:
+            self._add_entry(entry)
+        self.endResetModel()
+        self._update_selection_state()
+
+    def append_entries(self, entries: List[Entry]):
+        """Add another page of entries below the current ones, keeping check states."""
+        first_row = len(self._rows)
+        pending, row_count = self._pending_layouts(entries)
+        if not row_count:
+            return
+        self.beginInsertRows(QModelIndex(), first_row, first_row + row_count - 1)
+        for entry, layout in pending:
+            self._commit_entry(entry, layout)
+        self.endInsertRows()
+
+    def append_group(self, label: str, entries: List[Entry]):
+        """Add a word heading (sentence mode) followed by that word's entries."""
+        first_row = len(self._rows)
+        pending, row_count = self._pending_layouts(entries)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + row_count)
+        self._rows.append((ROW_GROUP, len(self._groups), 0, True))
+        self._checked.append(False)
+        self._groups.append(label)
+        for entry, layout in pending:
+            self._commit_entry(entry, layout)
+        self.endInsertRows()
+
+    def _pending_layouts(self, entries: List[Entry]):
+        pending = []
+        row_count = 0
+        for entry in entries:
+            layout = self._entry_layout(entry, len(self._entries) + len(pending))
+            if layout:
+                pending.append((entry, layout))
+                row_count += len(layout[1])
+        return pending, row_count
+
+    def clear(self):
+        self.set_entries([])
+
+    def _add_entry(self, entry: Entry):
+        layout = self._entry_layout(entry, len(self._entries))
+        if layout:
+            self._commit_entry(entry, layout)
+
+    @staticmethod
+    def _entry_layout(entry: Entry, entry_index: int) -> Optional[Tuple[List[str], List[Tuple[int, int, int, bool]]]]:
+        """Compute the other forms and rows of an entry without touching the model."""
+        if not entry.forms:
+            return None
+        other_forms = [
+            f"{form.word} [{form.reading}]"
+            for form in entry.forms[1:] if form.word or form.reading
+        ]
+        rows = [(ROW_HEADER, entry_index, 0)]
+        rows.extend((ROW_SENSE, entry_index, i) for i in range(len(entry.senses)))
+        if other_forms:
+            rows.append((ROW_FORMS_LABEL, entry_index, 0))
+            rows.extend((ROW_FORM, entry_index, i) for i in range(len(other_forms)))
+        last = len(rows) - 1
+        return other_forms, [(kind, ei, sub, i == last) for i, (kind, ei, sub) in enumerate(rows)]
+
+    def _commit_entry(self, entry: Entry, layout: Tuple[List[str], List[Tuple[int, int, int, bool]]]):
+        other_forms, rows = layout
+        self._entries.append(entry)
+        self._other_forms.append(other_forms)
+        self._entry_first_row.append(len(self._rows))
+        self._sense_counts.append(0)
+        self._rows.extend(rows)
+        self._checked.extend([False] * len(rows))
+
+    def _set_checked(self, row: int, checked: bool) -> bool:
+        """Update one row and the selection counters; returns False if nothing changed."""
+        if self._checked[row] == checked:
+            return False
+        self._checked[row] = checked
+        kind, entry_index, _sub, _last = self._rows[row]
+        entry_rows = self._checked_rows.setdefault(entry_index, set())
+        if checked:
+            entry_rows.add(row)
+            self._checked_count += 1
+        else:
+            entry_rows.discard(row)
+            self._checked_count -= 1
+            if not entry_rows:
+                del self._checked_rows[entry_index]
+        if kind == ROW_SENSE:
+            before = self._sense_counts[entry_index]
+            after = before + (1 if checked else -1)
+            self._sense_counts[entry_index] = after
+            if before == 0:
+                self._entries_with_senses += 1
+            elif after == 0:
+                self._entries_with_senses -= 1
+        return True
+
+    def _update_selection_state(self):
+        if not self._checked_count:
+            state = "none"
+        elif self._entries_with_senses > 1:
+            state = "multi"
+        else:
+            state = "single"
+        if state != self._selection_state:
+            self._selection_state = state
+            self.selectionStateChanged.emit(state)
+
+    @property
+    def selection_state(self) -> str:
+        """"none", "single" or "multi" (senses checked in more than one entry)."""
+        return self._selection_state
+
+    def toggle(self, row: int):
+        """Flip the check state of a sense or form row."""
+        if self._rows[row][0] not in (ROW_SENSE, ROW_FORM):
+            return
+        self._set_checked(row, not self._checked[row])
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self._update_selection_state()
+
+    def toggle_entry_senses(self, entry_index: int):
+        """Check every sense of an entry, or clear them all if they are already checked."""
+        first_sense = self._entry_first_row[entry_index] + 1
+        sense_count = len(self._entries[entry_index].senses)
+        if not sense_count:
+            return
+        checked = self._sense_counts[entry_index] < sense_count
+        for row in range(first_sense, first_sense + sense_count):
+            self._set_checked(row, checked)
+        # A single dataChanged for the whole block of senses
+        self.dataChanged.emit(self.index(first_sense), self.index(first_sense + sense_count - 1),
+                              [Qt.ItemDataRole.CheckStateRole])
+        self._update_selection_state()
+
+    def selections(self) -> List[Tuple[Entry, list, list]]:
+        """Return (entry, selected_senses, selected_other_forms) for every entry with a checked row."""
+        selected = []
+        for entry_index in sorted(self._checked_rows):
+            entry = self._entries[entry_index]
+            senses, forms = [], []
+            for row in sorted(self._checked_rows[entry_index]):
+                kind, _ei, sub_index, _last = self._rows[row]
+                if kind == ROW_SENSE:
+                    senses.append(entry.senses[sub_index])
+                else:
+                    forms.append(self._other_forms[entry_index][sub_index])
+            selected.append((entry, senses, forms))
+        return selected
+
+class ResultsDelegate(QStyledItemDelegate):
+    """Paints result rows as entry cards; only visible rows are ever painted."""
+    CARD_MARGIN = 15
+    CARD_PADDING = 15
+    CARD_RADIUS = 8
+    ROW_SPACING = 12
+    CHECKBOX_SIZE = 18
+    CHECKBOX_SPACING = 8
+    TAG_HEIGHT = 24
+    TAG_SPACING = 7
+    TAG_PADDING = 15
+    FORMS_LABEL_MARGIN = 10
+    GROUP_MARGIN_TOP = 18
+    GROUP_MARGIN_BOTTOM = 4
+
+    def __init__(self, view: QListView):
+        super().__init__(view)
+        self._view = view
+        self._fonts: Dict[str, QFont] = {}
+
+    def _font(self, key: str) -> QFont:
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont(self._view.font())
+            font.setFamilies(["Segoe UI", "Helvetica", "Arial"])
+            if key == "word":
+                font.setPixelSize(32)
+                font.setWeight(QFont.Weight.DemiBold)
+            elif key == "reading":
+                font.setPixelSize(18)
+            elif key == "bold":
+                font.setBold(True)
+            elif key == "italic":
+                font.setItalic(True)
+            elif key == "small_italic":
+                font.setPixelSize(12)
+                font.setItalic(True)
+            elif key == "tag":
+                font.setPixelSize(12)
+                font.setWeight(QFont.Weight.DemiBold)
+            elif key == "forms_label":
+                font.setPixelSize(14)
+                font.setBold(True)
+            elif key == "group":
+                font.setPixelSize(20)
+                font.setWeight(QFont.Weight.DemiBold)
+            self._fonts[key] = font
+        return font
+
+    # --- Geometry ---
+
+    def _card_rect(self, rect: QRect, row, is_final: bool) -> QRect:
+        kind, _ei, _sub, is_last = row
+        top = self.CARD_MARGIN if kind == ROW_HEADER else 0
+        bottom = self.CARD_MARGIN if is_last and is_final else 0
+        return rect.adjusted(self.CARD_MARGIN, top, -self.CARD_MARGIN, -bottom)
+
+    def _content_rect(self, card: QRect, row) -> QRect:
+        kind, _ei, _sub, is_last = row
+        top = self.CARD_PADDING if kind == ROW_HEADER else self.ROW_SPACING
+        bottom = self.CARD_PADDING if is_last else 0
+        return card.adjusted(self.CARD_PADDING, top, -self.CARD_PADDING, -bottom)
+
+    def _content_width(self) -> int:
+        return max(100, self._view.viewport().width() - 2 * (self.CARD_MARGIN + self.CARD_PADDING))
+
+    def _wrapped_height(self, font_key: str, text: str, width: int) -> int:
+        return QFontMetrics(self._font(font_key)).boundingRect(QRect(0, 0, width, 100000), _WRAP_FLAGS, text).height()
+
+    def _header_tags(self, entry: Entry) -> List[Tuple[str, str, str]]:
+        """Return (text, background colour name, text colour name) for each pill."""
+        tags = []
+        if entry.is_common:
+            tags.append(("common word", "SUCCESS", "SUCCESS_TEXT"))
+        for tag in entry.jlpt:
+            tags.append((tag, "INFO", "INFO_TEXT"))
+        for tag in entry.tags:
+            if "wanikani" in tag:
+                tags.append((tag, "WARNING", "WARNING_TEXT"))
+        return tags
+
+    def _sense_blocks(self, sense: Sense) -> List[Tuple[str, str]]:
+        """Return the (font, text) blocks shown for a sense, top to bottom."""
+        blocks = []
+        pos = ", ".join(sense.parts_of_speech)
+        if pos:
+            blocks.append(("italic", pos))
+        blocks.append(("body", "; ".join(sense.definitions)))
+        tags_info = sense.tags + sense.info
+        if tags_info:
+            blocks.append(("small_italic", ", ".join(item.replace("\n", " ").replace("\r", "") for item in tags_info)))
+        return blocks
+
+    def _content_height(self, model: ResultsModel, row, width: int) -> int:
+        kind, entry_index, sub_index, _is_last = row
+        entry = model.entry(entry_index)
+        if kind == ROW_HEADER:
+            height = QFontMetrics(self._font("word")).height()
+            if self._header_tags(entry):
+                height += self.ROW_SPACING + self.TAG_HEIGHT
+            return height
+        if kind == ROW_SENSE:
+            text_width = width - self.CHECKBOX_SIZE - self.CHECKBOX_SPACING
+            number_width = QFontMetrics(self._font("bold")).horizontalAdvance(f"{sub_index + 1}. ")
+            height = 0
+            for font_key, text in self._sense_blocks(entry.senses[sub_index]):
+                block_width = text_width - number_width if font_key == "body" else text_width
+                height += self._wrapped_height(font_key, text, block_width) + 2
+            return max(self.CHECKBOX_SIZE, height - 2)
+        if kind == ROW_FORMS_LABEL:
+            return self.FORMS_LABEL_MARGIN + QFontMetrics(self._font("forms_label")).height()
+        return max(self.CHECKBOX_SIZE, QFontMetrics(self._font("body")).height())
+
+    def sizeHint(self, option, index) -> QSize:
+        model = index.model()
+        row = index.data(ROW_ROLE)
+        if row[0] == ROW_GROUP:
+            height = self.GROUP_MARGIN_TOP + QFontMetrics(self._font("group")).height() + self.GROUP_MARGIN_BOTTOM
+            return QSize(self._view.viewport().width(), height)
+        width = self._content_width()
+        is_final = index.row() == model.rowCount() - 1
+        kind, _ei, _sub, is_last = row
+        height = self._content_height(model, row, width)
+        height += self.CARD_PADDING if kind == ROW_HEADER else self.ROW_SPACING
+        if kind == ROW_HEADER:
+            height += self.CARD_MARGIN
+        if is_last:
+            height += self.CARD_PADDING + (self.CARD_MARGIN if is_final else 0)
+        return QSize(self._view.viewport().width(), height)
+
+    # --- Painting ---
+
+    def paint(self, painter: QPainter, option, index):
+        model = index.model()
+        row = index.data(ROW_ROLE)
+        kind, entry_index, sub_index, is_last = row
+        styles = theme_styles()
+        if kind == ROW_GROUP:
+            self._paint_group(painter, styles, option.rect, model.group_label(entry_index))
+            return
+        is_final = index.row() == model.rowCount() - 1
+        card = self._card_rect(option.rect, row, is_final)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._paint_card(painter, styles, card, kind == ROW_HEADER, is_last)
+        content = self._content_rect(card, row)
+        entry = model.entry(entry_index)
+        if kind == ROW_HEADER:
+            self._paint_header(painter, styles, content, entry)
+        elif kind == ROW_SENSE:
+            self._paint_sense(painter, styles, content, entry.senses[sub_index], sub_index + 1, model.is_checked(index.row()))
+        elif kind == ROW_FORMS_LABEL:
+            painter.setFont(self._font("forms_label"))
+            painter.setPen(styles.color("TEXT_PRIMARY"))
+            painter.drawText(content.adjusted(0, self.FORMS_LABEL_MARGIN, 0, 0), _LINE_FLAGS, _("other_forms"))
+        else:
+            self._paint_checkbox(painter, content.left(), content.top(), model.is_checked(index.row()))
+            text_rect = content.adjusted(self.CHECKBOX_SIZE + self.CHECKBOX_SPACING, 0, 0, 0)
+            text_rect.setHeight(max(self.CHECKBOX_SIZE, text_rect.height()))
+            painter.setFont(self._font("body"))
+            painter.setPen(styles.color("TEXT_PRIMARY"))
+            painter.drawText(text_rect, _LINE_FLAGS, model.other_form(entry_index, sub_index))
+        painter.restore()
+
+    def _paint_card(self, painter: QPainter, styles: StyleRegistry, card: QRect, is_first: bool, is_last: bool):
+        """Draw this row's slice of the rounded entry card.
+
+        The card outline is drawn as if it extended past the row and clipped to
+        the row, so consecutive rows join into one seamless card.
+        """
+        overlap = self.CARD_RADIUS * 2
+        outline = QRectF(card).adjusted(0.5, 0.5 if is_first else -overlap, -0.5, -0.5 if is_last else overlap)
+        painter.save()
+        painter.setClipRect(card)
+        painter.setPen(QPen(styles.color("BORDER"), 1))
+        painter.setBrush(styles.color("BACKGROUND"))
+        painter.drawRoundedRect(outline, self.CARD_RADIUS, self.CARD_RADIUS)
+        painter.restore()
+
+    def _paint_group(self, painter: QPainter, styles: StyleRegistry, rect: QRect, label: str):
+        """Draw a sentence-mode word heading with a rule underneath."""
+        text_rect = rect.adjusted(self.CARD_MARGIN, self.GROUP_MARGIN_TOP, -self.CARD_MARGIN, -self.GROUP_MARGIN_BOTTOM)
+        painter.save()
+        painter.setFont(self._font("group"))
+        painter.setPen(styles.color("TEXT_PRIMARY"))
+        painter.drawText(text_rect, _LINE_FLAGS, label)
+        painter.setPen(QPen(styles.color("BORDER_DARK"), 1))
+        painter.drawLine(text_rect.left(), rect.bottom(), text_rect.right(), rect.bottom())
+        painter.restore()
+
+    def _paint_header(self, painter: QPainter, styles: StyleRegistry, content: QRect, entry: Entry):
+        word = entry.word
+        reading = entry.reading
+        word_fm = QFontMetrics(self._font("word"))
+        painter.setFont(self._font("word"))
+        painter.setPen(styles.color("TEXT_PRIMARY"))
+        word_text = word or reading
+        painter.drawText(QRect(content.left(), content.top(), content.width(), word_fm.height()), _LINE_FLAGS, word_text)
+        if word and reading and word != reading:
+            reading_fm = QFontMetrics(self._font("reading"))
+            x = content.left() + word_fm.horizontalAdvance(word_text) + 5
+            y = content.top() + word_fm.height() - reading_fm.height() - 3
+            painter.setFont(self._font("reading"))
+            painter.setPen(styles.color("TEXT_SECONDARY"))
+            painter.drawText(QRect(x, y, content.right() - x, reading_fm.height()), _LINE_FLAGS, reading)
+
+        x = content.left()
+        y = content.top() + word_fm.height() + self.ROW_SPACING
+        tag_fm = QFontMetrics(self._font("tag"))
+        painter.setFont(self._font("tag"))
+        for text, bg_color, fg_color in self._header_tags(entry):
+            width = tag_fm.horizontalAdvance(text) + 2 * self.TAG_PADDING
+            tag_rect = QRect(x, y, width, self.TAG_HEIGHT)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(styles.color(bg_color))
+            painter.drawRoundedRect(QRectF(tag_rect), 4, 4)
+            painter.setPen(styles.color(fg_color))
+            painter.drawText(tag_rect, _CENTER_FLAGS, text)
+            x += width + self.TAG_SPACING
+
+    def _paint_sense(self, painter: QPainter, styles: StyleRegistry, content: QRect, sense: Sense, number: int, checked: bool):
+        self._paint_checkbox(painter, content.left(), content.top(), checked)
+        left = content.left() + self.CHECKBOX_SIZE + self.CHECKBOX_SPACING
+        width = content.right() - left
+        y = content.top()
+        for font_key, text in self._sense_blocks(sense):
+            if font_key == "italic":
+                color = styles.color("TEXT_TERTIARY")
+            elif font_key == "small_italic":
+                color = styles.color("TEXT_SECONDARY")
+            else:
+                color = styles.color("TEXT_PRIMARY")
+            block_left = left
+            block_width = width
+            if font_key == "body":
+                number_text = f"{number}. "
+                painter.setFont(self._font("bold"))
+                painter.setPen(color)
+                number_width = QFontMetrics(self._font("bold")).horizontalAdvance(number_text)
+                painter.drawText(QRect(left, y, number_width, 1000), _WRAP_FLAGS, number_text)
+                block_left += number_width
+                block_width -= number_width
+            height = self._wrapped_height(font_key, text, block_width)
+            painter.setFont(self._font(font_key))
+            painter.setPen(color)
+            painter.drawText(QRect(block_left, y, block_width, height), _WRAP_FLAGS, text)
+            y += height + 2
+
+    def _paint_checkbox(self, painter: QPainter, x: int, y: int, checked: bool):
+        opt = QStyleOptionButton()
+        opt.rect = QRect(x, y, self.CHECKBOX_SIZE, self.CHECKBOX_SIZE)
+        opt.state = QStyle.StateFlag.State_Enabled | (QStyle.StateFlag.State_On if checked else QStyle.StateFlag.State_Off)
+        self._view.style().drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, opt, painter, self._view)
+
+    # --- Interaction ---
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Toggle sense/form rows on click or Space, without any per-row widgets.
+
+        Double-clicking an entry's header checks or clears all of its senses.
+        """
+        event_type = event.type()
+        if not (index.flags() & Qt.ItemFlag.ItemIsUserCheckable):
+            row = index.data(ROW_ROLE)
+            if (event_type == QEvent.Type.MouseButtonDblClick and row[0] == ROW_HEADER
+                    and event.button() == Qt.MouseButton.LeftButton):
+                model.toggle_entry_senses(row[1])
+                return True
+            return False
+        if event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+            return True
+        if event_type == QEvent.Type.MouseButtonRelease:
+            if event.button() != Qt.MouseButton.LeftButton:
+                return False
+            card = self._card_rect(option.rect, index.data(ROW_ROLE), index.row() == model.rowCount() - 1)
+            if card.contains(event.position().toPoint()):
+                model.toggle(index.row())
+            return True
+        if event_type == QEvent.Type.KeyPress and event.key() in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+            model.toggle(index.row())
+            return True
+        return False
+
+# -------------------------
+# Results Dialog
+# -------------------------
+@register_stylesheet("results_dialog")
+def results_dialog_stylesheet(palette) -> str:
+    """Build the single stylesheet that themes every widget of ResultsDialog."""
+    return f"""
+        ResultsDialog {{
+            background-color: {palette.BACKGROUND};
+        }}
+        QLabel {{
+            font-family: "Segoe UI", "Helvetica", "Arial", sans-serif;
+            color: {palette.TEXT_PRIMARY};
+        }}
+        #searchWidget {{
+            background-color: {palette.BACKGROUND_SEARCH};
+            border-bottom: 1px solid {palette.BORDER};
+            padding: 8px 12px;
+        }}
+        #searchWidget QLineEdit {{
+            font-size: 14px;
+            padding: 8px;
+            border: 1px solid {palette.BORDER_DARK};
+            border-radius: 4px;
+            background-color: {palette.BACKGROUND};
+            color: {palette.TEXT_PRIMARY};
+        }}
+        #searchWidget QPushButton {{
+            font-size: 14px;
+            padding: 8px 16px;
+            background-color: {palette.PRIMARY};
+            color: {palette.PRIMARY_TEXT};
+            border-radius: 4px;
+            font-weight: bold;
+        }}
+        #searchWidget QPushButton:hover {{
+            background-color: {palette.PRIMARY_HOVER};
+        }}
+        #resultsContainer, #resultsView {{
+            background-color: {palette.BACKGROUND_ALT};
+            border: none;
+        }}
+        #loadMoreButton {{
+            margin: 6px 15px 10px 15px; padding: 8px;
+            border: 1px solid {palette.CONTROL_BORDER};
+            border-radius: 4px;
+            background-color: {palette.CONTROL_BG};
+            color: {palette.TEXT_SECONDARY};
+        }}
+        #loadMoreButton:hover {{
+            background-color: {palette.CONTROL_HOVER_BG};
+            border-color: {palette.CONTROL_HOVER_BORDER};
+        }}
+        #loadMoreButton:disabled {{
+            color: {palette.CONTROL_DISABLED_TEXT};
+            border-color: {palette.CONTROL_DISABLED_BORDER};
+        }}
+        #confirmButton {{
+            margin: 12px; padding: 12px; font-size: 16px; font-weight: bold;
+            border-radius: 6px;
+            background-color: {palette.CONFIRM_DISABLED_BG};
+            color: {palette.TEXT_DISABLED};
+            border: 1px solid {palette.BORDER_LIGHT};
+        }}
+        #confirmButton[selectionState="single"] {{
+            background-color: {palette.PRIMARY};
+            color: {palette.PRIMARY_TEXT};
+            border: 1px solid {palette.PRIMARY_HOVER};
+        }}
+        #confirmButton[selectionState="single"]:hover {{
+            background-color: {palette.PRIMARY_HOVER};
+        }}
+        #confirmButton[selectionState="multi"] {{
+            background-color: {palette.ACCENT_YELLOW};
+            color: {palette.ACCENT_YELLOW_TEXT};
+            border: 1px solid {palette.ACCENT_YELLOW_HOVER};
+        }}
+        #confirmButton[selectionState="multi"]:hover {{
+            background-color: {palette.ACCENT_YELLOW_HOVER};
+        }}
+    """
+
+class ResultsDialog(QDialog):
+    """Dialog to display Jisho search results."""
+    def __init__(self, initial_term: str, on_select):
+        super().__init__()
+        self.is_loading = False
+        self.on_select = on_select
+        self.initial_term = initial_term
+        self.results_model = ResultsModel(self)
+        self.search_controller = SearchController(self)
+        self.prefetcher = LivePrefetcher(self)
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._last_search_term = ""
+        self._segment_generation = 0
+        self._told_no_dictionary = False
+        self._applied_styles: Optional[StyleRegistry] = None
+        # Paging: term of the shown results, next page, and whether more pages exist
+        self.paging = ResultPaging()
+        self.setWindowTitle("GRKN Anki Jisho Connect Result")
+        self.setMinimumSize(700, 750)
+
+        self._setup_ui()
+
+        self.restyle()
+
+        self._connect_signals()
+
+        self.update_confirm_button_state()
+
+        if self.initial_term:
+            self.perform_search(self.initial_term)
+
+    def _setup_ui(self):
+        """Builds the widgets once; theme changes only re-polish them."""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(0)
+        main_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.setLayout(main_layout)
+
+        self.setWindowIcon(QIcon(addon_icon_path()))
+
+        search_widget = QWidget()
+        search_widget.setObjectName("searchWidget")
+        search_layout = QHBoxLayout(search_widget)
+        self.search_box = QLineEdit(self.initial_term)
+        search_layout.addWidget(self.search_box)
+        self.search_button = QPushButton()
+        search_layout.addWidget(self.search_button)
+        main_layout.addWidget(search_widget)
+
+        results_container = QWidget()
+        results_container.setObjectName("resultsContainer")
+        results_layout = QVBoxLayout(results_container)
+        results_layout.setContentsMargins(0, 0, 0, 0)
+        results_layout.setSpacing(0)
+        main_layout.addWidget(results_container, 1)
+
+        # Loading / no results messages
+        self.status_label = QLabel()
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setContentsMargins(15, 15, 15, 15)
+        self.status_label.hide()
+        results_layout.addWidget(self.status_label, alignment=Qt.AlignmentFlag.AlignTop)
+
+        # Virtualized list: only visible rows are painted
+        self.results_view = QListView()
+        self.results_view.setObjectName("resultsView")
+        self.results_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.results_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.results_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.results_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.results_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.results_view.setBatchSize(50)
+        self.results_view.setUniformItemSizes(False)
+        # With word wrap on, QListView redoes the layout when the width changes
+        self.results_view.setWordWrap(True)
+        self.results_view.setItemDelegate(ResultsDelegate(self.results_view))
+        self.results_view.setModel(self.results_model)
+        results_layout.addWidget(self.results_view, 1)
+
+        self.load_more_btn = QPushButton()
+        self.load_more_btn.setObjectName("loadMoreButton")
+        self.load_more_btn.hide()
+        results_layout.addWidget(self.load_more_btn)
+
+        self.confirm_btn = QPushButton()
+        self.confirm_btn.setObjectName("confirmButton")
+        self.confirm_btn.setEnabled(False)
+        main_layout.addWidget(self.confirm_btn)
+
+        self._retranslate_ui()
+
+    def _connect_signals(self):
+        """Conecta todos os sinais aos seus slots."""
+        self.search_box.returnPressed.connect(self.perform_search)
+        self.search_box.textEdited.connect(self._on_search_text_edited)
+        self._live_timer.timeout.connect(self._perform_live_search)
+        self.search_button.clicked.connect(self.perform_search)
+        self.confirm_btn.clicked.connect(self.confirm_selection)
+        self.load_more_btn.clicked.connect(self.load_more_results)
+        self.results_view.verticalScrollBar().valueChanged.connect(self._on_results_scrolled)
+        self.results_model.selectionStateChanged.connect(self._apply_selection_state)
+
+    def restyle(self):
+        """Re-applies the theme in one pass, keeping widgets, results and selections."""
+        styles = theme_styles()
+        # The QSS comes prebuilt from the registry; it is only reapplied when the theme really changes
+        if self._applied_styles is not styles:
+            self._applied_styles = styles
+            self.setStyleSheet(styles.stylesheet("results_dialog"))
+        # The delegate reads theme colours while painting; repainting the visible area is enough
+        self.results_view.viewport().update()
+
+    def _retranslate_ui(self):
+        """Atualiza o texto da UI sem recriar os widgets."""
+        self.setWindowTitle(_("results_title"))
+        if hasattr(self, "search_box"):
+            self.search_box.setPlaceholderText(_("search_placeholder"))
+        if hasattr(self, "search_button"):
+            self.search_button.setText(_("search_button"))
+        if hasattr(self, "confirm_btn"):
+            if not self.is_loading:
+                self.confirm_btn.setText(_("confirm_entry"))
+        if hasattr(self, "load_more_btn"):
+            self._update_load_more_button()
+
+    def show_loading_state(self, message: str = "", keep_input: bool = False) -> None:
+        """Show a loading message in the results area.
+
+        With keep_input (search-as-you-type) the search box stays editable.
+        """
+        self.is_loading = True
+        effective_message = message or _("loading_message")
+        self.clear_results()
+        self.show_status_message(effective_message)
+        self.confirm_btn.setEnabled(False)
+        self.confirm_btn.setText(_("loading_message"))
+        if not keep_input:
+            self.search_box.setEnabled(False)
+            self.search_button.setEnabled(False)
+            QApplication.processEvents()
+
+    def show_status_message(self, message: str) -> None:
+        """Show a message in place of the results list."""
+        self.status_label.setText(f"<h3>{message}</h3>")
+        self.status_label.show()
+        self.results_view.hide()
+        self.load_more_btn.hide()
+
+    def show_results_list(self) -> None:
+        """Hide the status message and show the results list."""
+        self.status_label.hide()
+        self.results_view.show()
+        self._update_load_more_button()
+
+    def _update_load_more_button(self) -> None:
+        """Show the "load more" button while there are pages left to fetch."""
+        fetching = self.paging.fetching
+        visible = self.results_view.isVisibleTo(self) and (self.paging.has_more or fetching)
+        self.load_more_btn.setVisible(visible and self.results_model.entry_count() > 0)
+        self.load_more_btn.setEnabled(not fetching)
+        self.load_more_btn.setText(_("loading_more") if fetching else _("load_more"))
+
+    def hide_loading_state(self) -> None:
+        """Reabilita os controles após a busca."""
+        self.is_loading = False
+        self.search_box.setEnabled(True)
+        self.search_button.setEnabled(True)
+        self.confirm_btn.setText(_("confirm_entry"))
+        self.update_confirm_button_state()
+
+    def reset_for_lookup(self, term: str, on_select):
+        """Reuse the dialog for a new lookup: drop the previous state and search for term."""
+        self.on_select = on_select
+        self.initial_term = term
+        self._live_timer.stop()
+        self.prefetcher.cancel_all()
+        self._last_search_term = ""
+        self.search_box.setText(term)
+        self.restyle()
+        self.perform_search(term)
+
+    def _on_search_text_edited(self, text: str):
+        """Search-as-you-type: prefetch the term and schedule the search for when the user pauses."""
+        config = get_config()
+        if not config.get("live_search", False):
+            return
+        term = text.strip()
+        self.prefetcher.update(term)
+        if term:
+            self._live_timer.start(int(config.get("live_search_delay_ms", 400)))
+        else:
+            self._live_timer.stop()
+
+    def _perform_live_search(self):
+        term = self.search_box.text().strip()
+        if term and term != self._last_search_term:
+            self.perform_search(term, keep_input=True)
+
+    def perform_search(self, term: Optional[str] = None, keep_input: bool = False):
+        """Perform a Jisho search in the background, superseding any search still running.
+
+        The first page is shown as soon as it arrives; further pages are appended
+        while they stream in. In sentence mode Japanese text is first split into
+        words in the background, and a sentence of several words goes to
+        perform_sentence_search; anything else is searched as typed.
+        """
+        search_term = term if isinstance(term, str) else self.search_box.text()
+        if not search_term:
+            return
+        self._segment_generation += 1
+        if get_config().get("sentence_mode", False) and contains_japanese(search_term):
+            self._segment_and_search(search_term, keep_input)
+            return
+        self._perform_term_search(search_term, keep_input)
+
+    def _segment_and_search(self, text: str, keep_input: bool):
+        """Split text off the GUI thread, since segmenting queries the local dictionary."""
+        generation = self._segment_generation
+        self._live_timer.stop()
+        self.search_controller.cancel()
+        self.show_loading_state(_("loading_message_term").format(term=text), keep_input=keep_input)
+
+        def on_segmented(tokens: List[Token]):
+            # A newer search, or closing the window, makes this split obsolete
+            if generation != self._segment_generation:
+                return
+            if len(tokens) > 1:
+                self._tell_if_no_dictionary()
+                self.perform_sentence_search(text, tokens, keep_input=keep_input)
+            else:
+                self._perform_term_search(text, keep_input)
+
+        def on_failed(error: Exception):
+            log.warning("Sentence segmentation failed: %s", error)
+            if generation == self._segment_generation:
+                self._perform_term_search(text, keep_input)
+
+        QueryOp(parent=self, op=lambda _col: segment_sentence(text), success=on_segmented).failure(
+            on_failed
+        ).run_in_background()
+
+    def _tell_if_no_dictionary(self):
+        """Explain once per session why a sentence split may look rough without JMdict."""
+        if not self._told_no_dictionary and get_local_dictionary() is None:
+            self._told_no_dictionary = True
+            tooltip(_("sentence_mode_no_dictionary"), period=6000, parent=self)
+
+    def _perform_term_search(self, search_term: str, keep_input: bool):
+        self._live_timer.stop()
+        self._last_search_term = search_term.strip()
+        self.paging.start(search_term)
+
+        self.show_loading_state(_("loading_message_term").format(term=search_term), keep_input=keep_input)
+
+        def on_page(entries: list, page: int):
+            self.paging.page_arrived(len(entries), page)
+            if page == 1:
+                self.hide_loading_state()
+                self.clear_results()
+                if not entries:
+                    self.show_status_message(_('no_results').format(term=search_term))
+                    return
+                with perf_stats.timed("results_populate", entries=len(entries), page=page):
+                    self.results_model.set_entries(entries)
+                    self.show_results_list()
+            else:
+                with perf_stats.timed("results_populate", entries=len(entries), page=page):
+                    self.results_model.append_entries(entries)
+                self._update_load_more_button()
+
+        def on_finished(_entries: list):
+            self.paging.finished()
+            self._update_load_more_button()
+
+        def on_error(err_msg: str):
+            if self.paging.failed():
+                self.hide_loading_state()
+                self.clear_results()
+                showWarning(_("search_failed").format(error=err_msg))
+                return
+            # A later page failed: keep the pages on screen, and any checked senses, and only stop paging
+            self._update_load_more_button()
+            tooltip(_("search_failed").format(error=err_msg), parent=self)
+
+        pages = max(1, int(get_config().get("initial_result_pages", 2)))
+        self.search_controller.start(search_term, on_finished, on_error, on_page=on_page, page_count=pages)
+
+    def perform_sentence_search(self, sentence: str, tokens: List[Token], keep_input: bool = False):
+        """Look up every word of a sentence at once and list the results grouped per word.
+
+        The words are fetched concurrently; each group is added, in sentence order,
+        as soon as its word and every word before it have arrived.
+        """
+        self._live_timer.stop()
+        self._last_search_term = sentence.strip()
+        self.paging.start(sentence)
+
+        self.show_loading_state(_("loading_sentence").format(count=len(tokens)), keep_input=keep_input)
+        limit = max(1, int(get_config().get("sentence_entries_per_word", 5)))
+        arrived: Dict[str, Any] = {}
+        shown = 0
+
+        def on_result(term: str, result):
+            nonlocal shown
+            arrived[term] = result
+            while shown < len(tokens) and tokens[shown].term in arrived:
+                if shown == 0:
+                    self.hide_loading_state()
+                    self.clear_results()
+                    self.show_results_list()
+                token = tokens[shown]
+                shown += 1
+                self._append_word_group(token, arrived[token.term], limit)
+
+        def on_finished(_results: dict):
+            self.paging.finished()
+            if not self.results_model.entry_count():
+                self.show_status_message(_('no_results').format(term=sentence))
+            self._update_load_more_button()
+
+        self.search_controller.start_many([token.term for token in tokens], on_result, on_finished)
+
+    def _append_word_group(self, token: Token, result, limit: int):
+        label = token.term if token.term == token.surface else f"{token.term}（{token.surface}）"
+        if isinstance(result, Exception):
+            entries = []
+            label = f"{label} — {_('sentence_word_failed')}"
+        else:
+            entries = (result or [])[:limit]
+            if not entries:
+                label = f"{label} — {_('sentence_word_no_results')}"
+        with perf_stats.timed("results_populate", entries=len(entries), word=token.term):
+            self.results_model.append_group(label, entries)
+
+    def load_more_results(self):
+        """Fetch the next page of the current term and append it to the list."""
+        if self.is_loading or not self.paging.start_more():
+            return
+        self._update_load_more_button()
+
+        def on_page(entries: list, page: int):
+            self.paging.page_arrived(len(entries), page)
+            with perf_stats.timed("results_populate", entries=len(entries), page=page):
+                self.results_model.append_entries(entries)
+
+        def on_finished(_entries: list):
+            self.paging.finished()
+            self._update_load_more_button()
+
+        def on_error(err_msg: str):
+            self.paging.failed()
+            self._update_load_more_button()
+            tooltip(_("search_failed").format(error=err_msg), parent=self)
+
+        self.search_controller.start(
+            self.paging.term, on_finished, on_error, on_page=on_page, first_page=self.paging.next_page
+        )
+
+    def _on_results_scrolled(self, value: int):
+        """Fetch the next page automatically when the list is scrolled near its end."""
+        scroll_bar = self.results_view.verticalScrollBar()
+        if scroll_bar.maximum() - value <= self.results_view.viewport().height():
+            self.load_more_results()
+
+    def closeEvent(self, event):
+        """Cancel the running search when the window closes."""
+        self._live_timer.stop()
+        self._segment_generation += 1
+        self.prefetcher.cancel_all()
+        self.search_controller.cancel()
+        self.paging.finished()
+        if self.is_loading:
+            self.hide_loading_state()
+            self.clear_results()
+        self._update_load_more_button()
+        super().closeEvent(event)
+
+    def update_confirm_button_state(self):
+        """Update confirm button state based on selection."""
+        self._apply_selection_state(self.results_model.selection_state)
+
+    def _apply_selection_state(self, state: str):
+        """Switch the confirm button between its stylesheet states; only re-polishes on a real change."""
+        self.confirm_btn.setEnabled(state != "none")
+        if self.confirm_btn.property("selectionState") == state:
+            return
+        self.confirm_btn.setProperty("selectionState", state)
+        self.confirm_btn.style().unpolish(self.confirm_btn)
+        self.confirm_btn.style().polish(self.confirm_btn)
+
+    def confirm_selection(self):
+        """Handle confirm button click and fill note fields."""
+        config = get_config()
+        if not config.mappings:
+            showWarning(_("warning_no_mappings"))
+            return
+        # In sentence mode picking several words is the whole point
+        if (not config.disable_multi_word_warning and self.results_model.selection_state == "multi"
+                and not self.results_model.has_groups):
+            msg_box = QMessageBox()
+            msg_box.setIcon(QMessageBox.Icon.Warning)
+            msg_box.setText(_("multi_word_warning_title"))
+            msg_box.setInformativeText(_("multi_word_warning_body"))
+
+            ok_button = msg_box.addButton(_("button_ok"), QMessageBox.ButtonRole.AcceptRole)
+            cancel_button = msg_box.addButton(_("button_cancel"), QMessageBox.ButtonRole.RejectRole)
+            dont_warn_again_button = msg_box.addButton(_("ok_dont_warn_again"), QMessageBox.ButtonRole.ActionRole)
+
+            msg_box.exec() 
+
+            clicked = msg_box.clickedButton()
+
+            if clicked == cancel_button:
+                return 
+            
+            if clicked == dont_warn_again_button:
+                updated_config = config.copy()
+                updated_config["disable_multi_word_warning"] = True
+                save_config(updated_config)
+        selections = self.results_model.selections()
+        if selections:
+            self.on_select(selections)
+        self.close()
+
+    def clear_results(self):
+        """Remove all results and any status message."""
+        self.results_model.clear()
+        self.status_label.hide()
+        self.results_view.show()
+        self._update_load_more_button()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Compact records for dictionary entries.
+
+Jisho answers with dicts that carry every field it knows about (attribution,
+links, sources, restrictions...), most of which the add-on never reads.
+Responses are converted once into Entry/Sense/Form records with __slots__ and
+tuples, keeping only what the results list and the field mappings use. Tags,
+JLPT levels and parts of speech repeat across thousands of entries, so they
+are interned and every record shares the same string objects.
+
+to_dict() writes the same Jisho-shaped keys back, so cached payloads and
+local dictionary rows are read with the same parser as live responses.
+"""
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_intern = sys.intern
+
+
+def _strings(values: Optional[Iterable[Any]]) -> Tuple[str, ...]:
+    return tuple(str(v) for v in values or () if v)
+
+
+def _interned(values: Optional[Iterable[Any]]) -> Tuple[str, ...]:
+    return tuple(_intern(str(v)) for v in values or () if v)
+
+
+class Form:
+    """One written form of an entry: a kanji spelling and/or its reading."""
+
+    __slots__ = ("word", "reading")
+
+    def __init__(self, word: str = "", reading: str = ""):
+        self.word = word
+        self.reading = reading
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Form":
+        return cls(data.get("word") or "", data.get("reading") or "")
+
+    def to_dict(self) -> Dict[str, str]:
+        data = {}
+        if self.word:
+            data["word"] = self.word
+        if self.reading:
+            data["reading"] = self.reading
+        return data
+
+
+class Sense:
+    """One meaning of an entry with its definitions, parts of speech, tags and notes."""
+
+    __slots__ = ("definitions", "parts_of_speech", "tags", "info")
+
+    def __init__(self, definitions: Tuple[str, ...] = (), parts_of_speech: Tuple[str, ...] = (),
+                 tags: Tuple[str, ...] = (), info: Tuple[str, ...] = ()):
+        self.definitions = definitions
+        self.parts_of_speech = parts_of_speech
+        self.tags = tags
+        self.info = info
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Sense":
+        return cls(
+            _strings(data.get("english_definitions")),
+            _interned(data.get("parts_of_speech")),
+            _interned(data.get("tags")),
+            _strings(data.get("info")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"english_definitions": list(self.definitions)}
+        if self.parts_of_speech:
+            data["parts_of_speech"] = list(self.parts_of_speech)
+        if self.tags:
+            data["tags"] = list(self.tags)
+        if self.info:
+            data["info"] = list(self.info)
+        return data
+
+
+class Entry:
+    """A dictionary entry: its forms (the first one is the headword) and senses."""
+
+    __slots__ = ("slug", "is_common", "jlpt", "tags", "forms", "senses")
+
+    def __init__(self, slug: str = "", is_common: bool = False, jlpt: Tuple[str, ...] = (),
+                 tags: Tuple[str, ...] = (), forms: Tuple[Form, ...] = (), senses: Tuple[Sense, ...] = ()):
+        self.slug = slug
+        self.is_common = is_common
+        self.jlpt = jlpt
+        self.tags = tags
+        self.forms = forms
+        self.senses = senses
+
+    @property
+    def word(self) -> str:
+        return self.forms[0].word if self.forms else ""
+
+    @property
+    def reading(self) -> str:
+        return self.forms[0].reading if self.forms else ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Entry":
+        return cls(
+            data.get("slug") or "",
+            bool(data.get("is_common")),
+            _interned(data.get("jlpt")),
+            _interned(data.get("tags")),
+            tuple(Form.from_dict(f) for f in data.get("japanese") or ()),
+            tuple(Sense.from_dict(s) for s in data.get("senses") or ()),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Jisho-shaped dict holding only the fields kept by the record."""
+        data: Dict[str, Any] = {
+            "slug": self.slug,
+            "is_common": self.is_common,
+            "japanese": [f.to_dict() for f in self.forms],
+            "senses": [s.to_dict() for s in self.senses],
+        }
+        if self.jlpt:
+            data["jlpt"] = list(self.jlpt)
+        if self.tags:
+            data["tags"] = list(self.tags)
+        return data
+
+
+def parse_entries(items: Optional[Iterable[Dict[str, Any]]]) -> List[Entry]:
+    """Convert Jisho entry dicts (live, cached or from the local dictionary) into records."""
+    return [Entry.from_dict(item) for item in items or ()]
+
+
+def dump_entries(entries: Iterable[Entry]) -> List[Dict[str, Any]]:
+    return [entry.to_dict() for entry in entries]
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Jisho API constants, errors and the cancellation token used by the HTTP session.
+
+Nothing here imports an HTTP library, so the add-on can load, and code can
+catch FetchError or hold a CancelToken, before requests is needed.
+"""
+import threading
+from typing import Any, Callable, List, Optional
+
+JISHO_SEARCH_URL = "https://jisho.org/api/v1/search/words"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Jisho returns at most 20 entries per page
+PAGE_SIZE = 20
+
+
+class FetchError(Exception):
+    """A request failed after all retries, or the server answered with an error."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class LookupCancelled(Exception):
+    """Raised when a lookup is cancelled before its response has been read."""
+
+
+class CancelToken:
+    """Cancellation handle shared between the caller and a request in flight."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._response: Any = None
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Mark the request as cancelled and close its connection if it is open."""
+        self._event.set()
+        with self._lock:
+            response = self._response
+            callbacks, self._callbacks = self._callbacks, []
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Call callback on cancel(), or right away if the token is already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise LookupCancelled()
+
+    def _attach(self, response: Any):
+        with self._lock:
+            self._response = response
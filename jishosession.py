@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Shared HTTP session for Jisho API requests.
+
+A single requests.Session keeps TLS connections to jisho.org alive between
+searches, so back-to-back lookups skip the TCP and TLS handshakes. Transient
+failures (429 and 5xx) are retried with exponential backoff, honouring any
+Retry-After header the server sends. A request can be aborted from another
+thread through a CancelToken, which closes the underlying connection.
+Failed requests, including bodies that cannot be decompressed or parsed,
+raise FetchError. The fetch engine runs every search on its thread pool.
+"""
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .jishoapi import JISHO_SEARCH_URL, RETRY_STATUSES, CancelToken, FetchError, LookupCancelled
+from .perfstats import PerfStats
+
+READ_CHUNK_SIZE = 16 * 1024
+
+
+class JishoSession:
+    """Thread-safe, pooled keep-alive session for the Jisho search API."""
+
+    def __init__(self, timeout: float = 15.0, retries: int = 3, backoff: float = 0.5, pool_size: int = 8,
+                 stats: Optional[PerfStats] = None, search_url: str = JISHO_SEARCH_URL):
+        self.timeout = timeout
+        self.search_url = search_url
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._pool_size = pool_size
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        self._mount(retries, backoff)
+
+    def _mount(self, retries: int, backoff: float):
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def configure(self, timeout: float, retries: int, backoff: float = 0.5):
+        """Apply new timeout/retry settings; existing pooled connections are dropped."""
+        with self._lock:
+            self.timeout = timeout
+            self._mount(retries, backoff)
+
+    def search(self, term: str, cancel: Optional[CancelToken] = None, page: int = 1) -> Dict[str, Any]:
+        """Run a word search for one result page and return the decoded JSON payload.
+
+        The body is streamed in chunks so a cancelled request stops reading
+        immediately; raises LookupCancelled in that case and FetchError when
+        the request fails.
+        """
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        params = {"keyword": term}
+        if page > 1:
+            params["page"] = page
+        resp = None
+        started = time.perf_counter()
+        try:
+            resp = self._session.get(self.search_url, params=params, timeout=self.timeout, stream=True)
+            if cancel is not None:
+                cancel._attach(resp)
+                cancel.raise_if_cancelled()
+            resp.raise_for_status()
+            chunks = []
+            for chunk in resp.iter_content(READ_CHUNK_SIZE):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                chunks.append(chunk)
+            body = b"".join(chunks)
+            decode_started = time.perf_counter()
+            if self.stats is not None:
+                self.stats.record("network", decode_started - started, page=page, bytes=len(body))
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise FetchError(f"Invalid JSON from Jisho: {e}") from e
+            if self.stats is not None:
+                self.stats.record("json_decode", time.perf_counter() - decode_started, bytes=len(body))
+            return data
+        except (LookupCancelled, FetchError):
+            raise
+        except Exception as e:
+            # Closing the connection from another thread makes the read fail with an arbitrary error
+            if cancel is not None and cancel.cancelled:
+                raise LookupCancelled() from None
+            if isinstance(e, requests.RequestException):
+                status = e.response.status_code if e.response is not None else None
+                raise FetchError(str(e), status) from e
+            raise
+        finally:
+            if cancel is not None:
+                cancel._attach(None)
+            if resp is not None:
+                resp.close()
+
+    def close(self):
+        with self._lock:
+            self._session.close()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Offline dictionary backed by a JMdict/JMnedict import.
+
+The XML dumps published by the EDRDG are streamed into a SQLite store with an
+index on every kanji spelling and reading, plus an index on English glosses.
+Entries are stored already converted to the shape returned by the Jisho API
+(japanese/senses/jlpt/is_common) and read back as the same Entry records, so
+the rest of the add-on can use local and remote results interchangeably.
+"""
+import gzip
+import json
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .entrymodel import Entry
+
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+COMMON_PRIORITIES = frozenset(["news1", "ichi1", "spec1", "spec2", "gai1"])
+IMPORT_BATCH_SIZE = 5000
+
+_JAPANESE_RE = re.compile("[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f]")
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_GLOSS_PREFIXES = ("to ", "a ", "an ", "the ")
+_GLOSS_STOPWORDS = frozenset(["to", "a", "an", "the", "of", "in", "on", "at", "or", "and", "be", "one", "etc", "as", "for", "with"])
+
+# Names Jisho uses for the most common JMdict parts of speech
+_POS_NAMES = {
+    "noun (common) (futsuumeishi)": "Noun",
+    "adjective (keiyoushi)": "I-adjective (keiyoushi)",
+    "adjectival nouns or quasi-adjectives (keiyodoshi)": "Na-adjective (keiyodoshi)",
+    "nouns which may take the genitive case particle 'no'": "No-adjective",
+    "noun or participle which takes the aux. verb suru": "Suru verb",
+    "noun, used as a suffix": "Suffix",
+    "noun, used as a prefix": "Prefix",
+    "noun (temporal) (jisoumeishi)": "Temporal noun",
+    "adverbial noun (fukushitekimeishi)": "Adverbial noun",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    is_common INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS glosses (
+    word TEXT NOT NULL,
+    entry_id INTEGER NOT NULL,
+    exact INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keys_key ON keys (key);
+CREATE INDEX IF NOT EXISTS glosses_word ON glosses (word);
+CREATE INDEX IF NOT EXISTS keys_entry ON keys (entry_id);
+CREATE INDEX IF NOT EXISTS glosses_entry ON glosses (entry_id);
+"""
+
+
+def contains_japanese(text: str) -> bool:
+    return bool(_JAPANESE_RE.search(text))
+
+
+def normalize_gloss(text: str) -> str:
+    """Lowercase a gloss and drop parentheticals and leading 'to'/'a'/'the'."""
+    text = " ".join(_PARENTHESES_RE.sub(" ", text.casefold()).split())
+    for prefix in _GLOSS_PREFIXES:
+        if text.startswith(prefix):
+            return text[len(prefix):]
+    return text
+
+
+def _pos_name(description: str) -> str:
+    name = _POS_NAMES.get(description)
+    if name:
+        return name
+    return description[:1].upper() + description[1:]
+
+
+def _texts(element: ET.Element, tag: str) -> List[str]:
+    return [child.text for child in element.findall(tag) if child.text]
+
+
+def convert_entry(element: ET.Element) -> Optional[Dict[str, Any]]:
+    """Convert a JMdict or JMnedict <entry> element into a Jisho-shaped dict."""
+    kanji = []
+    is_common = False
+    for k_ele in element.findall("k_ele"):
+        keb = k_ele.findtext("keb")
+        if keb:
+            kanji.append(keb)
+            is_common = is_common or any(p in COMMON_PRIORITIES for p in _texts(k_ele, "ke_pri"))
+
+    readings: List[Tuple[str, List[str], bool]] = []
+    for r_ele in element.findall("r_ele"):
+        reb = r_ele.findtext("reb")
+        if reb:
+            readings.append((reb, _texts(r_ele, "re_restr"), r_ele.find("re_nokanji") is not None))
+            is_common = is_common or any(p in COMMON_PRIORITIES for p in _texts(r_ele, "re_pri"))
+    if not readings and not kanji:
+        return None
+
+    japanese = []
+    for keb in kanji:
+        reading = next((reb for reb, restr, nokanji in readings if not nokanji and (not restr or keb in restr)), "")
+        japanese.append({"word": keb, "reading": reading} if reading else {"word": keb})
+    if not kanji:
+        japanese.extend({"reading": reb} for reb, _restr, _nokanji in readings)
+
+    senses = []
+    parts_of_speech: List[str] = []
+    for sense in element.findall("sense"):
+        glosses = [g.text for g in sense.findall("gloss") if g.text and g.get(XML_LANG, "eng") == "eng"]
+        if not glosses:
+            continue
+        # In JMdict a part of speech carries over to the following senses until it is redefined
+        pos = _texts(sense, "pos")
+        if pos:
+            parts_of_speech = [_pos_name(p) for p in pos]
+        senses.append({
+            "english_definitions": glosses,
+            "parts_of_speech": parts_of_speech,
+            "tags": _texts(sense, "misc") + _texts(sense, "field") + _texts(sense, "dial"),
+            "info": _texts(sense, "s_inf"),
+        })
+    for trans in element.findall("trans"):
+        details = _texts(trans, "trans_det")
+        if details:
+            senses.append({
+                "english_definitions": details,
+                "parts_of_speech": [_pos_name(p) for p in _texts(trans, "name_type")],
+                "tags": [],
+                "info": [],
+            })
+    if not senses:
+        return None
+
+    return {
+        "slug": kanji[0] if kanji else readings[0][0],
+        "is_common": is_common,
+        "tags": [],
+        "jlpt": [],
+        "japanese": japanese,
+        "senses": senses,
+    }
+
+
+def iter_dictionary_entries(path: str) -> Iterator[Tuple[int, Dict[str, Any], List[str]]]:
+    """Stream (ent_seq, entry, lookup keys) tuples from a JMdict/JMnedict XML file (.gz allowed)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for _event, element in ET.iterparse(f, events=("end",)):
+            if element.tag != "entry":
+                continue
+            try:
+                seq = int(element.findtext("ent_seq") or 0)
+                entry = convert_entry(element)
+                if seq and entry:
+                    keys = _texts(element, "k_ele/keb") + _texts(element, "r_ele/reb")
+                    yield seq, entry, keys
+            finally:
+                element.clear()
+
+
+def _gloss_rows(entry_id: int, entry: Dict[str, Any]) -> Iterable[Tuple[str, int, int]]:
+    seen = set()
+    for sense in entry["senses"]:
+        for gloss in sense["english_definitions"]:
+            phrase = normalize_gloss(gloss)
+            if phrase and (phrase, 1) not in seen:
+                seen.add((phrase, 1))
+                yield phrase, entry_id, 1
+            for word in _WORD_RE.findall(gloss.casefold()):
+                if len(word) > 2 and word not in _GLOSS_STOPWORDS and (word, 0) not in seen:
+                    seen.add((word, 0))
+                    yield word, entry_id, 0
+
+
+class LocalDictionary:
+    """SQLite-backed JMdict store returning Jisho-shaped entries."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def known_keys(self, candidates: Iterable[str]) -> Set[str]:
+        """The candidates that some entry is written or read exactly as, in one query."""
+        candidates = list(dict.fromkeys(candidates))
+        if not candidates:
+            return set()
+        placeholders = ",".join("?" * len(candidates))
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT key FROM keys WHERE key IN ({placeholders})", candidates).fetchall()
+        return {row[0] for row in rows}
+
+    def search(self, term: str, limit: int = 20) -> List[Entry]:
+        """Look a term up by spelling/reading, or by English gloss for non-Japanese input."""
+        term = term.strip()
+        if not term:
+            return []
+        with self._lock:
+            if contains_japanese(term):
+                rows = self._conn.execute(
+                    """
+                    SELECT e.id, e.payload FROM keys k JOIN entries e ON e.id = k.entry_id
+                    WHERE k.key = ? GROUP BY e.id ORDER BY e.is_common DESC, MIN(k.rank), e.id LIMIT ?
+                    """,
+                    (term, limit),
+                ).fetchall()
+                if len(rows) < limit:
+                    rows += self._conn.execute(
+                        """
+                        SELECT e.id, e.payload FROM keys k JOIN entries e ON e.id = k.entry_id
+                        WHERE k.key > ? AND k.key < ? GROUP BY e.id
+                        ORDER BY e.is_common DESC, LENGTH(MIN(k.key)), e.id LIMIT ?
+                        """,
+                        (term, term + "\uffff", limit),
+                    ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    """
+                    SELECT e.id, e.payload FROM glosses g JOIN entries e ON e.id = g.entry_id
+                    WHERE g.word = ? GROUP BY e.id ORDER BY MAX(g.exact) DESC, e.is_common DESC, e.id LIMIT ?
+                    """,
+                    (normalize_gloss(term), limit),
+                ).fetchall()
+        seen = set()
+        entries = []
+        for entry_id, payload in rows:
+            if entry_id not in seen:
+                seen.add(entry_id)
+                entries.append(Entry.from_dict(json.loads(payload)))
+        return entries[:limit]
+
+    def import_xml(self, xml_path: str, progress: Optional[Callable[[int], None]] = None,
+                   should_cancel: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """Import a JMdict/JMnedict dump, replacing entries with the same sequence number.
+
+        Runs on its own connection so lookups keep working during the import.
+        Returns the number of imported entries, or None if should_cancel stopped
+        the import (the whole import is rolled back then).
+        """
+        conn = sqlite3.connect(self.path)
+        count = 0
+        try:
+            conn.execute("BEGIN")
+            batch: List[Tuple[int, Dict[str, Any], List[str]]] = []
+            for item in iter_dictionary_entries(xml_path):
+                batch.append(item)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self._write_batch(conn, batch)
+                    count += len(batch)
+                    batch = []
+                    if progress:
+                        progress(count)
+                    if should_cancel and should_cancel():
+                        conn.rollback()
+                        return None
+            self._write_batch(conn, batch)
+            count += len(batch)
+            # A cancel during the last, partial batch is honoured too
+            if should_cancel and should_cancel():
+                conn.rollback()
+                return None
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return count
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: List[Tuple[int, Dict[str, Any], List[str]]]):
+        if not batch:
+            return
+        ids = [(seq,) for seq, _entry, _keys in batch]
+        conn.executemany("DELETE FROM keys WHERE entry_id = ?", ids)
+        conn.executemany("DELETE FROM glosses WHERE entry_id = ?", ids)
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (id, is_common, payload) VALUES (?, ?, ?)",
+            [(seq, int(entry["is_common"]), json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+             for seq, entry, _keys in batch],
+        )
+        conn.executemany(
+            "INSERT INTO keys (key, entry_id, rank) VALUES (?, ?, ?)",
+            [(key, seq, rank) for seq, _entry, keys in batch for rank, key in enumerate(keys)],
+        )
+        conn.executemany(
+            "INSERT INTO glosses (word, entry_id, exact) VALUES (?, ?, ?)",
+            [row for seq, entry, _keys in batch for row in _gloss_rows(seq, entry)],
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
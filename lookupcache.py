@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent on-disk cache for Jisho lookup responses.
+
+Responses are stored in a small SQLite database next to config.json, keyed on
+the normalized search term and result page. Entries older than the configured TTL count as
+misses, but are kept so they can still be served while offline. The table is
+trimmed to a maximum number of terms, evicting the least recently used first.
+Entries are stored in the compact form written by entrymodel, not the raw
+Jisho response, and come back as Entry records.
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .entrymodel import Entry, dump_entries, parse_entries
+
+
+class LookupCache:
+    """Thread-safe SQLite response cache with TTL and LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lookups (
+                term TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS lookups_accessed ON lookups (accessed_at)")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    @staticmethod
+    def normalize_key(term: str) -> str:
+        """Collapse whitespace and case so equivalent terms share one row."""
+        return " ".join(term.split()).casefold()
+
+    def configure(self, ttl_seconds: float, max_entries: int):
+        """Apply new limits, evicting immediately if the cap shrank."""
+        with self._lock:
+            self.ttl_seconds = ttl_seconds
+            self.max_entries = max_entries
+            self._evict_locked()
+
+    @classmethod
+    def _key(cls, term: str, page: int = 1) -> str:
+        # Later pages get their own rows; normalize_key has already removed any
+        # \x1f from the term, so the separator cannot collide with a real search
+        key = cls.normalize_key(term)
+        return key if page <= 1 else f"{key}\x1f{page}"
+
+    def get(self, term: str, page: int = 1) -> Optional[List[Entry]]:
+        """Return the cached entries for a term, or None on a miss or expiry."""
+        return self._lookup(term, page, allow_stale=False, count=True)
+
+    def get_stale(self, term: str, page: int = 1) -> Optional[List[Entry]]:
+        """Return cached entries regardless of age; used as an offline fallback."""
+        return self._lookup(term, page, allow_stale=True, count=False)
+
+    def contains(self, term: str, page: int = 1) -> bool:
+        """Check for a fresh entry without touching counters or LRU order."""
+        key = self._key(term, page)
+        with self._lock:
+            row = self._conn.execute("SELECT fetched_at FROM lookups WHERE term = ?", (key,)).fetchone()
+        return bool(row) and time.time() - row[0] <= self.ttl_seconds
+
+    def put(self, term: str, entries: List[Entry], page: int = 1):
+        """Store the entries for one result page of a term, evicting old rows past the size cap."""
+        if not self.normalize_key(term):
+            return
+        key = self._key(term, page)
+        payload = json.dumps(dump_entries(entries), ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM lookups WHERE term = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (term, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            if not existed:
+                self._count += 1
+            self._evict_locked()
+
+    def clear(self):
+        """Drop every cached response and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM lookups")
+            self._count = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of cached terms."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": self._count,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _lookup(self, term: str, page: int, allow_stale: bool, count: bool) -> Optional[List[Entry]]:
+        key = self._key(term, page)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, fetched_at FROM lookups WHERE term = ?", (key,)).fetchone()
+            fresh = bool(row) and now - row[1] <= self.ttl_seconds
+            if count:
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if not row or not (fresh or allow_stale):
+                return None
+            self._conn.execute("UPDATE lookups SET accessed_at = ? WHERE term = ?", (now, key))
+        try:
+            return parse_entries(json.loads(row[0]))
+        except (ValueError, AttributeError, TypeError):
+            return None
+
+    def _evict_locked(self):
+        excess = self._count - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM lookups WHERE term IN (SELECT term FROM lookups ORDER BY accessed_at ASC LIMIT ?)",
+            (excess,),
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight timing instrumentation for the lookup hot paths.
+
+Timings are kept in a fixed-size in-memory ring buffer, so recording costs a
+deque append and old samples fall off on their own. When a log path is set,
+each sample is also appended to a JSONL file for offline analysis.
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class PerfStats:
+    """Thread-safe ring buffer of named timing samples."""
+
+    def __init__(self, capacity: int = 500, log_path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=max(1, capacity))
+        self._log_path = log_path
+        self._log_file = None
+
+    def configure(self, capacity: int, log_path: Optional[str]):
+        """Resize the buffer (keeping the newest samples) and switch the log file."""
+        with self._lock:
+            if capacity != self._samples.maxlen:
+                self._samples = deque(self._samples, maxlen=max(1, capacity))
+            if log_path != self._log_path:
+                self._close_log_locked()
+                self._log_path = log_path
+
+    def record(self, name: str, seconds: float, **details: Any):
+        """Store one sample; details must be JSON-serializable."""
+        sample = {"name": name, "ms": round(seconds * 1000, 3), "at": time.time()}
+        if details:
+            sample.update(details)
+        with self._lock:
+            self._samples.append(sample)
+            if self._log_path:
+                self._write_locked(sample)
+
+    @contextmanager
+    def timed(self, name: str, **details: Any) -> Iterator[Dict[str, Any]]:
+        """Time the body of a with-block; the yielded dict can add details to the sample."""
+        start = time.perf_counter()
+        try:
+            yield details
+        finally:
+            self.record(name, time.perf_counter() - start, **details)
+
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-name count, mean, median, 95th percentile and maximum, in milliseconds."""
+        grouped: Dict[str, List[float]] = {}
+        for sample in self.samples():
+            grouped.setdefault(sample["name"], []).append(sample["ms"])
+        result = {}
+        for name, values in sorted(grouped.items()):
+            values.sort()
+            result[name] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                "max": values[-1],
+            }
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def close(self):
+        with self._lock:
+            self._close_log_locked()
+
+    def _write_locked(self, sample: Dict[str, Any]):
+        try:
+            if self._log_file is None:
+                self._log_file = open(self._log_path, "a", encoding="utf-8")
+            self._log_file.write(json.dumps(sample, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._log_file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            # A broken log must not break lookups; stop writing to it
+            log.warning("Performance log disabled: %s", e)
+            self._close_log_locked()
+            self._log_path = None
+
+    def _close_log_locked(self):
+        if self._log_file is not None:
+            try:
+                self._log_file.close()
+            except OSError:
+                pass
+            self._log_file = None
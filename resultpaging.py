@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Paging state of the results list.
+
+The results window fetches the first pages of a term up front and the next
+ones as the list is scrolled. ResultPaging tracks which page comes next,
+whether Jisho has more and whether a fetch is running, so an error on a later
+page can be told apart from a search that failed before anything was shown.
+"""
+from .jishoapi import PAGE_SIZE
+
+
+class ResultPaging:
+    """Which page of the listed term comes next, and whether one is being fetched."""
+
+    __slots__ = ("term", "next_page", "has_more", "fetching")
+
+    def __init__(self):
+        self.term = ""
+        self.next_page = 1
+        self.has_more = False
+        self.fetching = False
+
+    def start(self, term: str):
+        """A new search: nothing listed yet and its first pages being fetched."""
+        self.term = term
+        self.next_page = 1
+        self.has_more = False
+        self.fetching = True
+
+    def start_more(self) -> bool:
+        """Claim the fetch of the next page; False if there is none or one is already running."""
+        if not self.has_more or self.fetching:
+            return False
+        self.fetching = True
+        return True
+
+    def page_arrived(self, entry_count: int, page: int):
+        self.next_page = page + 1
+        self.has_more = entry_count >= PAGE_SIZE
+
+    def finished(self):
+        self.fetching = False
+
+    def failed(self) -> bool:
+        """Stop fetching after an error; True if no page had arrived, i.e. the search itself failed.
+
+        has_more is left as it was, so a failed later page can be retried with "Load more".
+        """
+        self.fetching = False
+        return self.next_page == 1
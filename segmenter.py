@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Dictionary-driven segmentation of Japanese sentences into words to look up.
+
+At each position the longest substring that is a dictionary key becomes a
+token; conjugated verbs and adjectives are matched through a small table of
+common inflection endings, so 食べました is looked up as 食べる. Without a
+dictionary (or where nothing matches) the text falls back to runs of the
+same script, with kanji keeping their trailing okurigana. A run of Latin
+words stays one token, so an English phrase is searched as a phrase.
+Particles, punctuation and lone kana are not returned, and each word appears
+only once.
+"""
+from typing import AbstractSet, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+KnownKeys = Callable[[Iterable[str]], AbstractSet[str]]
+
+MAX_WORD_LENGTH = 12
+
+KANJI, HIRAGANA, KATAKANA, LATIN, OTHER = range(5)
+
+# Particles and auxiliaries not worth a lookup of their own
+PARTICLES = frozenset({
+    "は", "が", "を", "に", "で", "と", "も", "の", "へ", "や", "か", "ね", "よ", "な", "わ", "ぞ", "さ",
+    "から", "まで", "より", "けど", "けれど", "ので", "のに", "って", "だ", "です", "でした", "だった",
+    "ます", "ました", "ている", "ています", "という", "とか", "など", "だけ", "しか", "ばかり",
+})
+_PARTICLE_CHARS = frozenset("はがをにでともへやねよ")
+
+# (ending of the inflected text, ending of the dictionary form)
+INFLECTIONS = (
+    ("ませんでした", "る"), ("ました", "る"), ("ません", "る"), ("ます", "る"),
+    ("なかった", "る"), ("ない", "る"), ("られる", "る"), ("させる", "る"), ("た", "る"), ("て", "る"),
+    ("います", "う"), ("きます", "く"), ("ぎます", "ぐ"), ("します", "す"), ("ちます", "つ"),
+    ("にます", "ぬ"), ("びます", "ぶ"), ("みます", "む"), ("ります", "る"),
+    ("わない", "う"), ("かない", "く"), ("がない", "ぐ"), ("さない", "す"), ("たない", "つ"),
+    ("なない", "ぬ"), ("ばない", "ぶ"), ("まない", "む"), ("らない", "る"),
+    ("った", "う"), ("った", "つ"), ("った", "る"), ("って", "う"), ("って", "つ"), ("って", "る"),
+    ("った", "く"), ("って", "く"),
+    ("んだ", "む"), ("んだ", "ぶ"), ("んだ", "ぬ"), ("んで", "む"), ("んで", "ぶ"), ("んで", "ぬ"),
+    ("いた", "く"), ("いて", "く"), ("いだ", "ぐ"), ("いで", "ぐ"), ("した", "す"), ("して", "す"),
+    ("した", "する"), ("して", "する"), ("します", "する"), ("しない", "する"), ("しました", "する"),
+    ("きた", "くる"), ("きて", "くる"), ("きます", "くる"), ("こない", "くる"),
+    ("かった", "い"), ("くない", "い"), ("くて", "い"), ("く", "い"), ("さ", "い"),
+)
+
+
+class Token(NamedTuple):
+    """A word of the sentence: its text as written and the dictionary form to search for."""
+    surface: str
+    term: str
+
+
+def char_class(ch: str) -> int:
+    code = ord(ch)
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or ch in "々〆ヶ":
+        return KANJI
+    if 0x3041 <= code <= 0x309F:
+        return HIRAGANA
+    if 0x30A1 <= code <= 0x30FF:
+        return KATAKANA
+    if ch.isalnum():
+        return LATIN
+    return OTHER
+
+
+def candidate_forms(surface: str) -> List[str]:
+    """surface itself followed by every dictionary form it could conjugate from."""
+    forms = [surface]
+    for ending, replacement in INFLECTIONS:
+        if len(surface) > len(ending) and surface.endswith(ending):
+            forms.append(surface[:-len(ending)] + replacement)
+    return forms
+
+
+def dictionary_form(surface: str, is_key: Callable[[str], bool]) -> Optional[str]:
+    """Return the dictionary key surface is, or conjugates from; None if there is none."""
+    for candidate in candidate_forms(surface):
+        if is_key(candidate):
+            return candidate
+    return None
+
+
+def segment(text: str, known_keys: Optional[KnownKeys] = None,
+            max_length: int = MAX_WORD_LENGTH) -> List[Token]:
+    """Split text into the words worth looking up, in order of appearance.
+
+    known_keys receives candidate strings and returns those that are dictionary
+    keys (e.g. LocalDictionary.known_keys). It is called at most once per
+    position, with every candidate for that position not already answered;
+    without it only the script-run fallback is used.
+    """
+    tokens: List[Token] = []
+    seen = set()
+    answers: Dict[str, bool] = {}
+    length = len(text)
+    i = 0
+    while i < length:
+        cls = char_class(text[i])
+        if cls == OTHER:
+            i += 1
+            continue
+        run_end = i
+        while run_end < length and char_class(text[run_end]) != OTHER:
+            run_end += 1
+
+        token = None
+        if cls == LATIN:
+            token = _latin_run(text, i)
+        elif known_keys is not None:
+            surfaces = [text[i:end] for end in range(min(run_end, i + max_length), i, -1)]
+            _ask(known_keys, answers, surfaces)
+            for surface in surfaces:
+                term = dictionary_form(surface, answers.__getitem__)
+                if term:
+                    token = Token(surface, term)
+                    break
+        if token is None:
+            token = _script_run(text, i, run_end, cls, known_keys is not None)
+        i += len(token.surface)
+
+        if _worth_looking_up(token) and token.term not in seen:
+            seen.add(token.term)
+            tokens.append(token)
+    return tokens
+
+
+def _ask(known_keys: KnownKeys, answers: Dict[str, bool], surfaces: List[str]):
+    pending = list(dict.fromkeys(c for s in surfaces for c in candidate_forms(s) if c not in answers))
+    if pending:
+        found = known_keys(pending)
+        answers.update((candidate, candidate in found) for candidate in pending)
+
+
+def _latin_run(text: str, start: int) -> Token:
+    """Latin words from start on, spaces between them included."""
+    length = len(text)
+    end = start + 1
+    while end < length:
+        if char_class(text[end]) == LATIN:
+            end += 1
+            continue
+        gap = end
+        while gap < length and text[gap].isspace():
+            gap += 1
+        if gap == end or gap == length or char_class(text[gap]) != LATIN:
+            break
+        end = gap
+    surface = text[start:end]
+    return Token(surface, " ".join(surface.split()))
+
+
+def _script_run(text: str, start: int, run_end: int, cls: int, has_dictionary: bool) -> Token:
+    end = start + 1
+    while end < run_end and char_class(text[end]) == cls:
+        end += 1
+    if cls == KANJI and not has_dictionary:
+        # Without a dictionary, kanji take their okurigana up to the next likely particle
+        while end < run_end and char_class(text[end]) == HIRAGANA and text[end] not in _PARTICLE_CHARS:
+            end += 1
+    elif cls == HIRAGANA and has_dictionary:
+        # Hiragana the dictionary does not recognise advances one character at a time
+        end = start + 1
+    surface = text[start:end]
+    return Token(surface, surface)
+
+
+def _worth_looking_up(token: Token) -> bool:
+    if token.surface in PARTICLES or token.term in PARTICLES:
+        return False
+    return not (len(token.surface) == 1 and char_class(token.surface) == HIRAGANA)
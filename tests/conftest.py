@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Test setup for the add-on's pure-Python modules.
+
+The add-on's __init__.py needs a running Anki (aqt, PyQt6), so the tests
+register the add-on folder as the "jisho_connect" package without executing
+it. Submodules such as jisho_connect.lookupcache then import normally, with
+their relative imports resolved inside the folder.
+
+pytest also imports the folder's __init__.py under the folder's own name
+because the folder is a package, so the same placeholder is registered there.
+"""
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "jisho_connect" not in sys.modules:
+    package = types.ModuleType("jisho_connect")
+    package.__path__ = [ADDON_DIR]
+    sys.modules["jisho_connect"] = package
+    sys.modules.setdefault(os.path.basename(ADDON_DIR), package)
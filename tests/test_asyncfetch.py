@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from concurrent.futures import CancelledError as FutureCancelledError
+
+import pytest
+
+from jisho_connect.asyncfetch import FetchEngine
+
+TIMEOUT = 5
+
+
+class BlockingFetch:
+    """A fetch function whose lookups wait until their term is released."""
+
+    def __init__(self, instant=()):
+        self.instant = set(instant)
+        self.calls = []
+        self.tokens = {}
+        self.started = {}
+        self._gates = {}
+        self._lock = threading.Lock()
+
+    def _event(self, events, term):
+        with self._lock:
+            return events.setdefault(term, threading.Event())
+
+    def __call__(self, term, page, cancel):
+        with self._lock:
+            self.calls.append(term)
+            self.tokens[term] = cancel
+        self._event(self.started, term).set()
+        if term.startswith("fail"):
+            raise ValueError(term)
+        if term not in self.instant:
+            self._event(self._gates, term).wait(TIMEOUT)
+        return [term, page]
+
+    def wait_started(self, term):
+        assert self._event(self.started, term).wait(TIMEOUT)
+
+    def release(self, term):
+        self._event(self._gates, term).set()
+
+    def release_all(self):
+        with self._lock:
+            gates = list(self._gates.values())
+        for gate in gates:
+            gate.set()
+
+
+@pytest.fixture
+def fetch():
+    fetch = BlockingFetch()
+    yield fetch
+    fetch.release_all()
+
+
+@pytest.fixture
+def engine(fetch):
+    engine = FetchEngine(fetch, limit=4)
+    yield engine
+    fetch.release_all()
+    engine.shutdown()
+
+
+def start(engine, term):
+    return asyncio.run_coroutine_threadsafe(engine.fetch(term), engine.loop)
+
+
+def test_identical_requests_in_flight_share_one_lookup(engine, fetch):
+    first = start(engine, "食べる")
+    fetch.wait_started("食べる")
+    second = start(engine, "食べる")
+    fetch.release("食べる")
+    assert first.result(TIMEOUT) == second.result(TIMEOUT) == ["食べる", 1]
+    assert fetch.calls == ["食べる"]
+    assert (engine.leaders, engine.coalesced) == (1, 1)
+
+
+def test_cancelling_one_waiter_keeps_the_lookup_for_the_other(engine, fetch):
+    first = start(engine, "食べる")
+    fetch.wait_started("食べる")
+    second = start(engine, "食べる")
+    first.cancel()
+    with pytest.raises(FutureCancelledError):
+        first.result(TIMEOUT)
+    fetch.release("食べる")
+    assert second.result(TIMEOUT) == ["食べる", 1]
+    assert not fetch.tokens["食べる"].cancelled
+
+
+def test_cancelling_the_last_waiter_cancels_the_lookup(engine, fetch):
+    only = start(engine, "食べる")
+    fetch.wait_started("食べる")
+    only.cancel()
+    token = fetch.tokens["食べる"]
+    for _ in range(50):
+        if token.cancelled:
+            break
+        threading.Event().wait(0.02)
+    assert token.cancelled
+
+
+def test_run_many_reports_errors_as_values():
+    fetch = BlockingFetch(instant=["犬"])
+    engine = FetchEngine(fetch, limit=2)
+    try:
+        results = engine.run_many(["犬", "fail", "犬"])
+    finally:
+        engine.shutdown()
+    assert results["犬"] == ["犬", 1]
+    assert isinstance(results["fail"], ValueError)
+    assert fetch.calls.count("犬") == 1
+
+
+def test_run_many_returns_partial_results_when_cancelled():
+    fetch = BlockingFetch(instant=["fast"])
+    engine = FetchEngine(fetch, limit=2)
+    seen = []
+    try:
+        results = engine.run_many(
+            ["fast", "slow"],
+            on_each=lambda term, result: seen.append(term),
+            should_cancel=lambda: "fast" in seen,
+            poll=0.01,
+        )
+        assert results == {"fast": ["fast", 1]}
+        fetch.wait_started("slow")
+        token = fetch.tokens["slow"]
+        for _ in range(50):
+            if token.cancelled:
+                break
+            threading.Event().wait(0.02)
+        assert token.cancelled
+    finally:
+        fetch.release_all()
+        engine.shutdown()
+
+
+def test_lookups_keep_working_after_the_limit_changes(engine, fetch):
+    fetch.instant.update(["a", "b", "c"])
+    for limit in (1, 3, 2):
+        engine.set_limit(limit)
+        assert engine.run_many(["a", "b", "c"]) == {"a": ["a", 1], "b": ["b", 1], "c": ["c", 1]}
+    assert engine.stats()["limit"] == 2
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from jisho_connect.entrymodel import Entry, dump_entries, parse_entries
+
+JISHO_ITEM = {
+    "slug": "食べる",
+    "is_common": True,
+    "tags": ["wanikani5"],
+    "jlpt": ["jlpt-n5"],
+    "japanese": [{"word": "食べる", "reading": "たべる"}, {"reading": "たべる"}],
+    "senses": [{
+        "english_definitions": ["to eat"],
+        "parts_of_speech": ["Ichidan verb", "Transitive verb"],
+        "links": [{"text": "Wikipedia", "url": "https://example.org"}],
+        "tags": [],
+        "restrictions": [],
+        "see_also": [],
+        "antonyms": [],
+        "source": [],
+        "info": [],
+    }],
+    "attribution": {"jmdict": True, "jmnedict": False, "dbpedia": False},
+}
+
+
+def test_fields_are_read_from_a_jisho_item():
+    entry = Entry.from_dict(JISHO_ITEM)
+    assert (entry.slug, entry.is_common, entry.jlpt, entry.tags) == ("食べる", True, ("jlpt-n5",), ("wanikani5",))
+    assert (entry.word, entry.reading) == ("食べる", "たべる")
+    assert [(f.word, f.reading) for f in entry.forms] == [("食べる", "たべる"), ("", "たべる")]
+    assert entry.senses[0].definitions == ("to eat",)
+    assert entry.senses[0].parts_of_speech == ("Ichidan verb", "Transitive verb")
+
+
+def test_to_dict_keeps_only_the_fields_the_record_holds():
+    data = Entry.from_dict(JISHO_ITEM).to_dict()
+    assert "attribution" not in data
+    assert data["senses"] == [{"english_definitions": ["to eat"], "parts_of_speech": ["Ichidan verb", "Transitive verb"]}]
+    assert data["japanese"] == [{"word": "食べる", "reading": "たべる"}, {"reading": "たべる"}]
+
+
+def test_dumped_entries_parse_back_unchanged():
+    entries = parse_entries([JISHO_ITEM])
+    dumped = dump_entries(entries)
+    assert dump_entries(parse_entries(dumped)) == dumped
+
+
+def test_repeated_labels_share_one_string_object():
+    first, second = parse_entries([JISHO_ITEM, dict(JISHO_ITEM, jlpt=["".join(["jlpt-", "n5"])])])
+    assert first.jlpt[0] is second.jlpt[0]
+    assert first.senses[0].parts_of_speech[0] is second.senses[0].parts_of_speech[0]
+
+
+def test_missing_fields_default_to_empty():
+    entry = Entry.from_dict({})
+    assert (entry.slug, entry.is_common, entry.word, entry.reading) == ("", False, "", "")
+    assert entry.senses == () and entry.forms == ()
+    assert parse_entries(None) == []
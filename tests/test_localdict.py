@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from jisho_connect import localdict
+from jisho_connect.localdict import LocalDictionary
+
+JMDICT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE JMdict [
+<!ENTITY v1 "Ichidan verb">
+<!ENTITY vt "transitive verb">
+<!ENTITY n "noun (common) (futsuumeishi)">
+<!ENTITY uk "word usually written using kana alone">
+]>
+<JMdict>
+<entry>
+<ent_seq>1000</ent_seq>
+<k_ele><keb>食べる</keb><ke_pri>ichi1</ke_pri></k_ele>
+<k_ele><keb>喰べる</keb></k_ele>
+<r_ele><reb>たべる</reb></r_ele>
+<sense><pos>&v1;</pos><pos>&vt;</pos><gloss>to eat</gloss></sense>
+<sense><gloss>to live on (e.g. a salary)</gloss><gloss xml:lang="ger">leben von</gloss></sense>
+<sense><pos>&n;</pos><misc>&uk;</misc><gloss>eating</gloss></sense>
+</entry>
+<entry>
+<ent_seq>1001</ent_seq>
+<k_ele><keb>食べ物</keb></k_ele>
+<r_ele><reb>たべもの</reb></r_ele>
+<sense><pos>&n;</pos><gloss>food</gloss></sense>
+</entry>
+<entry>
+<ent_seq>1002</ent_seq>
+<k_ele><keb>食べ物屋</keb></k_ele>
+<r_ele><reb>たべものや</reb><re_pri>news1</re_pri></r_ele>
+<sense><pos>&n;</pos><gloss>place to eat</gloss></sense>
+</entry>
+<entry>
+<ent_seq>1003</ent_seq>
+<k_ele><keb>食べ放題</keb></k_ele>
+<r_ele><reb>たべほうだい</reb></r_ele>
+<sense><pos>&n;</pos><gloss>all you can eat</gloss></sense>
+</entry>
+<entry>
+<ent_seq>1004</ent_seq>
+<k_ele><keb>喰らう</keb></k_ele>
+<r_ele><reb>くらう</reb></r_ele>
+<sense><gloss>to eat</gloss></sense>
+</entry>
+<entry>
+<ent_seq>1005</ent_seq>
+<k_ele><keb>日本</keb><ke_pri>news2</ke_pri></k_ele>
+<k_ele><keb>日本国</keb></k_ele>
+<r_ele><reb>にっぽんこく</reb><re_restr>日本国</re_restr></r_ele>
+<r_ele><reb>にほん</reb></r_ele>
+<r_ele><reb>ニッポン</reb><re_nokanji/></r_ele>
+<sense><pos>&n;</pos><gloss>Japan</gloss></sense>
+</entry>
+</JMdict>
+"""
+
+
+@pytest.fixture
+def dictionary(tmp_path):
+    xml_path = tmp_path / "JMdict_e.xml"
+    xml_path.write_text(JMDICT_XML, encoding="utf-8")
+    dictionary = LocalDictionary(str(tmp_path / "jmdict.sqlite3"))
+    assert dictionary.import_xml(str(xml_path)) == 6
+    yield dictionary
+    dictionary.close()
+
+
+def lookup(dictionary, term):
+    return dictionary.search(term)[0]
+
+
+def words(entries):
+    return [entry.word for entry in entries]
+
+
+def test_parts_of_speech_are_expanded_and_carry_over(dictionary):
+    senses = lookup(dictionary, "食べる").senses
+    assert senses[0].parts_of_speech == ("Ichidan verb", "Transitive verb")
+    assert senses[1].parts_of_speech == ("Ichidan verb", "Transitive verb")
+    assert senses[2].parts_of_speech == ("Noun",)
+    assert senses[2].tags == ("word usually written using kana alone",)
+
+
+def test_only_english_glosses_are_kept(dictionary):
+    assert lookup(dictionary, "食べる").senses[1].definitions == ("to live on (e.g. a salary)",)
+
+
+def test_readings_follow_restrictions_and_nokanji(dictionary):
+    forms = [(form.word, form.reading) for form in lookup(dictionary, "日本").forms]
+    assert forms == [("日本", "にほん"), ("日本国", "にっぽんこく")]
+    assert words(dictionary.search("ニッポン")) == ["日本"]
+
+
+def test_common_words_come_from_kanji_or_reading_priorities(dictionary):
+    assert lookup(dictionary, "食べる").is_common
+    assert lookup(dictionary, "食べ物屋").is_common
+    assert not lookup(dictionary, "食べ物").is_common
+    assert not lookup(dictionary, "日本").is_common
+
+
+def test_japanese_input_ranks_exact_matches_before_prefixes(dictionary):
+    assert words(dictionary.search("食べ物")) == ["食べ物", "食べ物屋"]
+    assert words(dictionary.search("たべもの")) == ["食べ物", "食べ物屋"]
+    assert words(dictionary.search("食べ")) == ["食べる", "食べ物屋", "食べ物", "食べ放題"]
+
+
+def test_english_input_ranks_whole_glosses_before_single_words(dictionary):
+    assert words(dictionary.search("eat")) == ["食べる", "喰らう", "食べ物屋", "食べ放題"]
+    assert words(dictionary.search("to eat")) == words(dictionary.search("eat"))
+
+
+def test_search_limit_and_blank_terms(dictionary):
+    assert len(dictionary.search("食べ", limit=2)) == 2
+    assert dictionary.search("  ") == []
+    assert dictionary.known_keys(["食べる", "たべる", "食べた"]) == {"食べる", "たべる"}
+
+
+@pytest.mark.parametrize("batch_size", [2, 5000])
+def test_cancelled_import_is_rolled_back(tmp_path, monkeypatch, batch_size):
+    monkeypatch.setattr(localdict, "IMPORT_BATCH_SIZE", batch_size)
+    xml_path = tmp_path / "JMdict_e.xml"
+    xml_path.write_text(JMDICT_XML, encoding="utf-8")
+    dictionary = LocalDictionary(str(tmp_path / "jmdict.sqlite3"))
+    try:
+        assert dictionary.import_xml(str(xml_path), should_cancel=lambda: True) is None
+        assert dictionary.entry_count() == 0
+    finally:
+        dictionary.close()
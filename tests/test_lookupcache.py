@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from jisho_connect.entrymodel import Entry, Form, Sense
+from jisho_connect.lookupcache import LookupCache
+
+
+def make_entry(word: str) -> Entry:
+    return Entry(word, True, ("jlpt-n5",), (), (Form(word, "よみ"),), (Sense(("meaning",), ("Noun",)),))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600, max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_round_trip_returns_entry_records(cache):
+    cache.put("食べる", [make_entry("食べる")])
+    entries = cache.get("食べる")
+    assert len(entries) == 1
+    assert entries[0].to_dict() == make_entry("食べる").to_dict()
+
+
+def test_equivalent_terms_share_a_row(cache):
+    cache.put("  Dog  House ", [make_entry("犬小屋")])
+    assert cache.get("dog house") is not None
+    assert cache.stats()["entries"] == 1
+
+
+def test_pages_are_stored_separately(cache):
+    cache.put("犬", [make_entry("犬")])
+    assert cache.get("犬", page=2) is None
+    cache.put("犬", [make_entry("犬2")], page=2)
+    assert cache.get("犬", page=2)[0].word == "犬2"
+    assert cache.get("犬")[0].word == "犬"
+
+
+def test_miss_and_hit_counters(cache):
+    assert cache.get("猫") is None
+    cache.put("猫", [make_entry("猫")])
+    cache.get("猫")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_rows_are_misses_but_served_stale(tmp_path):
+    cache = LookupCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=-1, max_entries=10)
+    try:
+        cache.put("猫", [make_entry("猫")])
+        assert cache.get("猫") is None
+        assert not cache.contains("猫")
+        assert cache.get_stale("猫")[0].word == "猫"
+    finally:
+        cache.close()
+
+
+def test_least_recently_used_rows_are_evicted(cache):
+    for term in ("a", "b", "c"):
+        cache.put(term, [make_entry(term)])
+    cache.get("a")
+    cache._conn.execute("UPDATE lookups SET accessed_at = 0 WHERE term = 'b'")
+    cache.put("d", [make_entry("d")])
+    assert cache.stats()["entries"] == 3
+    assert cache.get_stale("b") is None
+    assert cache.get_stale("a") is not None
+
+
+def test_shrinking_the_cap_evicts_immediately(cache):
+    for term in ("a", "b", "c"):
+        cache.put(term, [make_entry(term)])
+    cache.configure(ttl_seconds=3600, max_entries=1)
+    assert cache.stats()["entries"] == 1
+
+
+def test_blank_terms_are_not_stored(cache):
+    cache.put("   ", [make_entry("x")])
+    assert cache.stats()["entries"] == 0
+
+
+def test_rows_holding_raw_jisho_payloads_still_load(cache):
+    raw = [{"slug": "犬", "is_common": True, "japanese": [{"word": "犬", "reading": "いぬ"}],
+            "senses": [{"english_definitions": ["dog"], "parts_of_speech": ["Noun"], "links": []}],
+            "attribution": {"jmdict": True}}]
+    cache.put("犬", [])
+    cache._conn.execute("UPDATE lookups SET payload = ? WHERE term = '犬'", (json.dumps(raw),))
+    entry = cache.get("犬")[0]
+    assert (entry.word, entry.reading, entry.senses[0].definitions) == ("犬", "いぬ", ("dog",))
+
+
+def test_clear_drops_rows_and_counters(cache):
+    cache.put("猫", [make_entry("猫")])
+    cache.get("猫")
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from jisho_connect.entrymodel import Entry, Form, Sense
+from jisho_connect.mappingplan import MappingPlan, build_extractor
+
+ENTRY = Entry(
+    "食べる", True, ("jlpt-n5",), ("wanikani5", "other"),
+    (Form("食べる", "たべる"), Form("喰べる", "たべる")),
+    (
+        Sense(("to eat",), ("Ichidan verb", "Transitive verb"), ("Usually written using kana alone",)),
+        Sense(("to live on", "to subsist on"), ("Ichidan verb",), (), ("colloquial",)),
+    ),
+)
+
+
+def test_each_value_is_taken_from_the_selected_senses_and_forms():
+    plan = MappingPlan([
+        ("Word", "Front"), ("Reading", "Reading"), ("Meaning", "Back"), ("Tags", "Tags"),
+        ("Info", "Info"), ("Other forms", "Forms"), ("JLPT Level", "JLPT"),
+        ("Wanikani Level", "WK"), ("Is_Common", "Common"), ("Part of speech", "POS"),
+    ])
+    values = plan.field_values(ENTRY, list(ENTRY.senses), ["喰べる"])
+    assert values == {
+        "Front": ["食べる"],
+        "Reading": ["たべる"],
+        "Back": ["to eat | to live on; to subsist on"],
+        "Tags": ["Usually written using kana alone"],
+        "Info": ["colloquial"],
+        "Forms": ["喰べる"],
+        "JLPT": ["jlpt-n5"],
+        "WK": ["wanikani5"],
+        "Common": ["common word"],
+        "POS": ["Ichidan verb; Transitive verb"],
+    }
+
+
+def test_only_selected_senses_are_used():
+    plan = MappingPlan([("Meaning", "Back")])
+    assert plan.field_values(ENTRY, [ENTRY.senses[1]], []) == {"Back": ["to live on; to subsist on"]}
+
+
+def test_values_mapped_to_one_field_are_grouped_and_empty_ones_dropped():
+    plan = MappingPlan([("Word", "Front"), ("Reading", "Front"), ("Other forms", "Front")])
+    assert plan.field_values(ENTRY, [], []) == {"Front": ["食べる", "たべる"]}
+
+
+def test_part_of_speech_ending_is_removed_only_when_asked():
+    entry = Entry(senses=(Sense(parts_of_speech=("Godan verb with 'u' ending",)),))
+    stripped = build_extractor("Part of speech", remove_pos_ending=True)
+    kept = build_extractor("Part of speech", remove_pos_ending=False)
+    assert stripped(entry, list(entry.senses), []) == "Godan verb"
+    assert kept(entry, list(entry.senses), []) == "Godan verb with 'u' ending"
+
+
+def test_unknown_value_names_are_ignored():
+    assert build_extractor("Pitch accent", True) is None
+    assert MappingPlan([("Pitch accent", "Front"), ("Word", "Front")]).steps[0][0] == "Front"
+    assert len(MappingPlan([("Pitch accent", "Front")]).steps) == 0
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from jisho_connect.jishoapi import PAGE_SIZE
+from jisho_connect.resultpaging import ResultPaging
+
+
+def test_a_full_page_means_more_can_be_loaded():
+    paging = ResultPaging()
+    paging.start("食べる")
+    paging.page_arrived(PAGE_SIZE, 1)
+    paging.finished()
+    assert (paging.next_page, paging.has_more) == (2, True)
+    assert paging.start_more()
+    assert not paging.start_more()
+
+
+def test_a_short_page_is_the_last_one():
+    paging = ResultPaging()
+    paging.start("食べる")
+    paging.page_arrived(PAGE_SIZE - 1, 1)
+    paging.finished()
+    assert not paging.start_more()
+
+
+def test_a_failure_before_any_page_fails_the_search():
+    paging = ResultPaging()
+    paging.start("食べる")
+    assert paging.failed()
+    assert not paging.fetching
+
+
+def test_a_failure_on_page_two_keeps_page_one():
+    paging = ResultPaging()
+    paging.start("食べる")
+    paging.page_arrived(PAGE_SIZE, 1)
+    assert not paging.failed()
+    assert not paging.fetching
+    # The failed page is fetched again from "Load more"
+    assert paging.next_page == 2
+    assert paging.start_more()
+
+
+def test_a_new_search_resets_the_pages():
+    paging = ResultPaging()
+    paging.start("食べる")
+    paging.page_arrived(PAGE_SIZE, 1)
+    paging.start("飲む")
+    assert (paging.term, paging.next_page, paging.has_more, paging.fetching) == ("飲む", 1, False, True)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from jisho_connect.segmenter import Token, candidate_forms, dictionary_form, segment
+
+KEYS = {"私", "食べる", "寿司", "毎日", "学校", "行く", "高い"}
+
+
+class CountingKeys:
+    """Stands in for LocalDictionary.known_keys and records every batch it is asked."""
+
+    def __init__(self, keys=KEYS):
+        self.keys = keys
+        self.batches = []
+
+    def __call__(self, candidates):
+        batch = list(candidates)
+        self.batches.append(batch)
+        return {c for c in batch if c in self.keys}
+
+
+def terms(tokens):
+    return [token.term for token in tokens]
+
+
+def test_words_are_found_and_particles_dropped():
+    tokens = segment("私は毎日寿司を食べました。", CountingKeys())
+    assert tokens == [
+        Token("私", "私"), Token("毎日", "毎日"), Token("寿司", "寿司"), Token("食べました", "食べる"),
+    ]
+
+
+def test_inflected_verbs_and_adjectives_map_to_dictionary_forms():
+    assert terms(segment("学校へ行った。高かった", CountingKeys())) == ["学校", "行く", "高い"]
+
+
+def test_each_word_appears_once():
+    assert terms(segment("寿司と寿司", CountingKeys())) == ["寿司"]
+
+
+def test_key_lookups_are_batched_per_position_and_never_repeated():
+    known_keys = CountingKeys()
+    text = "私は毎日寿司を食べました。"
+    segment(text, known_keys)
+    assert len(known_keys.batches) <= len(text)
+    asked = [candidate for batch in known_keys.batches for candidate in batch]
+    assert len(asked) == len(set(asked))
+
+
+def test_without_a_dictionary_script_runs_are_used():
+    assert terms(segment("私は毎日寿司を食べました。")) == ["私", "毎日寿司", "食べました"]
+
+
+def test_katakana_and_latin_words_are_kept():
+    assert terms(segment("コーヒーを飲む。Anki is fun")) == ["コーヒー", "飲む", "Anki is fun"]
+
+
+def test_an_english_phrase_stays_one_token():
+    known_keys = CountingKeys()
+    assert segment("to eat", known_keys) == [Token("to eat", "to eat")]
+    assert segment("to eat") == [Token("to eat", "to eat")]
+    assert not known_keys.batches
+
+
+def test_latin_runs_end_at_punctuation_and_japanese():
+    assert terms(segment("hello, world")) == ["hello", "world"]
+    assert terms(segment("Ankiで寿司", CountingKeys())) == ["Anki", "寿司"]
+
+
+def test_candidate_forms_start_with_the_surface():
+    forms = candidate_forms("食べました")
+    assert forms[0] == "食べました"
+    assert "食べる" in forms
+
+
+def test_dictionary_form_is_none_for_unknown_words():
+    assert dictionary_form("食べました", KEYS.__contains__) == "食べる"
+    assert dictionary_form("走りました", KEYS.__contains__) is None
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from jisho_connect.textnorm import fold_kana, normalize_term, strip_furigana, strip_html
+
+
+@pytest.mark.parametrize("field, term", [
+    ("", ""),
+    ("食べる", "食べる"),
+    ("<b>食べる</b>", "食べる"),
+    ("食べる&nbsp;", "食べる"),
+    ("食べる[sound:taberu.mp3]", "食べる"),
+    ("<ruby>日本<rt>にほん</rt></ruby>語", "日本語"),
+    ("日本[にほん]語[ご]", "日本語"),
+    ("ｶﾀｶﾅ", "カタカナ"),
+    ("ＡＢＣ", "ABC"),
+    ("dog<br>house", "dog house"),
+    ("<div>dog</div><div>house</div>", "dog house"),
+    ("  dog \n house  ", "dog house"),
+])
+def test_fields_reduce_to_the_searched_term(field, term):
+    assert normalize_term(field) == term
+
+
+def test_katakana_is_folded_only_when_asked():
+    assert normalize_term("カタカナ") == "カタカナ"
+    assert normalize_term("カタカナ", fold_katakana=True) == "かたかな"
+
+
+def test_fold_kana_keeps_the_long_vowel_mark():
+    assert fold_kana("コーヒー") == "こーひー"
+
+
+def test_strip_html_drops_ruby_fallback_parentheses():
+    assert strip_html("<ruby>漢字<rp>(</rp><rt>かんじ</rt><rp>)</rp></ruby>") == "漢字"
+
+
+def test_strip_furigana_eats_the_space_before_a_base():
+    assert strip_furigana("今日[きょう] 天気[てんき]") == "今日天気"
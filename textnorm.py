@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Normalization of search terms taken from note fields.
+
+Anki fields often carry HTML, entities such as &nbsp;, furigana in either
+ruby markup or Anki's "漢字[かんじ]" bracket syntax, sound tags and full-width
+or half-width variants of the same characters. All of these are reduced to
+the plain text that should be searched, so equivalent fields produce one
+query (and one cache row) instead of several.
+"""
+import html
+import re
+import unicodedata
+
+_SOUND_RE = re.compile(r"\[sound:[^\]]*\]")
+_RUBY_ANNOTATION_RE = re.compile(r"<(rt|rp)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_BREAK_RE = re.compile(r"<br\s*/?>|</?(div|p|li)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+# Same pattern as Anki's "kanji:" filter: an optional space before the furigana base
+_FURIGANA_RE = re.compile(r" ?([^ >\[\]]+?)\[[^\]]*\]")
+
+_KATAKANA_START = 0x30A1
+_KATAKANA_END = 0x30F6
+_KANA_OFFSET = 0x60
+_KATAKANA_TO_HIRAGANA = {code: code - _KANA_OFFSET for code in range(_KATAKANA_START, _KATAKANA_END + 1)}
+
+
+def strip_html(text: str) -> str:
+    """Drop ruby annotations and tags, turning block-level breaks into spaces."""
+    text = _RUBY_ANNOTATION_RE.sub("", text)
+    text = _BREAK_RE.sub(" ", text)
+    return _TAG_RE.sub("", text)
+
+
+def strip_furigana(text: str) -> str:
+    """Turn Anki's "日本[にほん]語[ご]" furigana syntax into "日本語"."""
+    return _FURIGANA_RE.sub(r"\1", text)
+
+
+def fold_kana(text: str) -> str:
+    """Map katakana to the matching hiragana (ー and other marks are kept)."""
+    return text.translate(_KATAKANA_TO_HIRAGANA)
+
+
+def normalize_term(text: str, fold_katakana: bool = False) -> str:
+    """Reduce a field value to the term that should be searched."""
+    if not text:
+        return ""
+    text = _SOUND_RE.sub("", text)
+    text = html.unescape(strip_html(text))
+    text = strip_furigana(text)
+    # NFKC unifies width (ｶﾀｶﾅ, ＡＢＣ) and turns the decoded &nbsp; into a space
+    text = unicodedata.normalize("NFKC", text)
+    text = " ".join(text.split())
+    if fold_katakana:
+        text = fold_kana(text)
+    return text